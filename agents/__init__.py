@@ -1 +1,11 @@
 """Core agent package for Accessible Solutions."""
+
+# Agent entry points, forwarded lazily so importing `agents` does not load LangGraph
+_ENTRY_POINTS = ("create_deep_agent", "get_research_agent", "get_supervisor_agent")
+
+
+def __getattr__(name: str):
+    if name in _ENTRY_POINTS:
+        from . import deepagent
+        return getattr(deepagent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
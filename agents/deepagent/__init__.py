@@ -1,26 +1,62 @@
-from .graph import create_deep_agent, base_prompt
-from .state import DeepAgentState
-from .model import get_default_model, get_fast_model
-from .sub_agent import SubAgent, _create_task_tool
-from .tools import write_todos, write_file, read_file, ls, edit_file
-from langchain_core.tools import BaseTool
-from langchain_core.language_models import LanguageModelLike
-from .supervisor_agent import get_supervisor_agent
-
-__all__ = [
-    "create_deep_agent",
-    "base_prompt",
-    "DeepAgentState",
-    "get_default_model",
-    "get_fast_model",
-    "SubAgent",
-    "_create_task_tool",
-    "write_todos",
-    "write_file",
-    "read_file",
-    "ls",
-    "edit_file",
-    "BaseTool",
-    "LanguageModelLike",
-    "get_supervisor_agent",
-]
\ No newline at end of file
+"""Deep agent package.
+
+Submodules pull in LangGraph, langmem and the provider SDKs, so names are
+resolved on first attribute access instead of at import time. `import
+agents.deepagent` stays cheap; `create_deep_agent`, `get_research_agent` and
+`get_supervisor_agent` load what they need when first used.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .graph import create_deep_agent, base_prompt
+    from .state import DeepAgentState
+    from .model import get_default_model, get_fast_model, get_local_model
+    from .routing import CascadeChatModel, RoutingPolicy, get_routed_model, get_route_stats
+    from .sub_agent import SubAgent, _create_task_tool
+    from .tools import write_todos, write_file, read_file, ls, edit_file
+    from langchain_core.tools import BaseTool
+    from langchain_core.language_models import LanguageModelLike
+    from .research_agent import get_research_agent
+    from .supervisor_agent import get_supervisor_agent
+
+# Public name -> module that defines it
+_LAZY_ATTRS = {
+    "create_deep_agent": ".graph",
+    "base_prompt": ".graph",
+    "DeepAgentState": ".state",
+    "get_default_model": ".model",
+    "get_fast_model": ".model",
+    "get_local_model": ".model",
+    "CascadeChatModel": ".routing",
+    "RoutingPolicy": ".routing",
+    "get_routed_model": ".routing",
+    "get_route_stats": ".routing",
+    "SubAgent": ".sub_agent",
+    "_create_task_tool": ".sub_agent",
+    "write_todos": ".tools",
+    "write_file": ".tools",
+    "read_file": ".tools",
+    "ls": ".tools",
+    "edit_file": ".tools",
+    "BaseTool": "langchain_core.tools",
+    "LanguageModelLike": "langchain_core.language_models",
+    "get_research_agent": ".research_agent",
+    "get_supervisor_agent": ".supervisor_agent",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,9 +1,7 @@
 from .sub_agent import _create_task_tool, SubAgent
-from .model import get_default_model
 from .tools import write_todos, write_file, read_file, ls, edit_file
 from .state import DeepAgentState
 from typing import Sequence, Union, Callable, Any, TypeVar, Type, Optional
-from langmem import create_manage_memory_tool, create_search_memory_tool
 from langchain_core.tools import BaseTool
 from langchain_core.language_models import LanguageModelLike
 from langgraph.checkpoint.base import BaseCheckpointSaver
@@ -36,6 +34,19 @@ It is critical that you mark todos as completed as soon as you are done with a t
 - When doing web search, prefer to use the `task` tool in order to reduce context usage."""
 
 
+def _context_model_name(model: Union[str, LanguageModelLike]) -> str:
+    """Name of the model whose context window bounds the agent's history."""
+    if isinstance(model, str):
+        return model
+    # Routed and batching wrappers: budget for the model they end up calling
+    for attr in ("default_model", "model"):
+        inner = getattr(model, attr, None)
+        if inner is not None and not isinstance(inner, str):
+            return _context_model_name(inner)
+    bound = getattr(model, "bound", model)
+    return str(getattr(bound, "model", "") or getattr(bound, "model_name", ""))
+
+
 def create_deep_agent(
     tools: Sequence[Union[BaseTool, Callable, dict[str, Any]]],
     instructions: str,
@@ -54,7 +65,8 @@ def create_deep_agent(
         tools: The additional tools the agent should have access to.
         instructions: The additional instructions the agent should have. Will go in
             the system prompt.
-        model: The model to use.
+        model: The model to use. Defaults to the routed model, which sends cheap
+            steps (after todo, memory-save and ls tools) to the fast model and escalates on failure.
         subagents: The subagents to use. Each subagent should be a dictionary with the
             following keys:
                 - `name`
@@ -65,6 +77,12 @@ def create_deep_agent(
         store: The long-term memory store for the agent's memories.
         checkpointer: The checkpointer for saving conversation state (short-term memory).
     """
+    # langmem and the provider SDKs behind the routed model are slow to import,
+    # so they are loaded on the first agent build rather than with the package
+    from langmem import create_manage_memory_tool, create_search_memory_tool
+    from .routing import get_routed_model
+    from ..utils import create_compaction_hook
+
     prompt = instructions + base_prompt
     
     store = store or InMemoryStore(index={"dims": 768, "embed": "google:text-embedding-004"})
@@ -84,14 +102,18 @@ def create_deep_agent(
         manage_memory_tool,
     ]
     if model is None:
-        model = get_default_model()
+        model = get_routed_model()
     
     assert model is not None, "Model must not be None when calling create_react_agent"
     
     state_schema = state_schema or DeepAgentState
+
+    # Compact old tool output before each model call instead of overflowing the context
+    compaction_hook = create_compaction_hook(_context_model_name(model))
     
     task_tool = _create_task_tool(
-        list(tools) + built_in_tools, instructions, subagents or [], model, state_schema
+        list(tools) + built_in_tools, instructions, subagents or [], model, state_schema,
+        pre_model_hook=compaction_hook,
     )
     
     all_tools = built_in_tools + list(tools) + [task_tool]
@@ -102,4 +124,5 @@ def create_deep_agent(
         tools=all_tools,
         state_schema=state_schema,
         checkpointer=checkpointer,
+        pre_model_hook=compaction_hook,
     )
\ No newline at end of file
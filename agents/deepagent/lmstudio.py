@@ -2,13 +2,16 @@
 
 import json
 import logging
-from typing import Any, List, Optional
+from typing import Any, AsyncIterator, Iterator, List, Optional
 
-from langchain_core.callbacks.manager import CallbackManagerForLLMRun
+from langchain_core.callbacks.manager import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
 from langchain_core.messages import (
     BaseMessage,
 )
-from langchain_core.outputs import ChatResult
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
 from langchain_openai import ChatOpenAI
 from pydantic import Field, SecretStr
 
@@ -52,24 +55,15 @@ class ChatLMStudio(ChatOpenAI):
         )
         self.format = format
 
-    def _generate(
-        self,
-        messages: List[BaseMessage],
-        stop: Optional[List[str]] = None,
-        run_manager: Optional[CallbackManagerForLLMRun] = None,
-        **kwargs: Any,
-    ) -> ChatResult:
-        """Generate a chat response using LMStudio's OpenAI-compatible API."""
-
+    def _apply_format(self, kwargs: dict) -> dict:
         if self.format == "json":
             # Set response_format for JSON mode
             kwargs["response_format"] = {"type": "json_object"}
             logger.info(f"Using response_format={kwargs['response_format']}")
+        return kwargs
 
-        # Call the parent class's _generate method
-        result = super()._generate(messages, stop, run_manager, **kwargs)
-
-        # If JSON format is requested, try to clean up the response
+    def _clean_json_result(self, result: ChatResult) -> ChatResult:
+        """Strip any text around the JSON object in a complete generation."""
         if self.format == "json" and result.generations:
             try:
                 # Get the raw text
@@ -96,3 +90,120 @@ class ChatLMStudio(ChatOpenAI):
                 pass
 
         return result
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Generate a chat response using LMStudio's OpenAI-compatible API."""
+        kwargs = self._apply_format(kwargs)
+        result = super()._generate(messages, stop, run_manager, **kwargs)
+        return self._clean_json_result(result)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Async version of _generate, so local-model agents can run concurrently."""
+        kwargs = self._apply_format(kwargs)
+        result = await super()._agenerate(messages, stop, run_manager, **kwargs)
+        return self._clean_json_result(result)
+
+    def _filter_chunk(
+        self, chunk: ChatGenerationChunk, extractor: Optional["JsonStreamExtractor"]
+    ) -> Optional[ChatGenerationChunk]:
+        if extractor is None:
+            return chunk
+        text = extractor.feed(chunk.text)
+        if not text and not chunk.message.usage_metadata and not chunk.generation_info:
+            return None
+        return ChatGenerationChunk(
+            message=chunk.message.model_copy(update={"content": text}),
+            generation_info=chunk.generation_info,
+        )
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        """Stream the response; in JSON mode only the JSON object's tokens are yielded."""
+        kwargs = self._apply_format(kwargs)
+        extractor = JsonStreamExtractor() if self.format == "json" else None
+        for chunk in super()._stream(messages, stop, None, **kwargs):
+            chunk = self._filter_chunk(chunk, extractor)
+            if chunk is None:
+                continue
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """Async stream; in JSON mode only the JSON object's tokens are yielded."""
+        kwargs = self._apply_format(kwargs)
+        extractor = JsonStreamExtractor() if self.format == "json" else None
+        async for chunk in super()._astream(messages, stop, None, **kwargs):
+            chunk = self._filter_chunk(chunk, extractor)
+            if chunk is None:
+                continue
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+class JsonStreamExtractor:
+    """Incrementally finds the first JSON object in a token stream.
+
+    Text before the opening brace and after the matching closing brace is
+    dropped. Braces inside JSON strings are ignored.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.done = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> str:
+        """Return the part of text that belongs to the JSON object."""
+        if self.done or not text:
+            return ""
+        out = []
+        for char in text:
+            if not self.started:
+                if char != "{":
+                    continue
+                self.started = True
+            out.append(char)
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.done = True
+                    break
+        return "".join(out)
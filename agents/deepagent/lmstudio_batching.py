@@ -0,0 +1,171 @@
+"""Prefix-affine request batching in front of a local chat model."""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.callbacks.manager import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+
+def prefix_key(messages: Sequence[BaseMessage], kwargs: Dict[str, Any]) -> str:
+    """Hash of the part of the prompt that is shared between calls: system prompt and tools."""
+    head = messages[0] if messages else None
+    if head is not None and not isinstance(head, SystemMessage):
+        head = None
+    payload = json.dumps(
+        [head.content if head is not None else "", kwargs.get("tools") or []],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class PrefixBatchingChatModel(BaseChatModel):
+    """Groups concurrent requests by system-prompt prefix before sending them to the model.
+
+    Async requests arriving within batch_window_ms are queued per prefix. The
+    dispatcher keeps granting turns to the prefix it served last while it has
+    pending requests (for at most max_consecutive_batches batches in a row),
+    then moves on to the largest group, so requests that share a prefix reach
+    the server back to back and reuse its prefix (KV) cache. At most
+    max_in_flight requests run at once. Each request runs, or streams, in its
+    caller's task once its turn comes; a caller cancelled while queued is
+    dropped. Sync calls pass straight through. The wrapped model runs inside
+    this model's run rather than as a nested run, so tokens are emitted once.
+    """
+
+    model: BaseChatModel
+    batch_window_ms: float = 10.0
+    max_in_flight: int = 4
+    max_consecutive_batches: int = 4
+
+    # prefix -> futures of queued callers, resolved when it is their turn
+    _pending: "OrderedDict[str, List[asyncio.Future]]" = PrivateAttr(default_factory=OrderedDict)
+    _last_prefix: Optional[str] = PrivateAttr(default=None)
+    _streak: int = PrivateAttr(default=0)
+    _slots: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
+    _dispatcher: Optional[asyncio.Task] = PrivateAttr(default=None)
+    _loop: Optional[asyncio.AbstractEventLoop] = PrivateAttr(default=None)
+
+    @property
+    def _llm_type(self) -> str:
+        return "prefix-batching"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": getattr(self.model, "_identifying_params", {})}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self.model._generate_with_cache(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        # The base class emits the yielded chunks to callbacks
+        yield from self.model._stream(messages, stop=stop, **kwargs)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await self._wait_turn(messages, kwargs)
+        try:
+            return await self.model._agenerate_with_cache(messages, stop=stop, run_manager=run_manager, **kwargs)
+        finally:
+            self._slots.release()
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await self._wait_turn(messages, kwargs)
+        try:
+            async for chunk in self.model._astream(messages, stop=stop, **kwargs):
+                yield chunk
+        finally:
+            # Also runs when the caller stops consuming the stream early
+            self._slots.release()
+
+    async def _wait_turn(self, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> None:
+        """Queue the request under its prefix and return once it holds an in-flight slot."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and semaphores belong to one event loop
+            self._loop = loop
+            self._pending = OrderedDict()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._dispatcher = None
+
+        future = loop.create_future()
+        self._pending.setdefault(prefix_key(messages, kwargs), []).append(future)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The turn was granted just as the caller went away
+                self._slots.release()
+            raise
+
+    def _next_prefix(self) -> str:
+        candidates = list(self._pending)
+        if self._last_prefix in self._pending:
+            if self._streak < self.max_consecutive_batches or len(candidates) == 1:
+                return self._last_prefix
+            # One busy prefix must not starve the others
+            candidates.remove(self._last_prefix)
+        return max(candidates, key=lambda key: len(self._pending[key]))
+
+    async def _dispatch(self) -> None:
+        while self._pending:
+            # Let requests that arrive together land in the queue before ordering them
+            await asyncio.sleep(self.batch_window_ms / 1000)
+            while self._pending:
+                prefix = self._next_prefix()
+                batch = self._pending.pop(prefix)
+                self._streak = self._streak + 1 if prefix == self._last_prefix else 1
+                self._last_prefix = prefix
+                logger.debug(f"Dispatching {len(batch)} requests for prefix {prefix[:8]}")
+                for future in batch:
+                    if future.done():
+                        # Caller was cancelled while queued
+                        continue
+                    await self._slots.acquire()
+                    if future.done():
+                        self._slots.release()
+                        continue
+                    future.set_result(None)
@@ -0,0 +1,306 @@
+"""Load-balanced pool of LMStudio / OpenAI-compatible servers."""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+import openai
+from langchain_core.callbacks.manager import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field, PrivateAttr
+
+from .lmstudio import ChatLMStudio
+
+logger = logging.getLogger(__name__)
+
+
+def _is_node_failure(error: Exception) -> bool:
+    """Whether an error means the server is down or broken, rather than the request being bad.
+
+    Client errors (4xx, e.g. context overflow) would fail the same way on every
+    node, so they neither mark the node unhealthy nor get retried elsewhere.
+    """
+    if isinstance(error, (openai.APIConnectionError, httpx.TransportError)):
+        # APITimeoutError is an APIConnectionError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code >= 500
+    return False
+
+
+class PoolNode:
+    """One server in the pool and its routing state."""
+
+    def __init__(self, base_url: str, client: ChatLMStudio):
+        self.base_url = base_url.rstrip("/")
+        self.client = client
+        self.outstanding = 0
+        self.healthy = True
+        self.last_checked = 0.0
+        self.failures = 0
+
+
+class ChatLMStudioPool(BaseChatModel):
+    """Chat model that spreads requests over several LMStudio servers.
+
+    Requests go to the healthy node with the fewest outstanding requests. A
+    node that fails to connect, times out or returns a 5xx is marked unhealthy
+    and the request is retried on another node. Every health_check_interval
+    seconds an unhealthy node is probed with GET /models before the next
+    request is routed, and it takes requests again once the probe succeeds.
+    """
+
+    base_urls: List[str] = Field(description="OpenAI-compatible base URLs, e.g. http://box1:1234/v1")
+    model: str = "qwen_qwq-32b"
+    temperature: float = 0.7
+    format: Optional[str] = Field(default=None, description="Format for the response (e.g., 'json')")
+    health_check_interval: float = 30.0
+    health_check_timeout: float = 2.0
+    max_attempts: int = 3
+
+    _nodes: List[PoolNode] = PrivateAttr(default_factory=list)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._nodes = [
+            PoolNode(
+                base_url,
+                ChatLMStudio(
+                    base_url=base_url,
+                    model=self.model,
+                    temperature=self.temperature,
+                    format=self.format,
+                    max_retries=0,
+                ),
+            )
+            for base_url in self.base_urls
+        ]
+
+    @property
+    def _llm_type(self) -> str:
+        return "lmstudio-pool"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "temperature": self.temperature, "format": self.format}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    # Health checks
+
+    def _needs_check(self, node: PoolNode) -> bool:
+        return not node.healthy and time.monotonic() - node.last_checked >= self.health_check_interval
+
+    def _mark(self, node: PoolNode, healthy: bool) -> None:
+        with self._lock:
+            node.healthy = healthy
+            node.last_checked = time.monotonic()
+            node.failures = 0 if healthy else node.failures + 1
+
+    def _probe(self, nodes: List[PoolNode]) -> None:
+        for node in nodes:
+            try:
+                response = httpx.get(f"{node.base_url}/models", timeout=self.health_check_timeout)
+                self._mark(node, response.status_code == 200)
+            except httpx.HTTPError:
+                self._mark(node, False)
+
+    async def _aprobe(self, nodes: List[PoolNode]) -> None:
+        if not nodes:
+            return
+        async with httpx.AsyncClient(timeout=self.health_check_timeout) as client:
+            async def probe(node: PoolNode):
+                try:
+                    response = await client.get(f"{node.base_url}/models")
+                    self._mark(node, response.status_code == 200)
+                except httpx.HTTPError:
+                    self._mark(node, False)
+            await asyncio.gather(*(probe(node) for node in nodes))
+
+    def _due_for_check(self) -> List[PoolNode]:
+        """Claim the unhealthy nodes whose re-check is due, so concurrent requests probe each once."""
+        with self._lock:
+            due = [node for node in self._nodes if self._needs_check(node)]
+            for node in due:
+                node.last_checked = time.monotonic()
+        return due
+
+    def check_health(self) -> Dict[str, bool]:
+        """Probe every node and return base_url -> healthy."""
+        self._probe(self._nodes)
+        return {node.base_url: node.healthy for node in self._nodes}
+
+    async def acheck_health(self) -> Dict[str, bool]:
+        """Async version of check_health; probes all nodes concurrently."""
+        await self._aprobe(self._nodes)
+        return {node.base_url: node.healthy for node in self._nodes}
+
+    # Routing
+
+    def _acquire(self, tried: set) -> PoolNode:
+        """Reserve the least loaded healthy node not tried yet for this request."""
+        with self._lock:
+            candidates = [node for node in self._nodes if id(node) not in tried and node.healthy]
+            if not candidates:
+                # Everything looks down; give the node with the fewest failures another chance
+                candidates = [node for node in self._nodes if id(node) not in tried]
+            if not candidates:
+                raise RuntimeError("No LMStudio servers available in the pool")
+            node = min(candidates, key=lambda n: (n.outstanding, n.failures))
+            node.outstanding += 1
+            tried.add(id(node))
+            return node
+
+    def _release(self, node: PoolNode, ok: bool) -> None:
+        with self._lock:
+            node.outstanding -= 1
+        if ok and not node.healthy:
+            self._mark(node, True)
+        elif not ok:
+            self._mark(node, False)
+
+    def _attempts(self) -> int:
+        return max(1, min(self.max_attempts, len(self._nodes)))
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self._probe(self._due_for_check())
+        tried: set = set()
+        last_error: Optional[Exception] = None
+        for _ in range(self._attempts()):
+            node = self._acquire(tried)
+            try:
+                result = node.client._generate(messages, stop, None, **kwargs)
+            except Exception as e:
+                if not _is_node_failure(e):
+                    self._release(node, ok=True)
+                    raise
+                self._release(node, ok=False)
+                logger.warning(f"LMStudio server {node.base_url} failed: {e}, retrying on another server")
+                last_error = e
+                continue
+            self._release(node, ok=True)
+            return result
+        raise last_error
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await self._aprobe(self._due_for_check())
+        tried: set = set()
+        last_error: Optional[Exception] = None
+        for _ in range(self._attempts()):
+            node = self._acquire(tried)
+            try:
+                result = await node.client._agenerate(messages, stop, None, **kwargs)
+            except Exception as e:
+                if not _is_node_failure(e):
+                    self._release(node, ok=True)
+                    raise
+                self._release(node, ok=False)
+                logger.warning(f"LMStudio server {node.base_url} failed: {e}, retrying on another server")
+                last_error = e
+                continue
+            self._release(node, ok=True)
+            return result
+        raise last_error
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        self._probe(self._due_for_check())
+        tried: set = set()
+        last_error: Optional[Exception] = None
+        for _ in range(self._attempts()):
+            node = self._acquire(tried)
+            started = False
+            failed = False
+            try:
+                for chunk in node.client._stream(messages, stop, None, **kwargs):
+                    started = True
+                    if run_manager:
+                        run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                    yield chunk
+            except Exception as e:
+                failed = _is_node_failure(e)
+                # Output already reached the caller; retrying would duplicate it
+                if started or not failed:
+                    raise
+                logger.warning(f"LMStudio server {node.base_url} failed: {e}, retrying on another server")
+                last_error = e
+                continue
+            finally:
+                # Also runs when the caller stops consuming the stream early
+                self._release(node, ok=not failed)
+            return
+        raise last_error
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await self._aprobe(self._due_for_check())
+        tried: set = set()
+        last_error: Optional[Exception] = None
+        for _ in range(self._attempts()):
+            node = self._acquire(tried)
+            started = False
+            failed = False
+            try:
+                async for chunk in node.client._astream(messages, stop, None, **kwargs):
+                    started = True
+                    if run_manager:
+                        await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                    yield chunk
+            except Exception as e:
+                failed = _is_node_failure(e)
+                # Output already reached the caller; retrying would duplicate it
+                if started or not failed:
+                    raise
+                logger.warning(f"LMStudio server {node.base_url} failed: {e}, retrying on another server")
+                last_error = e
+                continue
+            finally:
+                # Also runs when the caller stops consuming the stream early
+                self._release(node, ok=not failed)
+            return
+        raise last_error
+
+    def get_pool_stats(self) -> List[Dict[str, Any]]:
+        """Return per-server outstanding requests, health and consecutive failures."""
+        with self._lock:
+            return [
+                {
+                    "base_url": node.base_url,
+                    "outstanding": node.outstanding,
+                    "healthy": node.healthy,
+                    "failures": node.failures,
+                }
+                for node in self._nodes
+            ]
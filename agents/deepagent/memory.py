@@ -1,8 +1,8 @@
 import asyncio
 from datetime import datetime
+from functools import lru_cache
 from typing import Iterable, Callable, Tuple, List
 from pydantic import BaseModel, Field
-from apscheduler.schedulers.background import BackgroundScheduler
 from langgraph.store.memory import InMemoryStore
 from langgraph.prebuilt import create_react_agent
 from langmem import (
@@ -118,28 +118,36 @@ async def retrieve_relevant_memories(
     return results
 
 # ---- Memory Curation Agent ----
-memory_review_agent = create_react_agent(
-    model=GEMINI_CHAT_MODEL,
-    tools=[
-        create_manage_memory_tool(namespace=("semantic",)),
-        create_search_memory_tool(namespace=("semantic",)),
-    ],
-    prompt=lambda state: [
-        {"role": "system", "content": "Curate memories: merge duplicates, purge low-salience entries."},
-        *state.get("messages", []),
-    ],
-)
+# Built on first use: compiling the agent and starting a scheduler at import
+# slows down every process that merely imports this module.
+@lru_cache(maxsize=1)
+def get_memory_review_agent():
+    return create_react_agent(
+        model=GEMINI_CHAT_MODEL,
+        tools=[
+            create_manage_memory_tool(namespace=("semantic",)),
+            create_search_memory_tool(namespace=("semantic",)),
+        ],
+        prompt=lambda state: [
+            {"role": "system", "content": "Curate memories: merge duplicates, purge low-salience entries."},
+            *state.get("messages", []),
+        ],
+    )
 
 # ---- Scheduler ----
-scheduler = BackgroundScheduler(daemon=True)
+@lru_cache(maxsize=1)
+def get_scheduler():
+    from apscheduler.schedulers.background import BackgroundScheduler
+    return BackgroundScheduler(daemon=True)
 
 def run_weekly_curation():
-    memory_review_agent.invoke(
+    get_memory_review_agent().invoke(
         {"messages": [{"role": "user", "content": "Review and clean up the semantic memory."}]},
         config={"configurable": {"thread_id": "weekly_curation"}},
     )
 
 def start_scheduler():
+    scheduler = get_scheduler()
     scheduler.add_job(run_weekly_curation, "interval", weeks=1, id="weekly_curation")
     if not scheduler.running:
         scheduler.start()
@@ -161,4 +169,4 @@ if __name__ == '__main__':
         while True:
             pass
     except (KeyboardInterrupt, SystemExit):
-        scheduler.shutdown()
+        get_scheduler().shutdown()
@@ -1,3 +1,4 @@
+import os
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 def get_default_model():
@@ -7,6 +8,21 @@ def get_fast_model():
     return ChatGoogleGenerativeAI(model="gemini-2.5-flash-lite", temperature=0.7)
 
 def get_local_model():
-    from lmstudio import ChatLMStudio
-    return ChatLMStudio(model="qwen_qwq-32b", temperature=0.7, format="json")
-
+    from .lmstudio import ChatLMStudio
+    from .lmstudio_batching import PrefixBatchingChatModel
+    from ..llm_cache import get_response_cache
+    # Comma-separated list of local servers, e.g. "http://box1:1234/v1,http://box2:1234/v1"
+    base_urls = [url.strip() for url in os.getenv("LMSTUDIO_BASE_URLS", "").split(",") if url.strip()]
+    if len(base_urls) > 1:
+        from .lmstudio_pool import ChatLMStudioPool
+        model = ChatLMStudioPool(
+            base_urls=base_urls, model="qwen_qwq-32b", temperature=0.7, format="json", cache=get_response_cache()
+        )
+    else:
+        # JSON-mode extraction calls repeat often, so serve duplicates from the response cache
+        model = ChatLMStudio(
+            **({"base_url": base_urls[0]} if base_urls else {}),
+            model="qwen_qwq-32b", temperature=0.7, format="json", cache=get_response_cache(),
+        )
+    # Sub-agents share the local backend; send requests with the same system prompt back to back
+    return PrefixBatchingChatModel(model=model)
@@ -4,10 +4,6 @@ from tavily import TavilyClient
 from .graph import create_deep_agent
 from .sub_agent import SubAgent
 
-# Ensure TAVILY_API_KEY is set in your environment
-if "TAVILY_API_KEY" not in os.environ:
-    raise ValueError("TAVILY_API_KEY environment variable not set.")
-
 def internet_search(
     query: str,
     max_results: int = 5,
@@ -79,6 +75,9 @@ You have access to the `internet_search` tool to run searches.
 """
 
 def get_research_agent():
+    # Checked here rather than at import so the package can be imported without it
+    if "TAVILY_API_KEY" not in os.environ:
+        raise ValueError("TAVILY_API_KEY environment variable not set.")
     return create_deep_agent(
         [internet_search],
         research_instructions,
@@ -0,0 +1,272 @@
+"""Route cheap agent steps to the fast model and escalate to the default model when needed."""
+
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable, RunnableBinding
+from pydantic import BaseModel, Field
+
+from .model import get_default_model, get_fast_model
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens (input, output). Update as pricing changes.
+MODEL_PRICES = {
+    "gemini-2.5-pro": (1.25, 10.0),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.5-flash": (0.30, 2.50),
+}
+
+# Per-route counters: calls, escalations, latency_s, input_tokens, output_tokens, cost_usd
+ROUTE_STATS: Dict[str, Dict[str, float]] = {}
+
+
+class RoutingPolicy(BaseModel):
+    """Decides which steps go to the fast model and when to escalate."""
+
+    fast_routes: List[str] = Field(
+        default=["todos", "memory", "files"],
+        description="Routes served by the fast model first.",
+    )
+    route_after_tools: Dict[str, str] = Field(
+        default={"write_todos": "todos", "manage_memory": "memory", "ls": "files"},
+        description="Route for agent turns that only follow results of these tools; other turns are 'agent'.",
+    )
+    escalate_on_invalid_tool_calls: bool = True
+    escalate_on_empty_response: bool = True
+    always_default: bool = Field(default=False, description="Disable routing and always use the default model.")
+
+
+def _model_name(model: Any) -> str:
+    bound = getattr(model, "bound", model)
+    return str(getattr(bound, "model", "") or getattr(bound, "model_name", "")).split("/")[-1]
+
+
+def _estimate_cost(model_name: str, usage: Dict[str, Any]) -> float:
+    for name, (input_price, output_price) in sorted(MODEL_PRICES.items(), key=lambda p: len(p[0]), reverse=True):
+        if model_name.startswith(name):
+            return (
+                usage.get("input_tokens", 0) * input_price
+                + usage.get("output_tokens", 0) * output_price
+            ) / 1_000_000
+    return 0.0
+
+
+def record_route(route: str, model: Any, started: float, message: Any = None, escalated: bool = False) -> None:
+    """Add one call's latency, token usage and cost to ROUTE_STATS[route]."""
+    stats = ROUTE_STATS.setdefault(route, {
+        "calls": 0, "escalations": 0, "latency_s": 0.0,
+        "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+    })
+    usage = getattr(message, "usage_metadata", None) or {}
+    stats["calls"] += 1
+    stats["escalations"] += int(escalated)
+    stats["latency_s"] += time.perf_counter() - started
+    stats["input_tokens"] += usage.get("input_tokens", 0)
+    stats["output_tokens"] += usage.get("output_tokens", 0)
+    stats["cost_usd"] += _estimate_cost(_model_name(model), usage)
+
+
+def default_route_selector(messages: Sequence[BaseMessage], policy: RoutingPolicy) -> str:
+    """Pick a route for an agent turn from the tool results it is responding to."""
+    routes = []
+    for message in reversed(messages):
+        if not isinstance(message, ToolMessage):
+            break
+        routes.append(policy.route_after_tools.get(message.name))
+    # Parallel tool calls: one substantive result (e.g. a task report) keeps the turn on the default model
+    if routes and None not in routes and len(set(routes)) == 1:
+        return routes[0]
+    return "agent"
+
+
+def needs_escalation(message: AIMessage, policy: RoutingPolicy) -> bool:
+    """Return True if the fast model's answer failed validation."""
+    if policy.escalate_on_invalid_tool_calls and message.invalid_tool_calls:
+        return True
+    if policy.escalate_on_empty_response and not message.tool_calls and not message.content:
+        return True
+    return False
+
+
+def _unwrap(model: Runnable) -> Tuple[BaseChatModel, Dict[str, Any]]:
+    """Chat model behind a (tool-)bound runnable and the kwargs bound to it."""
+    kwargs: Dict[str, Any] = {}
+    while isinstance(model, RunnableBinding):
+        kwargs = {**model.kwargs, **kwargs}
+        model = model.bound
+    return model, kwargs
+
+
+def _as_chunk(message: AIMessage) -> AIMessageChunk:
+    return AIMessageChunk(
+        content=message.content,
+        additional_kwargs=message.additional_kwargs,
+        response_metadata=message.response_metadata,
+        tool_calls=message.tool_calls,
+        invalid_tool_calls=message.invalid_tool_calls,
+        usage_metadata=message.usage_metadata,
+        id=message.id,
+    )
+
+
+class CascadeChatModel(BaseChatModel):
+    """Chat model that tries the fast model on cheap routes and falls back to the default model."""
+
+    fast_model: Runnable
+    default_model: Runnable
+    policy: RoutingPolicy = Field(default_factory=RoutingPolicy)
+    route_selector: Callable[[Sequence[BaseMessage], RoutingPolicy], str] = default_route_selector
+
+    @property
+    def _llm_type(self) -> str:
+        return "cascade"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "CascadeChatModel":
+        return self.model_copy(update={
+            "fast_model": self.fast_model.bind_tools(tools, **kwargs),
+            "default_model": self.default_model.bind_tools(tools, **kwargs),
+        })
+
+    def _select_route(self, messages: List[BaseMessage]) -> str:
+        if self.policy.always_default:
+            return "agent"
+        return self.route_selector(messages, self.policy)
+
+    def _call(
+        self,
+        route: str,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]],
+        run_manager: Optional[CallbackManagerForLLMRun],
+        **kwargs: Any,
+    ) -> AIMessage:
+        escalated = False
+        if route in self.policy.fast_routes:
+            started = time.perf_counter()
+            model, bound = _unwrap(self.fast_model)
+            # No run manager: a rejected answer must not reach callbacks
+            result = model._generate_with_cache(messages, stop=stop, **{**bound, **kwargs})
+            message = result.generations[0].message
+            record_route(route, self.fast_model, started, message)
+            if not needs_escalation(message, self.policy):
+                return message
+            logger.info(f"Escalating '{route}' step to the default model")
+            escalated = True
+
+        started = time.perf_counter()
+        model, bound = _unwrap(self.default_model)
+        result = model._generate_with_cache(messages, stop=stop, run_manager=run_manager, **{**bound, **kwargs})
+        message = result.generations[0].message
+        record_route(route, self.default_model, started, message, escalated)
+        return message
+
+    async def _acall(
+        self,
+        route: str,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]],
+        run_manager: Optional[AsyncCallbackManagerForLLMRun],
+        **kwargs: Any,
+    ) -> AIMessage:
+        escalated = False
+        if route in self.policy.fast_routes:
+            started = time.perf_counter()
+            model, bound = _unwrap(self.fast_model)
+            # No run manager: a rejected answer must not reach callbacks
+            result = await model._agenerate_with_cache(messages, stop=stop, **{**bound, **kwargs})
+            message = result.generations[0].message
+            record_route(route, self.fast_model, started, message)
+            if not needs_escalation(message, self.policy):
+                return message
+            logger.info(f"Escalating '{route}' step to the default model")
+            escalated = True
+
+        started = time.perf_counter()
+        model, bound = _unwrap(self.default_model)
+        result = await model._agenerate_with_cache(messages, stop=stop, run_manager=run_manager, **{**bound, **kwargs})
+        message = result.generations[0].message
+        record_route(route, self.default_model, started, message, escalated)
+        return message
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = self._call(self._select_route(messages), messages, stop, run_manager, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        message = await self._acall(self._select_route(messages), messages, stop, run_manager, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    # The routed models run without callbacks of their own: the chunks yielded
+    # here are the only ones that reach callbacks (and the UI), via this run.
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        route = self._select_route(messages)
+        if route in self.policy.fast_routes:
+            # Fast answers are validated before they are used, so they arrive whole
+            yield ChatGenerationChunk(message=_as_chunk(self._call(route, messages, stop, None, **kwargs)))
+            return
+        started = time.perf_counter()
+        model, bound = _unwrap(self.default_model)
+        message = None
+        for chunk in model._stream(messages, stop=stop, **{**bound, **kwargs}):
+            message = chunk.message if message is None else message + chunk.message
+            yield chunk
+        record_route(route, self.default_model, started, message)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        route = self._select_route(messages)
+        if route in self.policy.fast_routes:
+            message = await self._acall(route, messages, stop, None, **kwargs)
+            yield ChatGenerationChunk(message=_as_chunk(message))
+            return
+        started = time.perf_counter()
+        model, bound = _unwrap(self.default_model)
+        message = None
+        async for chunk in model._astream(messages, stop=stop, **{**bound, **kwargs}):
+            message = chunk.message if message is None else message + chunk.message
+            yield chunk
+        record_route(route, self.default_model, started, message)
+
+
+def get_routed_model(policy: Optional[RoutingPolicy] = None) -> CascadeChatModel:
+    """Get the default agent model with cheap steps routed to the fast model."""
+    return CascadeChatModel(
+        fast_model=get_fast_model(),
+        default_model=get_default_model(),
+        policy=policy or RoutingPolicy(),
+    )
+
+
+def get_route_stats() -> Dict[str, Dict[str, float]]:
+    """Return per-route call counts, escalations, latency, tokens and estimated cost."""
+    return {route: dict(stats) for route, stats in ROUTE_STATS.items()}
@@ -1,5 +1,5 @@
 from .prompts import TASK_DESCRIPTION_PREFIX, TASK_DESCRIPTION_SUFFIX
-from state import DeepAgentState
+from .state import DeepAgentState
 from langgraph.prebuilt import create_react_agent
 from langchain_core.tools import BaseTool, tool
 from typing import TypedDict, Annotated, NotRequired, List
@@ -16,9 +16,11 @@ class SubAgent(TypedDict):
     tools: NotRequired[List[str]]
 
 
-def _create_task_tool(tools, instructions, subagents: List[SubAgent], model, state_schema):
+def _create_task_tool(tools, instructions, subagents: List[SubAgent], model, state_schema, pre_model_hook=None):
     agents = {
-        "general-purpose": create_react_agent(model, prompt=instructions, tools=tools)
+        "general-purpose": create_react_agent(
+            model, prompt=instructions, tools=tools, pre_model_hook=pre_model_hook
+        )
     }
     tools_by_name = {tool.name: tool for tool in tools if isinstance(tool, BaseTool)}
     for t in tools:
@@ -38,7 +40,8 @@ def _create_task_tool(tools, instructions, subagents: List[SubAgent], model, sta
             agent_tools = tools
             
         agents[_agent['name']] = create_react_agent(
-            model, prompt=_agent['prompt'], tools=agent_tools, state_schema=state_schema
+            model, prompt=_agent['prompt'], tools=agent_tools, state_schema=state_schema,
+            pre_model_hook=pre_model_hook,
         )
 
     other_agents_string = "\n".join([
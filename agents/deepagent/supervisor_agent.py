@@ -5,8 +5,7 @@ from langchain_core.tools import tool
 
 from .graph import create_deep_agent
 from .sub_agent import SubAgent
-from ..resources.search import search_for_agencies
-from ..resources.chat import display_agencies
+from ..tools.registry import get_tools
 from ..tools.frontend_actions import (
     show_resume_builder,
     update_resume_data,
@@ -77,8 +76,8 @@ cover_letter_sub_agent: SubAgent = {
 def get_supervisor_agent():
     """Return the main agent with access to specialized sub-agents."""
     tools = [
-        search_for_agencies,
-        display_agencies,
+        # Loaded on first call; the resources module builds Gemini and geocoder clients
+        *get_tools(["search_for_agencies", "display_agencies"]),
         show_resume_builder,
         update_resume_data,
         show_cover_letter_builder,
@@ -1,105 +1,4 @@
-from .sub_agents import _create_task_tool, SubAgent
-from .model import get_default_model
-from .tools import write_todos, write_file, read_file, ls, edit_file
-from .state import DeepAgentState
-from typing import Sequence, Union, Callable, Any, TypeVar, Type, Optional
-from langmem import create_manage_memory_tool, create_search_memory_tool
-from langchain_core.tools import BaseTool
-from langchain_core.language_models import LanguageModelLike
-from langgraph.checkpoint.base import BaseCheckpointSaver
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.store.base import BaseStore
-from langgraph.store.memory import InMemoryStore
-from langgraph.prebuilt import create_react_agent
+# Kept for backwards compatibility; the implementation lives in agents/deepagent/graph.py
+from .deepagent.graph import create_deep_agent, base_prompt, StateSchema, StateSchemaType
 
-StateSchema = TypeVar("StateSchema", bound=DeepAgentState)
-StateSchemaType = Type[StateSchema]
-
-base_prompt = """You have access to a number of standard tools
-
-## `manage_memory` and `search_memory`
-
-You have long-term memory tools. Use them to remember key facts, user preferences, and project-specific context across conversations.
-
-- **Before starting a task**, use `search_memory` to see if you already have relevant information.
-- **After learning something new and important** (e.g., a user preference, a technical decision, a file's purpose), use `manage_memory` to save it.
-- **When creating memories**, be concise but include enough context to be useful later.
-
-## `write_todos`
-
-You have access to the `write_todos` tools to help you manage and plan tasks. Use these tools VERY frequently to ensure that you are tracking your tasks and giving the user visibility into your progress.
-These tools are also EXTREMELY helpful for planning tasks, and for breaking down larger complex tasks into smaller steps. If you do not use this tool when planning, you may forget to do important tasks - and that is unacceptable.
-
-It is critical that you mark todos as completed as soon as you are done with a task. Do not batch up multiple tasks before marking them as completed.
-## `task`
-
-- When doing web search, prefer to use the `task` tool in order to reduce context usage."""
-
-
-def create_deep_agent(
-    tools: Sequence[Union[BaseTool, Callable, dict[str, Any]]],
-    instructions: str,
-    model: Optional[Union[str, LanguageModelLike]] = None,
-    subagents: Optional[list[SubAgent]] = None,
-    state_schema: Optional[StateSchemaType] = None,
-    store: Optional[BaseStore] = None,
-    checkpointer: Optional[BaseCheckpointSaver] = None,
-):
-    """Create a deep agent.
-
-    This agent will by default have access to a tool to write todos (write_todos),
-    and then four file editing tools: write_file, ls, read_file, edit_file.
-
-    Args:
-        tools: The additional tools the agent should have access to.
-        instructions: The additional instructions the agent should have. Will go in
-            the system prompt.
-        model: The model to use.
-        subagents: The subagents to use. Each subagent should be a dictionary with the
-            following keys:
-                - `name`
-                - `description` (used by the main agent to decide whether to call the sub agent)
-                - `prompt` (used as the system prompt in the subagent)
-                - (optional) `tools`
-        state_schema: The schema of the deep agent. Should subclass from DeepAgentState.
-        store: The long-term memory store for the agent's memories.
-        checkpointer: The checkpointer for saving conversation state (short-term memory).
-    """
-    prompt = instructions + base_prompt
-    
-    store = store or InMemoryStore(index={"dims": 768, "embed": "google:text-embedding-004"})
-    checkpointer = checkpointer or MemorySaver()
-
-    name_space = ("deep_agent", "{project_id}")
-    manage_memory_tool = create_manage_memory_tool(namespace=name_space)
-    search_memory_tool = create_search_memory_tool(namespace=name_space)
-
-    built_in_tools = [
-        write_todos,
-        write_file,
-        read_file,
-        ls,
-        edit_file,
-        search_memory_tool,
-        manage_memory_tool,
-    ]
-    if model is None:
-        model = get_default_model()
-    
-    assert model is not None, "Model must not be None when calling create_react_agent"
-    
-    state_schema = state_schema or DeepAgentState
-    
-    task_tool = _create_task_tool(
-        list(tools) + built_in_tools, instructions, subagents or [], model, state_schema
-    )
-    
-    all_tools = built_in_tools + list(tools) + [task_tool]
-    
-    return create_react_agent(
-        model,
-        prompt=prompt,
-        tools=all_tools,
-        state_schema=state_schema,
-        checkpointer=checkpointer,
-    )
\ No newline at end of file
+__all__ = ["create_deep_agent", "base_prompt", "StateSchema", "StateSchemaType"]
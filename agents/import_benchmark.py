@@ -0,0 +1,130 @@
+"""Cold-start import benchmark for the agent packages.
+
+Each statement is run in a fresh interpreter so nothing is served from an
+already-populated sys.modules. The interpreter's own startup time is measured
+the same way and subtracted. Module budgets are checked against the cumulative
+time reported by `python -X importtime`, which excludes interpreter startup
+and catches modules that do work (client construction, agent compilation) at
+import. Exits with status 1 when any median is over its budget, so it can
+gate CI:
+
+    python -m agents.import_benchmark
+    python -m agents.import_benchmark --runs 10 --scale 2.0 --top 15
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Statement -> budget in milliseconds (interpreter startup excluded).
+# Package imports must stay close to free; entry points may load LangGraph.
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+    "import agents": 50,
+    "import agents.deepagent": 50,
+    "from agents.deepagent import DeepAgentState": 1500,
+    "from agents.deepagent import create_deep_agent": 3000,
+}
+
+# Module -> cumulative `-X importtime` budget in milliseconds. These modules used to
+# build clients or agents at import; they may load their libraries but nothing more.
+IMPORTTIME_BUDGETS_MS: Dict[str, float] = {
+    "agents.tools.registry": 800,
+    "agents.tools.tts": 800,
+    "agents.resources.search": 2000,
+    "agents.resources.chat": 2500,
+    "agents.deepagent.memory": 2500,
+}
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def time_statement(statement: str, runs: int = 5) -> List[float]:
+    """Wall-clock milliseconds for running the statement in `runs` fresh interpreters."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", statement],
+            cwd=REPO_ROOT,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def importtime_profile(module: str) -> Dict[str, Tuple[float, float]]:
+    """Run `python -X importtime -c "import module"`; return name -> (self ms, cumulative ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    profile = {}
+    # Lines look like: "import time:      1024 |      20480 |   agents.tools"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return profile
+
+
+def run_importtime_benchmark(
+    budgets: Dict[str, float] = IMPORTTIME_BUDGETS_MS, runs: int = 5, scale: float = 1.0
+) -> List[Tuple[str, float, float, Dict[str, Tuple[float, float]]]]:
+    """Return (module, median cumulative ms, budget ms, last profile) for each module."""
+    results = []
+    for module, budget in budgets.items():
+        cumulative, profile = [], {}
+        for _ in range(runs):
+            profile = importtime_profile(module)
+            cumulative.append(profile.get(module, (0.0, 0.0))[1])
+        results.append((module, statistics.median(cumulative), budget * scale, profile))
+    return results
+
+
+def run_benchmark(
+    budgets: Dict[str, float] = IMPORT_BUDGETS_MS, runs: int = 5, scale: float = 1.0
+) -> List[Tuple[str, float, float]]:
+    """Return (statement, median ms, budget ms) for each statement."""
+    baseline = statistics.median(time_statement("pass", runs))
+    results = []
+    for statement, budget in budgets.items():
+        median = statistics.median(time_statement(statement, runs)) - baseline
+        results.append((statement, max(median, 0.0), budget * scale))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per statement")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, e.g. for slow CI machines")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list for modules over budget")
+    args = parser.parse_args()
+
+    failed = False
+    for statement, median, budget in run_benchmark(runs=args.runs, scale=args.scale):
+        status = "ok" if median <= budget else "OVER BUDGET"
+        failed |= median > budget
+        print(f"{median:9.1f} ms / {budget:7.0f} ms  {status:11}  {statement}")
+
+    for module, median, budget, profile in run_importtime_benchmark(runs=args.runs, scale=args.scale):
+        status = "ok" if median <= budget else "OVER BUDGET"
+        print(f"{median:9.1f} ms / {budget:7.0f} ms  {status:11}  -X importtime {module}")
+        if median > budget:
+            failed = True
+            slowest = sorted(profile.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+            for name, (self_ms, _) in slowest:
+                print(f"{'':34}{self_ms:9.1f} ms  {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
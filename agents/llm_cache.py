@@ -0,0 +1,164 @@
+"""Response cache for deterministic, tool-style LLM calls.
+
+Plugs into LangChain's `cache=` hook on any BaseChatModel. Entries are scoped by
+the model's llm_string, which already encodes the model name, temperature and
+other call parameters, so different models or temperatures never share hits.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_SIMILARITY_THRESHOLD = 0.97
+
+
+def _normalize(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class SemanticResponseCache(BaseCache):
+    """In-memory LLM cache with exact prompt-hash hits and optional semantic hits.
+
+    Args:
+        max_entries: Maximum number of cached responses; least recently used are evicted first
+        ttl_seconds: Seconds before an entry expires, None to keep entries until evicted
+        embeddings: Embedding model for semantic lookups; exact-match only when None
+        similarity_threshold: Minimum cosine similarity for a semantic hit
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        embeddings: Optional[Embeddings] = None,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        # (llm_string, prompt hash) -> (created_at, prompt vector, return value)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Optional[List[float]], RETURN_VAL_TYPE]]" = OrderedDict()
+        # Prompt vectors computed during a missed lookup, reused by the following update
+        self._pending_vectors: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+
+    @staticmethod
+    def _hash(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode()).hexdigest()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def _lookup_exact(self, key: Tuple[str, str]) -> Optional[RETURN_VAL_TYPE]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0]):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.stats["exact_hits"] += 1
+            return entry[2]
+
+    def _lookup_semantic(self, llm_string: str, vector: List[float]) -> Optional[RETURN_VAL_TYPE]:
+        best_key, best_score = None, self.similarity_threshold
+        with self._lock:
+            for key, (created_at, entry_vector, _) in self._entries.items():
+                if key[0] != llm_string or entry_vector is None or self._expired(created_at):
+                    continue
+                score = sum(a * b for a, b in zip(vector, entry_vector))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            self.stats["semantic_hits"] += 1
+            return self._entries[best_key][2]
+
+    def _remember_vector(self, prompt_hash: str, vector: List[float]) -> None:
+        with self._lock:
+            self._pending_vectors[prompt_hash] = vector
+            while len(self._pending_vectors) > 256:
+                self._pending_vectors.popitem(last=False)
+
+    def _store(self, prompt_hash: str, llm_string: str, vector: Optional[List[float]], return_val: RETURN_VAL_TYPE) -> None:
+        with self._lock:
+            self._entries[(llm_string, prompt_hash)] = (time.time(), vector, return_val)
+            self._entries.move_to_end((llm_string, prompt_hash))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        prompt_hash = self._hash(prompt)
+        hit = self._lookup_exact((llm_string, prompt_hash))
+        if hit is None and self.embeddings is not None:
+            vector = _normalize(self.embeddings.embed_query(prompt))
+            self._remember_vector(prompt_hash, vector)
+            hit = self._lookup_semantic(llm_string, vector)
+        if hit is None:
+            self.stats["misses"] += 1
+        return hit
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        prompt_hash = self._hash(prompt)
+        hit = self._lookup_exact((llm_string, prompt_hash))
+        if hit is None and self.embeddings is not None:
+            vector = _normalize(await self.embeddings.aembed_query(prompt))
+            self._remember_vector(prompt_hash, vector)
+            hit = self._lookup_semantic(llm_string, vector)
+        if hit is None:
+            self.stats["misses"] += 1
+        return hit
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        prompt_hash = self._hash(prompt)
+        vector = None
+        if self.embeddings is not None:
+            with self._lock:
+                vector = self._pending_vectors.pop(prompt_hash, None)
+            if vector is None:
+                vector = _normalize(self.embeddings.embed_query(prompt))
+        self._store(prompt_hash, llm_string, vector, return_val)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        prompt_hash = self._hash(prompt)
+        vector = None
+        if self.embeddings is not None:
+            with self._lock:
+                vector = self._pending_vectors.pop(prompt_hash, None)
+            if vector is None:
+                vector = _normalize(await self.embeddings.aembed_query(prompt))
+        self._store(prompt_hash, llm_string, vector, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._pending_vectors.clear()
+
+    async def aclear(self, **kwargs: Any) -> None:
+        self.clear()
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> SemanticResponseCache:
+    """Process-wide exact-match response cache shared by tool-style calls."""
+    return SemanticResponseCache()
+
+
+def with_response_cache(model: BaseChatModel, cache: Optional[BaseCache] = None) -> BaseChatModel:
+    """Return a copy of the model that reads and writes the given (or shared) response cache."""
+    return model.model_copy(update={"cache": cache or get_response_cache()})
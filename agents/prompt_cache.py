@@ -0,0 +1,78 @@
+"""Prompt assembly that keeps static instructions in a cacheable prefix."""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Providers that only cache when the prompt carries explicit breakpoints.
+# OpenAI and Gemini cache matching prefixes implicitly, so they just need a stable prefix.
+EXPLICIT_CACHE_PROVIDERS = ("anthropic", "claude")
+
+
+def supports_cache_breakpoints(model_name: Optional[str]) -> bool:
+    """Return True if the model's provider needs explicit cache_control breakpoints."""
+    model_str = str(model_name or "").lower()
+    return any(provider in model_str for provider in EXPLICIT_CACHE_PROVIDERS)
+
+
+def cacheable_text(text: str, model_name: Optional[str] = None) -> Any:
+    """Wrap static text as message content, marking a cache breakpoint after it when supported."""
+    if not supports_cache_breakpoints(model_name):
+        return text
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+
+def build_cached_prompt(
+    static_instructions: str,
+    dynamic_context: str,
+    model_name: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Build OpenAI-style messages with the static instructions as the cacheable prefix.
+
+    Args:
+        static_instructions: Instructions that are identical across calls
+        dynamic_context: Everything that changes per call (date, query, sources, remarks).
+            Order it from most to least stable so consecutive calls share a longer prefix.
+        model_name: Model identifier, used to decide whether to add cache breakpoints
+
+    Returns:
+        List of message dicts, suitable for convert_openai_messages
+    """
+    return [
+        {"role": "system", "content": cacheable_text(static_instructions, model_name)},
+        {"role": "user", "content": dynamic_context},
+    ]
+
+
+def get_cache_usage(message: Any) -> Dict[str, int]:
+    """Extract input and cache-hit token counts from an AI message's usage metadata."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    return {
+        "input_tokens": usage.get("input_tokens", 0) or 0,
+        "cache_read_tokens": details.get("cache_read", 0) or 0,
+        "cache_creation_tokens": details.get("cache_creation", 0) or 0,
+    }
+
+
+def record_cache_usage(state: Dict, tool_name: str, message: Any) -> Dict[str, int]:
+    """Accumulate per-tool cache usage into state["prompt_cache"] and log the hit rate.
+
+    Returns:
+        The usage counts for this call
+    """
+    usage = get_cache_usage(message)
+    totals = state.setdefault("prompt_cache", {}).setdefault(
+        tool_name,
+        {"calls": 0, "input_tokens": 0, "cache_read_tokens": 0, "cache_creation_tokens": 0},
+    )
+    totals["calls"] += 1
+    for key, value in usage.items():
+        totals[key] += value
+
+    if usage["input_tokens"]:
+        logger.info(
+            f"{tool_name}: {usage['cache_read_tokens']}/{usage['input_tokens']} input tokens served from cache"
+        )
+    return usage
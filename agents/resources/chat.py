@@ -1,4 +1,5 @@
 import json
+from functools import lru_cache
 from .state import AgentState
 from langchain_core.messages import SystemMessage
 from langgraph.prebuilt import create_react_agent
@@ -20,7 +21,10 @@ def display_agencies(category_name: str, agencies: list):
     # The backend just needs to know it exists to call it.
     return f"Displayed {len(agencies)} agencies for the category: {category_name}"
 
-llm = create_react_agent(model="google:gemini-2.5-pro", tools=[search_for_agencies, display_agencies])
+@lru_cache(maxsize=1)
+def get_chat_agent():
+    """Compile the chat agent on first use rather than at import."""
+    return create_react_agent(model="google:gemini-2.5-pro", tools=[search_for_agencies, display_agencies])
 
 
 async def chat_node(state: AgentState, config: RunnableConfig):
@@ -35,7 +39,7 @@ async def chat_node(state: AgentState, config: RunnableConfig):
     4.  **Do not manage lists**: You do not have tools to add, update, or delete agencies or categories. All interactions are through chat. If the user wants to change something, they should ask you to search again or refine their request.
     """
 
-    response = await llm.ainvoke(
+    response = await get_chat_agent().ainvoke(
         [
             SystemMessage(content=system_message),
             *state["messages"]
@@ -2,24 +2,32 @@ import os, json, asyncio, time, hashlib
 import re
 from typing import cast, List, Dict, Optional
 from langchain_core.runnables import RunnableConfig
+from functools import lru_cache
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain.tools import tool
 from .state import AgentState
 from copilotkit.langgraph import copilotkit_emit_state, copilotkit_customize_config
-from google import genai
-
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
+from langchain_core.outputs import Generation
+from ..llm_cache import get_response_cache
 
 
 MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")  # supports google_search
-client = genai.Client()
+GEOCODER_UA = os.getenv("GEOCODER_UA", "accessible-solutions/1.0 (contact@example.com)")
 
 
+# Clients are created on first use so importing this module needs no credentials or network
+@lru_cache(maxsize=1)
+def get_genai_client():
+    from google import genai
+    return genai.Client()
 
-GEOCODER_UA = os.getenv("GEOCODER_UA", "accessible-solutions/1.0 (contact@example.com)")
-_geocoder = Nominatim(user_agent=GEOCODER_UA, timeout=10) # type: ignore
-_geocode = RateLimiter(_geocoder.geocode, min_delay_seconds=1.05)  # be nice to public API
+
+@lru_cache(maxsize=1)
+def get_geocode():
+    from geopy.geocoders import Nominatim
+    from geopy.extra.rate_limiter import RateLimiter
+    geocoder = Nominatim(user_agent=GEOCODER_UA, timeout=10) # type: ignore
+    return RateLimiter(geocoder.geocode, min_delay_seconds=1.05)  # be nice to public API
 
 
 
@@ -36,17 +44,26 @@ async def _gemini_search(query: str):
         f"latitude, longitude, notes. Provide lat/long when available. Do not include markdown "
         f"or commentary. Query: {query}"
     )
-    # create chat with google_search tool
-    chat = client.chats.create(
-        model=MODEL,
-        config={
-            "tools": ["google_search"]
-        } # type: ignore
-            
-    )
-    # send prompt and get response
-    response = chat.send_message(prompt)
-    text = response.text or ""
+    # Identical agency queries are common across users, check the response cache first
+    cache = get_response_cache()
+    cache_scope = f"genai:{MODEL}:google_search"
+    cached = await cache.alookup(prompt, cache_scope)
+    if cached:
+        text = cached[0].text
+    else:
+        # create chat with google_search tool
+        chat = get_genai_client().chats.create(
+            model=MODEL,
+            config={
+                "tools": ["google_search"]
+            } # type: ignore
+                
+        )
+        # send prompt and get response
+        response = chat.send_message(prompt)
+        text = response.text or ""
+        if text:
+            await cache.aupdate(prompt, cache_scope, [Generation(text=text)])
     
     # Extract first JSON array
     s = text.strip()
@@ -78,7 +95,7 @@ def _fill_coords_inplace(agencies: List[Dict]) -> None:
             addr = a.get("address")
             if not addr:
                 continue
-            loc = _geocode(addr)
+            loc = get_geocode()(addr)
             if loc:
                 a["latitude"] = loc.latitude
                 a["longitude"] = loc.longitude
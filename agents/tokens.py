@@ -0,0 +1,184 @@
+"""Local token accounting: approximate tokenizers, cached counts and model limits."""
+
+import json
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, MessageLikeRepresentation, convert_to_messages
+
+try:
+    import tiktoken
+except ImportError:  # optional, falls back to the character heuristic
+    tiktoken = None
+
+
+# NOTE: This may be out of date or not applicable to your models. Please update this as needed.
+MODEL_TOKEN_LIMITS = {
+    "openai:gpt-4.1-mini": 1047576,
+    "openai:gpt-4.1-nano": 1047576,
+    "openai:gpt-4.1": 1047576,
+    "openai:gpt-4o-mini": 128000,
+    "openai:gpt-4o": 128000,
+    "openai:o4-mini": 200000,
+    "openai:o3-mini": 200000,
+    "anthropic:claude-opus-4": 200000,
+    "anthropic:claude-sonnet-4": 200000,
+    "anthropic:claude-3-7-sonnet": 200000,
+    "anthropic:claude-3-5-sonnet": 200000,
+    "anthropic:claude-3-5-haiku": 200000,
+    "google:gemini-2.5-pro": 1048576,
+    "google:gemini-2.5-flash": 1048576,
+    "google:gemini-2.5-flash-lite": 1048576,
+    "gemini-2.0-flash-preview-image-generation": 1048576,
+    "ollama:qwen": 32768,
+}
+
+# Average characters per token for each provider family's tokenizer
+CHARS_PER_TOKEN = {
+    "openai": 4.0,
+    "anthropic": 3.5,
+    "gemini": 4.0,
+    "local": 3.5,
+    "default": 4.0,
+}
+# Fixed cost per message for role and separator tokens
+TOKENS_PER_MESSAGE = 4
+# Rough cost of an image content block; providers differ but this keeps budgets safe
+TOKENS_PER_IMAGE = 1000
+MAX_CACHED_COUNTS = 50000
+
+# (family, message id, content hash) -> token count
+_count_cache: "OrderedDict[Tuple[str, Optional[str], int], int]" = OrderedDict()
+# MODEL_TOKEN_LIMITS as last seen, and its (bare name, limit) pairs longest first
+_limits_snapshot: Tuple[Tuple[str, int], ...] = ()
+_limits_by_length: List[Tuple[str, int]] = []
+
+
+def _split_model_name(model_name: str) -> Tuple[str, str]:
+    """Return (provider, bare model name), both lowercased, e.g. ('google', 'gemini-2.5-pro')."""
+    model_str = str(model_name or "").strip().lower()
+    provider, _, bare = model_str.rpartition(":")
+    if bare.startswith("models/"):
+        bare = bare[len("models/"):]
+    return provider, bare
+
+
+def get_provider_family(model_name: Optional[str]) -> str:
+    """Map a model identifier to the tokenizer family used for counting."""
+    return _family(*_split_model_name(model_name))
+
+
+def _family(provider: str, bare: str) -> str:
+    if provider == "openai" or bare.startswith(("gpt-", "o1", "o3", "o4")):
+        return "openai"
+    if provider == "anthropic" or bare.startswith("claude"):
+        return "anthropic"
+    if provider in ("google", "google_genai", "gemini") or bare.startswith(("gemini", "gemma")):
+        return "gemini"
+    if provider in ("ollama", "lmstudio") or bare.startswith(("qwen", "llama", "mistral")):
+        return "local"
+    return "default"
+
+
+def resolve_model_token_limit(model_name: Optional[str]) -> Optional[int]:
+    """Look up a model's token limit by longest-prefix match on the bare model name.
+
+    The provider prefix is ignored, so "openai:gpt-4o-mini", "azure_openai:gpt-4o",
+    "gemini-2.5-pro" and "models/gemini-2.5-flash" all resolve. Results are cached
+    per bare name until MODEL_TOKEN_LIMITS changes.
+
+    Returns:
+        Token limit as integer if found, None if model not in lookup table
+    """
+    if not model_name:
+        return None
+    global _limits_snapshot, _limits_by_length
+    snapshot = tuple(MODEL_TOKEN_LIMITS.items())
+    if snapshot != _limits_snapshot:
+        limits = [(_split_model_name(key)[1], limit) for key, limit in snapshot]
+        # Longest bare name first so "gpt-4.1-mini" wins over "gpt-4.1"
+        _limits_by_length = sorted(limits, key=lambda item: len(item[0]), reverse=True)
+        _limits_snapshot = snapshot
+        _limit_for_bare_name.cache_clear()
+    return _limit_for_bare_name(_split_model_name(model_name)[1])
+
+
+@lru_cache(maxsize=256)
+def _limit_for_bare_name(bare: str) -> Optional[int]:
+    for key_bare, limit in _limits_by_length:
+        if bare.startswith(key_bare):
+            return limit
+    return None
+
+
+@lru_cache(maxsize=8)
+def _get_tiktoken_encoding(model_name: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_text_tokens(text: str, model_name: Optional[str] = None) -> int:
+    """Count tokens in a string without calling the provider."""
+    if not text:
+        return 0
+    family = get_provider_family(model_name)
+    if family == "openai":
+        encoding = _get_tiktoken_encoding(_split_model_name(model_name)[1])
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+    return int(len(text) / CHARS_PER_TOKEN[family]) + 1
+
+
+def _message_text(message: BaseMessage) -> Tuple[str, int]:
+    """Return (text to tokenize, number of image blocks) for a message."""
+    images = 0
+    if isinstance(message.content, str):
+        parts = [message.content]
+    else:
+        parts = []
+        for block in message.content:
+            if isinstance(block, str):
+                parts.append(block)
+            elif block.get("type") == "text":
+                parts.append(block.get("text", ""))
+            elif block.get("type") in ("image", "image_url"):
+                images += 1
+            else:
+                parts.append(json.dumps(block, default=str))
+    if isinstance(message, AIMessage) and message.tool_calls:
+        parts.append(json.dumps([
+            {"name": tool_call["name"], "args": tool_call["args"]} for tool_call in message.tool_calls
+        ], default=str))
+    return "\n".join(parts), images
+
+
+def count_message_tokens(message: MessageLikeRepresentation, model_name: Optional[str] = None) -> int:
+    """Count tokens for one message, cached by message ID and content."""
+    if not isinstance(message, BaseMessage):
+        message = convert_to_messages([message])[0]
+    text, images = _message_text(message)
+    family = get_provider_family(model_name)
+    # Content is part of the key so edited copies of a message (same ID) are recounted
+    key = (family, message.id, hash(text))
+    count = _count_cache.get(key)
+    if count is not None:
+        _count_cache.move_to_end(key)
+        return count
+
+    count = TOKENS_PER_MESSAGE + count_text_tokens(text, model_name) + images * TOKENS_PER_IMAGE
+    _count_cache[key] = count
+    if len(_count_cache) > MAX_CACHED_COUNTS:
+        _count_cache.popitem(last=False)
+    return count
+
+
+def count_messages_tokens(
+    messages: Iterable[MessageLikeRepresentation], model_name: Optional[str] = None
+) -> int:
+    """Count tokens for a whole history; unchanged messages are served from the cache."""
+    return sum(count_message_tokens(message, model_name) for message in messages)
@@ -0,0 +1,356 @@
+"""Asyncio interface to a DockerComputerWithSDK session.
+
+Input goes to the same in-container daemon over a `docker exec -i` subprocess
+whose stdin/stdout stay open, and screenshots and commands run as asyncio
+subprocesses. Waiting on a session never blocks the event loop, so one server
+process can drive many computers concurrently without a thread per session.
+Container setup (creation, pool checkout) and frame encoding are one-off or
+CPU-bound and run in a worker thread.
+"""
+
+import asyncio
+import json
+import logging
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from .docker_daemon import DAEMON_PATH, DAEMON_SOURCE, ComputerDaemonError
+from .screen_frames import Frame
+
+logger = logging.getLogger(__name__)
+
+# Daemon shutdowns scheduled on their own loop by close_threadsafe
+_pending_closes: set = set()
+
+
+async def docker_exec(
+    container_id: str,
+    argv: List[str],
+    display: Optional[str] = None,
+    stdin: Optional[bytes] = None,
+    timeout: Optional[float] = 60.0,
+) -> Tuple[int, bytes, bytes]:
+    """Run a command in the container without a shell; returns (exit code, stdout, stderr)."""
+    options = ["-i"] if stdin is not None else []
+    if display:
+        options += ["-e", f"DISPLAY={display}"]
+    process = await asyncio.create_subprocess_exec(
+        "docker", "exec", *options, container_id, *argv,
+        stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        out, err = await asyncio.wait_for(process.communicate(stdin), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, out, err
+
+
+class AsyncComputerDaemon:
+    """Async counterpart of ComputerDaemon, talking to it through `docker exec -i`."""
+
+    def __init__(self, container_id: str, display: str = ":99", timeout: float = 30.0):
+        self.container_id = container_id
+        self.display = display
+        self.timeout = timeout
+        self.geometry: Optional[Dict[str, int]] = None
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        # Loop the subprocess belongs to
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._next_id = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> "AsyncComputerDaemon":
+        self._loop = asyncio.get_running_loop()
+        exit_code, _, err = await docker_exec(
+            self.container_id, ["sh", "-c", f"cat > {DAEMON_PATH}"], stdin=DAEMON_SOURCE.read_bytes()
+        )
+        if exit_code != 0:
+            raise RuntimeError(f"Could not copy the computer daemon: {err.decode(errors='replace').strip()}")
+        self._process = await asyncio.create_subprocess_exec(
+            "docker", "exec", "-i", "-e", f"DISPLAY={self.display}", self.container_id,
+            "python3", "-u", DAEMON_PATH,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            ready = await self._read_message()
+        except Exception:
+            await self.close()
+            raise
+        if not ready.get("ready"):
+            await self.close()
+            raise RuntimeError(f"Computer daemon failed to start: {ready}")
+        self.geometry = {"width": ready["width"], "height": ready["height"]}
+        return self
+
+    async def _read_message(self) -> Dict[str, Any]:
+        line = await asyncio.wait_for(self._process.stdout.readline(), self.timeout)
+        if not line:
+            raise EOFError("Computer daemon closed its output stream")
+        return json.loads(line)
+
+    async def run(self, actions: List[Dict[str, Any]]) -> List[Any]:
+        """Same contract as ComputerDaemon.run."""
+        if not self.alive:
+            raise EOFError("Computer daemon is not running")
+        async with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            try:
+                self._process.stdin.write((json.dumps({"id": request_id, "actions": actions}) + "\n").encode())
+                await self._process.stdin.drain()
+                response = await self._read_message()
+            except (OSError, EOFError, ValueError, asyncio.TimeoutError):
+                await self.close()
+                raise
+        if response.get("id") != request_id:
+            await self.close()
+            raise EOFError("Computer daemon response out of sync")
+        if not response.get("ok"):
+            raise ComputerDaemonError(response.get("error", "unknown error"), response.get("completed"))
+        return response["results"]
+
+    async def close(self) -> None:
+        process, self._process = self._process, None
+        if process is None or process.returncode is not None:
+            return
+        process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), 2)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    def close_threadsafe(self, timeout: float = 5.0) -> None:
+        """Close from any thread, e.g. when the session manager evicts the session."""
+        loop = self._loop
+        if not self.alive or loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            # Can't block the loop on itself; finish the shutdown in the background
+            task = loop.create_task(self.close())
+            _pending_closes.add(task)
+            task.add_done_callback(_pending_closes.discard)
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Failed to stop async computer daemon in {self.container_id}: {e}")
+
+
+class AsyncDockerComputer:
+    """Coroutine API over a DockerComputerWithSDK.
+
+    The wrapped computer owns the container, screenshot settings and action
+    plans; this class only changes how they are executed. Methods return the
+    same strings as their sync counterparts.
+    """
+
+    def __init__(self, computer):
+        self.computer = computer
+        self._daemon: Optional[AsyncComputerDaemon] = None
+        self._daemon_unavailable = False
+        # Parallel calls on one session must not start two daemons
+        self._daemon_lock = asyncio.Lock()
+
+    async def _ensure_initialized(self) -> None:
+        if not self.computer._is_initialized:
+            await asyncio.to_thread(self.computer._ensure_initialized)
+
+    @property
+    def _container_id(self) -> str:
+        return self.computer._container.id
+
+    async def _get_daemon(self) -> Optional[AsyncComputerDaemon]:
+        if self._daemon is not None and self._daemon.alive:
+            return self._daemon
+        async with self._daemon_lock:
+            if self._daemon is not None and self._daemon.alive:
+                return self._daemon
+            if self._daemon_unavailable:
+                return None
+            try:
+                self._daemon = await AsyncComputerDaemon(self._container_id, self.computer.display).start()
+            except Exception as e:
+                logger.warning(f"Async computer daemon unavailable, falling back to xdotool exec: {e}")
+                self._daemon = None
+                self._daemon_unavailable = True
+            return self._daemon
+
+    async def run_actions(self, actions: List[Dict[str, Any]]) -> List[Any]:
+        """Run daemon actions in order; raises ComputerDaemonError if one fails."""
+        await self._ensure_initialized()
+        daemon = await self._get_daemon()
+        if daemon is not None:
+            try:
+                return await daemon.run(actions)
+            except asyncio.TimeoutError:
+                # The batch may still be running; replaying it could repeat input
+                raise
+            except (OSError, EOFError, ValueError) as e:
+                logger.warning(f"Computer daemon connection lost, restarting: {e}")
+                daemon = await self._get_daemon()
+                if daemon is not None:
+                    return await daemon.run(actions)
+        return await asyncio.to_thread(self.computer._run_actions_exec, actions)
+
+    async def _perform(self, name: str, error_label: str, plan, *args, cleanup: Optional[List[Dict]] = None) -> str:
+        from .docker_computer import InvalidActionError
+
+        try:
+            await self._ensure_initialized()
+            actions, message = plan(*args)
+            if actions:
+                await self.run_actions(actions)
+            return message
+        except InvalidActionError as e:
+            return f"Error: {e}"
+        except Exception as e:
+            if cleanup:
+                try:
+                    await self.run_actions(cleanup)
+                except Exception:
+                    pass
+            if isinstance(e, ComputerDaemonError):
+                return f"ERROR {error_label}: {e}"
+            tb = traceback.format_exc()
+            return f"Unexpected error in {name}(): {e}\n{tb}"
+
+    # Input actions
+
+    async def click(self, x: int, y: int, button: str = "left") -> str:
+        return await self._perform("click", "clicking", self.computer._plan_click, x, y, button)
+
+    async def double_click(self, x: int, y: int) -> str:
+        return await self._perform("double_click", "double-click", self.computer._plan_double_click, x, y)
+
+    async def scroll(self, x: int, y: int, scroll_x_units: int = 0, scroll_y_units: int = 0) -> str:
+        return await self._perform(
+            "scroll", "scrolling", self.computer._plan_scroll, x, y, scroll_x_units, scroll_y_units
+        )
+
+    async def type_text(self, text_to_type: str) -> str:
+        return await self._perform("type_text", "typing text", self.computer._plan_type_text, text_to_type)
+
+    async def move_mouse(self, x: int, y: int) -> str:
+        return await self._perform("move_mouse", "moving mouse", self.computer._plan_move_mouse, x, y)
+
+    async def key_press(self, keys_to_press: List[str]) -> str:
+        return await self._perform("key_press", "pressing keys", self.computer._plan_key_press, keys_to_press)
+
+    async def drag_mouse(self, path_points: List[Dict[str, int]]) -> str:
+        from .docker_computer import RELEASE_BUTTON
+
+        return await self._perform(
+            "drag_mouse", "dragging mouse", self.computer._plan_drag_mouse, path_points, cleanup=RELEASE_BUTTON
+        )
+
+    # Waiting
+
+    async def wait_until_stable(
+        self, timeout_ms: int = 5000, interval_ms: int = 100, stable_frames: int = 2, tolerance: float = 0.001
+    ) -> Dict[str, Any]:
+        action = self.computer._settle_action(timeout_ms, interval_ms, stable_frames, tolerance)
+        return (await self.run_actions([action]))[0]
+
+    async def wait_ms(self, milliseconds: int = 1000, until_stable: bool = True) -> str:
+        ms = max(0, milliseconds)
+        if until_stable and ms > 0:
+            try:
+                return self.computer._settle_message(await self.wait_until_stable(timeout_ms=ms))
+            except Exception as e:
+                logger.warning(f"Settle detection failed, sleeping instead: {e}")
+        await asyncio.sleep(ms / 1000.0)
+        return f"Waited for {ms} milliseconds."
+
+    async def run_action_batch(
+        self, actions: List[Dict[str, Any]], settle_ms: int = 2000, screenshot: bool = True, full_frame: bool = False
+    ) -> str:
+        from .docker_computer import RELEASE_BUTTON, InvalidActionError
+
+        try:
+            await self._ensure_initialized()
+            daemon_actions, steps = self.computer._plan_batch(actions, settle_ms)
+        except InvalidActionError as e:
+            return f"Error: {e}"
+        except Exception as e:
+            tb = traceback.format_exc()
+            return f"Unexpected error in run_action_batch(): {e}\n{tb}"
+        try:
+            lines = self.computer._batch_report(steps, await self.run_actions(daemon_actions))
+        except Exception as e:
+            completed = getattr(e, "completed", None) or 0
+            lines = self.computer._batch_report(steps, [None] * completed, e)
+            try:
+                await self.run_actions(RELEASE_BUTTON)
+            except Exception:
+                pass
+        if screenshot:
+            lines.append(await self.screenshot(full_frame))
+        return "\n".join(lines)
+
+    # Screen and shell
+
+    async def screenshot_frame(self, delta: Optional[bool] = None) -> Frame:
+        await self._ensure_initialized()
+        dimensions = self.computer.dimensions
+        exit_code, out, err = await docker_exec(
+            self._container_id, self.computer._frames.capture_argv(dimensions), self.computer.display
+        )
+        if exit_code != 0 or not out:
+            raise RuntimeError(err.decode("utf-8", errors="replace").strip() or f"import exited with {exit_code}")
+        # Decoding, diffing and re-encoding is CPU work; keep it off the event loop
+        return await asyncio.to_thread(self.computer._frames.encode, out, dimensions, delta)
+
+    async def screenshot(self, full_frame: bool = False) -> str:
+        try:
+            return (await self.screenshot_frame(delta=False if full_frame else None)).to_text()
+        except RuntimeError as e:
+            return f"ERROR capturing screenshot: {e}"
+        except Exception as e:
+            tb = traceback.format_exc()
+            return f"Unexpected error taking screenshot: {e}\n{tb}"
+
+    async def run_command(self, command: str) -> str:
+        try:
+            await self._ensure_initialized()
+            exit_code, out, err = await docker_exec(self._container_id, ["bash", "-lc", command])
+            out_str, err_str = out.decode("utf-8"), err.decode("utf-8")
+            if exit_code != 0:
+                return f"ERROR (code {exit_code})\n{err_str.strip()}\n{out_str.strip()}"
+            return out_str.strip()
+        except Exception as e:
+            tb = traceback.format_exc()
+            return f"Unexpected error running command: {e}\n{tb}"
+
+    async def get_dimensions(self) -> Dict[str, int]:
+        await self._ensure_initialized()
+        return self.computer.get_dimensions()
+
+    async def close(self) -> None:
+        if self._daemon is not None:
+            await self._daemon.close()
+            self._daemon = None
+        self._daemon_unavailable = False
+        await asyncio.to_thread(self.computer.close)
+
+    def close_daemon(self) -> None:
+        """Stop the daemon subprocess from sync code, leaving the container to computer.close()."""
+        daemon, self._daemon = self._daemon, None
+        self._daemon_unavailable = False
+        if daemon is not None:
+            daemon.close_threadsafe()
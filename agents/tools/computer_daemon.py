@@ -0,0 +1,176 @@
+"""Action daemon that runs inside the computer container.
+
+Started once per session by agents/tools/docker_daemon.py over an attached
+`docker exec` stream. It reads one JSON request per line on stdin:
+
+    {"id": 1, "actions": [{"op": "click", "x": 10, "y": 20, "button": 1}, ...]}
+
+runs the actions in order and answers with one JSON line on stdout:
+
+    {"id": 1, "ok": true, "results": [null, ...]}
+    {"id": 1, "ok": false, "error": "...", "completed": 2}
+
+Pointer and key events go through the XTest extension on a single X
+connection, so an action costs a few X requests instead of a process fork.
+Typing uses xdotool, which handles keymaps and non-ASCII text. Only the
+standard library and python3-xlib are needed; this file is not imported on
+the host.
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+
+class XTestBackend:
+    def __init__(self):
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+
+        self.X = X
+        self.XK = XK
+        self.xtest = xtest
+        self.display = display.Display()
+        self.screen = self.display.screen()
+
+    def geometry(self):
+        return {"width": self.screen.width_in_pixels, "height": self.screen.height_in_pixels}
+
+    def move(self, x, y):
+        self.xtest.fake_input(self.display, self.X.MotionNotify, x=int(x), y=int(y))
+        self.display.sync()
+
+    def button(self, button, press):
+        event = self.X.ButtonPress if press else self.X.ButtonRelease
+        self.xtest.fake_input(self.display, event, int(button))
+        self.display.sync()
+
+    def click(self, button, repeat=1):
+        for _ in range(repeat):
+            self.button(button, True)
+            self.button(button, False)
+
+    def sample(self, stride=37):
+        """Every stride-th pixel's green channel; cheap enough to poll every few ms."""
+        geometry = self.geometry()
+        image = self.screen.root.get_image(
+            0, 0, geometry["width"], geometry["height"], self.X.ZPixmap, 0xFFFFFFFF
+        )
+        return image.data[1::4 * stride]
+
+    def keycodes(self, name):
+        """Keycodes to hold for a keysym: its key, after Shift_L if it sits on the shifted level."""
+        keysym = self.XK.string_to_keysym(name)
+        levels = {}
+        for keycode, index in self.display.keysym_to_keycodes(keysym) if keysym else ():
+            levels.setdefault(index, keycode)
+        if 0 in levels:
+            return [levels[0]]
+        if 1 in levels:
+            return [self.display.keysym_to_keycode(self.XK.XK_Shift_L), levels[1]]
+        raise KeyError(name)
+
+    def key(self, keys):
+        try:
+            codes = list(dict.fromkeys(code for name in keys for code in self.keycodes(name)))
+        except KeyError:
+            # Keysyms that need AltGr/Mode_switch or are not in the keymap
+            xdotool(["key", "+".join(keys)])
+            return
+        for code in codes:
+            self.xtest.fake_input(self.display, self.X.KeyPress, code)
+        for code in reversed(codes):
+            self.xtest.fake_input(self.display, self.X.KeyRelease, code)
+        self.display.sync()
+
+
+def xdotool(args):
+    result = subprocess.run(["xdotool", *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"xdotool exited with {result.returncode}")
+
+
+def changed_fraction(previous, current, threshold=8):
+    if len(previous) != len(current):
+        return 1.0
+    changed = sum(1 for a, b in zip(previous, current) if abs(a - b) > threshold)
+    return changed / max(len(current), 1)
+
+
+def wait_stable(backend, timeout_ms=5000, interval_ms=100, stable_frames=2, tolerance=0.001):
+    """Return once stable_frames consecutive samples differ by at most tolerance, or at timeout."""
+    started = time.monotonic()
+    deadline = started + timeout_ms / 1000
+    previous = backend.sample()
+    streak = 0
+    while streak < stable_frames and time.monotonic() < deadline:
+        time.sleep(interval_ms / 1000)
+        current = backend.sample()
+        # A blinking caret touches a handful of samples; tolerance absorbs it
+        streak = streak + 1 if changed_fraction(previous, current) <= tolerance else 0
+        previous = current
+    return {"stable": streak >= stable_frames, "waited_ms": round((time.monotonic() - started) * 1000)}
+
+
+def run_action(backend, action):
+    op = action["op"]
+    if op == "move":
+        backend.move(action["x"], action["y"])
+    elif op == "click":
+        if "x" in action:
+            backend.move(action["x"], action["y"])
+        backend.click(action.get("button", 1), action.get("repeat", 1))
+    elif op == "down":
+        if "x" in action:
+            backend.move(action["x"], action["y"])
+        backend.button(action.get("button", 1), True)
+    elif op == "up":
+        backend.button(action.get("button", 1), False)
+    elif op == "scroll":
+        backend.move(action["x"], action["y"])
+        dy, dx = action.get("dy", 0), action.get("dx", 0)
+        if dy:
+            backend.click(4 if dy < 0 else 5, abs(dy))
+        if dx:
+            backend.click(6 if dx < 0 else 7, abs(dx))
+    elif op == "key":
+        backend.key(action["keys"])
+    elif op == "type":
+        xdotool(["type", "--", action["text"]])
+    elif op == "sleep":
+        time.sleep(max(0, action.get("ms", 0)) / 1000)
+    elif op == "wait_stable":
+        return wait_stable(
+            backend,
+            action.get("timeout_ms", 5000),
+            action.get("interval_ms", 100),
+            action.get("stable_frames", 2),
+            action.get("tolerance", 0.001),
+        )
+    elif op == "geometry":
+        return backend.geometry()
+    else:
+        raise ValueError(f"Unknown action '{op}'")
+    return None
+
+
+def main():
+    backend = XTestBackend()
+    print(json.dumps({"ready": True, **backend.geometry()}), flush=True)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        results = []
+        try:
+            for action in request["actions"]:
+                results.append(run_action(backend, action))
+            response = {"id": request.get("id"), "ok": True, "results": results}
+        except Exception as e:
+            response = {"id": request.get("id"), "ok": False, "error": str(e), "completed": len(results)}
+        print(json.dumps(response), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""Per-conversation computer sessions.
+
+Each LangGraph thread_id gets its own container, so concurrent conversations
+never type into each other's screen. The manager caps how many containers run
+on the host (by count and by reserved memory), closes sessions that sit idle
+past a TTL, and when the host is full evicts the least recently used idle
+session to make room. Sessions that are mid-action are never evicted; a new
+session waits for capacity instead.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from .async_docker_computer import AsyncDockerComputer
+from .docker_computer import DockerComputerWithSDK
+from .docker_pool import COMPUTER_POOL_SIZE, COMPUTER_SESSION_MEMORY_MB, get_computer_pool
+
+logger = logging.getLogger(__name__)
+
+COMPUTER_MAX_SESSIONS = int(os.getenv("COMPUTER_MAX_SESSIONS", "4"))
+# Memory reserved for all sessions together in MB (0 = only the session count applies)
+COMPUTER_HOST_MEMORY_MB = int(os.getenv("COMPUTER_HOST_MEMORY_MB", "0"))
+COMPUTER_SESSION_TTL = float(os.getenv("COMPUTER_SESSION_TTL", "1800"))
+
+
+class SessionLimitError(RuntimeError):
+    """No capacity for a new session and no idle session could be evicted."""
+
+
+@dataclass
+class ComputerSession:
+    thread_id: str
+    computer: DockerComputerWithSDK
+    async_computer: AsyncDockerComputer
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.monotonic)
+    actions: int = 0
+    # Tool calls currently running against this session
+    active: int = 0
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_used
+
+
+def _cpu_percent(stats: Dict[str, Any]) -> Optional[float]:
+    cpu, precpu = stats.get("cpu_stats", {}), stats.get("precpu_stats", {})
+    try:
+        cpu_delta = cpu["cpu_usage"]["total_usage"] - precpu["cpu_usage"]["total_usage"]
+        system_delta = cpu["system_cpu_usage"] - precpu["system_cpu_usage"]
+    except KeyError:
+        return None
+    if cpu_delta < 0 or system_delta <= 0:
+        return None
+    cpus = cpu.get("online_cpus") or len(cpu["cpu_usage"].get("percpu_usage") or [1])
+    return round(cpu_delta / system_delta * cpus * 100, 2)
+
+
+class ComputerSessionManager:
+    """Maps thread_id to an isolated DockerComputerWithSDK.
+
+    Args:
+        max_sessions: Containers allowed to run at once on this host
+        session_memory_mb: Memory limit applied to each session's container (0 = none)
+        host_memory_mb: Total memory that may be reserved by sessions (0 = unlimited)
+        ttl: Seconds a session may sit idle before it is closed
+        acquire_timeout: Seconds a new session waits for capacity before failing
+        use_pool: Check containers out of the warm pool instead of creating them
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = COMPUTER_MAX_SESSIONS,
+        session_memory_mb: int = COMPUTER_SESSION_MEMORY_MB,
+        host_memory_mb: int = COMPUTER_HOST_MEMORY_MB,
+        ttl: float = COMPUTER_SESSION_TTL,
+        acquire_timeout: float = 60.0,
+        use_pool: bool = COMPUTER_POOL_SIZE > 0,
+    ):
+        self.session_memory_mb = session_memory_mb
+        self.host_memory_mb = host_memory_mb
+        self.ttl = ttl
+        self.acquire_timeout = acquire_timeout
+        self.use_pool = use_pool
+        self.capacity = max_sessions
+        if host_memory_mb and session_memory_mb:
+            self.capacity = min(self.capacity, host_memory_mb // session_memory_mb)
+        if self.capacity < 1:
+            raise ValueError("Host limits leave room for no computer sessions")
+
+        # Least recently used first
+        self._sessions: "OrderedDict[str, ComputerSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._closed = False
+        self._reaper: Optional[threading.Thread] = None
+
+    # Session lifecycle
+
+    def _new_computer(self, thread_id: str) -> DockerComputerWithSDK:
+        mem_limit = f"{self.session_memory_mb}m" if self.session_memory_mb else None
+        if self.use_pool:
+            return DockerComputerWithSDK(pool=get_computer_pool(), mem_limit=mem_limit)
+        # Stable per-thread name, so a restarted server picks the same container back up
+        digest = hashlib.sha1(thread_id.encode()).hexdigest()[:12]
+        return DockerComputerWithSDK(container_name=f"computer-{digest}", vnc_port=None, mem_limit=mem_limit)
+
+    def _evict_candidate(self) -> Optional[ComputerSession]:
+        for session in self._sessions.values():
+            if session.active == 0:
+                return session
+        return None
+
+    def _checkout(self, thread_id: str) -> ComputerSession:
+        """Return the thread's session marked active, creating one if needed."""
+        deadline = time.monotonic() + self.acquire_timeout
+        evicted: List[ComputerSession] = []
+        try:
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("ComputerSessionManager is closed")
+                    session = self._sessions.get(thread_id)
+                    if session is not None:
+                        self._sessions.move_to_end(thread_id)
+                        break
+                    if len(self._sessions) < self.capacity:
+                        computer = self._new_computer(thread_id)
+                        session = ComputerSession(thread_id, computer, AsyncDockerComputer(computer))
+                        self._sessions[thread_id] = session
+                        break
+                    victim = self._evict_candidate()
+                    if victim is not None:
+                        logger.info(f"Evicting computer session {victim.thread_id} to make room for {thread_id}")
+                        del self._sessions[victim.thread_id]
+                        evicted.append(victim)
+                        continue
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise SessionLimitError(
+                            f"All {self.capacity} computer sessions are busy; try again later"
+                        )
+                    self._released.wait(remaining)
+                session.active += 1
+                session.actions += 1
+                session.last_used = time.monotonic()
+                return session
+        finally:
+            # Stopping containers is slow; never do it while holding the lock
+            for victim in evicted:
+                self._close_session(victim)
+
+    def _checkin(self, session: ComputerSession) -> None:
+        with self._lock:
+            session.active -= 1
+            session.last_used = time.monotonic()
+            self._released.notify_all()
+
+    @contextmanager
+    def lease(self, thread_id: str):
+        """Hold the thread's computer for one tool call; it cannot be evicted meanwhile."""
+        session = self._checkout(thread_id)
+        try:
+            yield session.computer
+        finally:
+            self._checkin(session)
+
+    @asynccontextmanager
+    async def alease(self, thread_id: str):
+        """Async lease; waiting for capacity and evicting happen off the event loop."""
+        session = await asyncio.to_thread(self._checkout, thread_id)
+        try:
+            yield session.async_computer
+        finally:
+            self._checkin(session)
+
+    def _close_session(self, session: ComputerSession) -> None:
+        try:
+            session.async_computer.close_daemon()
+        except Exception as e:
+            logger.warning(f"Failed to stop the async daemon of computer session {session.thread_id}: {e}")
+        try:
+            session.computer.close()
+        except Exception as e:
+            logger.warning(f"Failed to close computer session {session.thread_id}: {e}")
+
+    def close_session(self, thread_id: str) -> bool:
+        """Close a thread's session, e.g. when the conversation ends. Returns False if it had none."""
+        with self._lock:
+            session = self._sessions.get(thread_id)
+            if session is None or session.active:
+                return False
+            del self._sessions[thread_id]
+            self._released.notify_all()
+        self._close_session(session)
+        return True
+
+    def sweep(self) -> List[str]:
+        """Close sessions idle for longer than the TTL; returns their thread_ids."""
+        with self._lock:
+            expired = [s for s in self._sessions.values() if s.active == 0 and s.idle_seconds() > self.ttl]
+            for session in expired:
+                del self._sessions[session.thread_id]
+            if expired:
+                self._released.notify_all()
+        for session in expired:
+            logger.info(f"Closing computer session {session.thread_id} after {session.idle_seconds():.0f}s idle")
+            self._close_session(session)
+        return [s.thread_id for s in expired]
+
+    def start(self) -> "ComputerSessionManager":
+        """Start the background thread that enforces the idle TTL."""
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_loop, name="computer-sessions", daemon=True)
+                self._reaper.start()
+        return self
+
+    def _reap_loop(self) -> None:
+        interval = max(min(self.ttl / 4, 60.0), 1.0)
+        while not self._closed:
+            time.sleep(interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"Computer session sweep failed: {e}")
+
+    def close(self) -> None:
+        """Close every session; in-flight tool calls finish against a stopped container."""
+        with self._lock:
+            self._closed = True
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._released.notify_all()
+        for session in sessions:
+            self._close_session(session)
+
+    # Reporting
+
+    def _container_usage(self, session: ComputerSession) -> Dict[str, Any]:
+        container = session.computer._container
+        if container is None:
+            return {"container": None}
+        usage: Dict[str, Any] = {"container": container.name}
+        try:
+            stats = container.stats(stream=False)
+        except Exception as e:
+            usage["error"] = str(e)
+            return usage
+        memory = stats.get("memory_stats", {})
+        usage["memory_bytes"] = memory.get("usage")
+        usage["memory_limit_bytes"] = memory.get("limit")
+        usage["cpu_percent"] = _cpu_percent(stats)
+        return usage
+
+    def usage(self) -> List[Dict[str, Any]]:
+        """Per-session activity and container resource usage, most recently used first."""
+        with self._lock:
+            sessions = list(reversed(self._sessions.values()))
+        report = []
+        for session in sessions:
+            report.append({
+                "thread_id": session.thread_id,
+                "created_at": session.created_at,
+                "idle_seconds": round(session.idle_seconds(), 1),
+                "actions": session.actions,
+                "active": session.active,
+                **self._container_usage(session),
+            })
+        return report
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "sessions": len(self._sessions),
+                "active": sum(1 for s in self._sessions.values() if s.active),
+                "reserved_memory_mb": len(self._sessions) * self.session_memory_mb,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_session_manager() -> ComputerSessionManager:
+    """Process-wide session manager configured from COMPUTER_* environment variables."""
+    return ComputerSessionManager().start()
@@ -1,15 +1,121 @@
 import time
+import threading
+import logging
 import traceback
 import base64
-from typing import Optional, List, Dict as PyDict
+from contextlib import asynccontextmanager, contextmanager
+from typing import Literal, Optional, List, Tuple, Dict as PyDict
 
 import docker  
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 
+from .async_docker_computer import AsyncDockerComputer
+from .docker_daemon import ComputerDaemon, ComputerDaemonError
+from .docker_pool import COMPUTER_POOL_SIZE, DockerComputerPool, get_computer_pool
+from .screen_frames import THUMBNAIL_ARGV, Frame, FrameEncoder, ScreenshotOptions, wait_until_stable
+
+logger = logging.getLogger(__name__)
+
+# The daemon connection times out after 30s; keep settle waits well inside that
+MAX_SETTLE_MS = 20000
+
 # This tool provides a Docker-based computer environment for running GUI applications.
 # It uses a minimal Ubuntu 22.04-slim image with essential GUI tools installed.
 
+BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+KEY_MAP = {
+    "ENTER": "Return", "LEFT": "Left", "RIGHT": "Right", "UP": "Up", "DOWN": "Down",
+    "ESC": "Escape", "SPACE": "space", "BACKSPACE": "BackSpace", "TAB": "Tab",
+    "CTRL": "Control_L", "ALT": "Alt_L", "SHIFT": "Shift_L",
+    "F1": "F1", "F2": "F2", "F3": "F3", "F4": "F4", "F5": "F5",
+    "F6": "F6", "F7": "F7", "F8": "F8", "F9": "F9", "F10": "F10",
+    "F11": "F11", "F12": "F12"
+}
+
+
+RELEASE_BUTTON = [{"op": "up", "button": 1}]
+
+# (daemon actions, success message) for one agent-level action
+ActionPlan = Tuple[List[PyDict], str]
+
+
+class InvalidActionError(ValueError):
+    """The agent passed arguments that can't be turned into input actions."""
+
+
+class ComputerAction(BaseModel):
+    """One step of a docker_run_actions batch."""
+
+    action: Literal["click", "double_click", "scroll", "type", "key", "move", "drag", "wait"] = Field(
+        description="What to do. Fields used per action: click (x, y, button), double_click/move (x, y), "
+        "scroll (x, y, scroll_x_units, scroll_y_units), type (text), key (keys), drag (path_points), "
+        "wait (milliseconds)."
+    )
+    x: Optional[int] = Field(default=None, description="X coordinate.")
+    y: Optional[int] = Field(default=None, description="Y coordinate.")
+    button: Optional[str] = Field(default="left", description="Mouse button: 'left','middle','right'.")
+    scroll_x_units: Optional[int] = Field(default=0, description="Horizontal units: negative=left, positive=right.")
+    scroll_y_units: Optional[int] = Field(default=0, description="Vertical units: negative=up, positive=down.")
+    text: Optional[str] = Field(default=None, description="Text to type.")
+    keys: Optional[List[str]] = Field(default=None, description="Keys to press together, e.g. ['CTRL','c'].")
+    path_points: Optional[List[PyDict[str, int]]] = Field(default=None, description="Drag path as {'x','y'} dicts.")
+    milliseconds: Optional[int] = Field(
+        default=None, description="For wait: maximum milliseconds; returns early once the screen settles."
+    )
+    settle: Optional[bool] = Field(
+        default=False, description="After this action, wait until the screen stops changing (e.g. a page load)."
+    )
+
+
+# (action label, result message, first daemon action, end of its daemon actions)
+BatchStep = Tuple[str, str, int, int]
+
+
+def map_keys(keys: List[str]) -> List[str]:
+    """Map agent key names to X keysyms; anything else is passed through as a keysym."""
+    return [KEY_MAP.get(k.upper(), k) for k in keys]
+
+
+def _xdotool_commands(actions: List[PyDict]) -> List[List[str]]:
+    """
+    Translate daemon actions into as few xdotool invocations as possible.
+    xdotool chains commands in one process; only `type` has to end a chain.
+    """
+    commands, chain = [], []
+    for action in actions:
+        op = action["op"]
+        if op in ("move", "click", "down", "scroll") and "x" in action:
+            chain += ["mousemove", str(action["x"]), str(action["y"])]
+        if op == "click":
+            chain += ["click", "--repeat", str(action.get("repeat", 1)), str(action.get("button", 1))]
+        elif op == "down":
+            chain += ["mousedown", str(action.get("button", 1))]
+        elif op == "up":
+            chain += ["mouseup", str(action.get("button", 1))]
+        elif op == "scroll":
+            dy, dx = action.get("dy", 0), action.get("dx", 0)
+            if dy:
+                chain += ["click", "--repeat", str(abs(dy)), "4" if dy < 0 else "5"]
+            if dx:
+                chain += ["click", "--repeat", str(abs(dx)), "6" if dx < 0 else "7"]
+        elif op == "key":
+            chain += ["key", "+".join(action["keys"])]
+        elif op == "sleep":
+            chain += ["sleep", str(max(0, action.get("ms", 0)) / 1000)]
+        elif op == "type":
+            if chain:
+                commands.append(["xdotool", *chain])
+                chain = []
+            commands.append(["xdotool", "type", "--", action["text"]])
+        elif op != "move":
+            raise ComputerDaemonError(f"Unknown action '{op}'")
+    if chain:
+        commands.append(["xdotool", *chain])
+    return commands
+
 
 class DockerComputerWithSDK:
     environment = "linux"
@@ -25,6 +131,12 @@ class DockerComputerWithSDK:
         user: str = "1000:1000",      
         # Disable external networking by default
         network_mode: str = "none",   
+        # Check out a warm container instead of creating one
+        pool: Optional[DockerComputerPool] = None,
+        # Scaling, encoding and delta settings for screenshots
+        screenshot_options: Optional[ScreenshotOptions] = None,
+        # Docker memory limit for a container created by this instance, e.g. "1g"
+        mem_limit: Optional[str] = None,
     ):
         self.container_name = container_name
         self.image = image
@@ -32,20 +144,40 @@ class DockerComputerWithSDK:
         self.vnc_port = vnc_port
         self.user = user
         self.network_mode = network_mode
+        self.pool = pool
+        self.mem_limit = mem_limit
+        self._frames = FrameEncoder(screenshot_options)
 
-        self._client = docker.from_env()   
+        self._client = pool.client if pool else docker.from_env()   
         self._container = None
         self._dependencies_installed = False
         self._is_initialized = False
+        self._daemon: Optional[ComputerDaemon] = None
+        self._daemon_unavailable = False
+        # Parallel tool calls on one session must not create or acquire two containers
+        self._init_lock = threading.Lock()
 
     def _ensure_initialized(self):
+        if self._is_initialized:
+            return
+        with self._init_lock:
+            if not self._is_initialized:
+                self._initialize()
+
+    def _initialize(self):
         """
         1. If container does not exist → create it + install packages + start Xvfb + x11vnc
         2. If container exists but is not running → start it
         3. Once running, verify dependencies (i.e. that Xvfb is up, xdotool exists, etc.)
         4. Query display geometry via xdpyinfo or xdotool getdisplaygeometry
         """
-        if self._is_initialized:
+        if self.pool is not None:
+            # Pooled containers come from the pre-baked image and are already running
+            self._container = self.pool.acquire()
+            self.display = self.pool.display
+            self._dependencies_installed = True
+            self._update_display_geometry()
+            self._is_initialized = True
             return
         try:
             existing = self._client.containers.get(self.container_name)
@@ -58,7 +190,7 @@ class DockerComputerWithSDK:
             init_cmd = (
                 "bash -lc \""
                 "apt-get update && "
-                "DEBIAN_FRONTEND=noninteractive apt-get install -y xdotool imagemagick x11-apps xvfb x11vnc && "
+                "DEBIAN_FRONTEND=noninteractive apt-get install -y xdotool imagemagick x11-apps xvfb x11vnc python3 python3-xlib && "
                 # Start Xvfb in background
                 "Xvfb {disp} -screen 0 1280x720x24 > /dev/null 2>&1 & "
                 # Start x11vnc (no password) on display :99
@@ -75,7 +207,8 @@ class DockerComputerWithSDK:
                     detach=True,
                     user=self.user,
                     network_mode=self.network_mode,
-                    ports={f"{self.vnc_port}/tcp": self.vnc_port},
+                    ports={f"{self.vnc_port}/tcp": self.vnc_port} if self.vnc_port else None,
+                    mem_limit=self.mem_limit,
                     # ephemeral container: remove on stop
                     auto_remove=True,
                 )
@@ -84,16 +217,14 @@ class DockerComputerWithSDK:
                     f"Failed to create & run container '{self.container_name}': {e}"
                 )
 
-            # Give Xvfb + x11vnc a moment to come up
-            time.sleep(3)
+            # The container installs packages before starting Xvfb; wait until the display answers
+            self._wait_for_display(timeout=300)
             self._dependencies_installed = True
         else:
             
             if existing.status != "running":
                 try:
                     existing.start()
-                    # Give a moment for Xvfb + x11vnc to come up (assuming they were started as part of the container's command)
-                    time.sleep(3)
                 except Exception as e:
                     raise RuntimeError(f"Could not start existing container: {e}")
             self._container = existing
@@ -112,10 +243,47 @@ class DockerComputerWithSDK:
                 else:
                     self._dependencies_installed = True
 
+            # Xvfb + x11vnc are started by the container's command; wait until the display answers
+            self._wait_for_display()
+
         # Step 2: Display geometry
         self._update_display_geometry()
         self._is_initialized = True
 
+    def _wait_for_display(self, timeout: float = 30.0):
+        """
+        Poll until xdotool can talk to the X display, instead of sleeping a fixed time.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            exit_code, _ = self._container.exec_run(
+                ["xdotool", "getdisplaygeometry"], environment={"DISPLAY": self.display}, demux=True
+            )
+            if exit_code == 0:
+                return
+            time.sleep(0.1)
+        raise RuntimeError(f"Display {self.display} in container '{self.container_name}' not ready after {timeout}s")
+
+    def close(self):
+        """
+        Give the container back to the pool (reset for the next session), or stop it when not pooled.
+        """
+        if self._daemon is not None:
+            self._daemon.close()
+            self._daemon = None
+        self._daemon_unavailable = False
+        self._frames.reset()
+        if self._container is None:
+            return
+        try:
+            if self.pool is not None:
+                self.pool.release(self._container)
+            else:
+                self._container.stop()
+        finally:
+            self._container = None
+            self._is_initialized = False
+
     def _install_dependencies(self):
         """
         If xdotool (or other tools) are missing, install them in the container.
@@ -123,7 +291,7 @@ class DockerComputerWithSDK:
         install_cmd = (
             "bash -lc \""
             "apt-get update && "
-            "DEBIAN_FRONTEND=noninteractive apt-get install -y xdotool imagemagick x11-apps xvfb x11vnc"
+            "DEBIAN_FRONTEND=noninteractive apt-get install -y xdotool imagemagick x11-apps xvfb x11vnc python3 python3-xlib"
             "\""
         )
         exit_code, (out, err) = self._container.exec_run(install_cmd, demux=True)
@@ -193,62 +361,196 @@ class DockerComputerWithSDK:
             tb = traceback.format_exc()
             return f"Unexpected error running command: {e}\n{tb}"
 
-    def screenshot(self) -> str:
+    def screenshot_frame(self, delta: Optional[bool] = None) -> Frame:
         """
-        Take a screenshot of the entire Xvfb display (:99) and return a data URI.
-        If it fails, return an error string.
+        Capture the display as raw bytes and encode it per the screenshot options.
+        Raises RuntimeError if the capture fails.
         """
         self._ensure_initialized()
+        exit_code, (out, err) = self._container.exec_run(
+            self._frames.capture_argv(self.dimensions), environment={"DISPLAY": self.display}, demux=True
+        )
+        if exit_code != 0 or not out:
+            raise RuntimeError((err or b"").decode("utf-8").strip() or f"import exited with {exit_code}")
+        return self._frames.encode(out, self.dimensions, delta=delta)
+
+    def screenshot(self, full_frame: bool = False) -> str:
+        """
+        Take a screenshot of the Xvfb display and return a data URI.
+        Unless full_frame is set, an unchanged screen returns a short marker and a
+        small change returns only the changed region.
+        If it fails, return an error string.
+        """
         try:
-            # Use ImageMagick 'import' to capture root window, output PNG to stdout, pipe through base64
-            cmd = (
-                f"bash -lc \"DISPLAY={self.display} import -window root png:- | base64 -w 0\""
-            )
-            exit_code, (out, err) = self._container.exec_run(cmd, demux=True)
-            if exit_code != 0 or not out:
-                err_msg = err.decode("utf-8").strip()
-                return f"ERROR capturing screenshot: {err_msg}"
-            b64 = out.decode("utf-8").strip()
-            return f"data:image/png;base64,{b64}"
+            return self.screenshot_frame(delta=False if full_frame else None).to_text()
+        except RuntimeError as e:
+            return f"ERROR capturing screenshot: {e}"
         except Exception as e:
             tb = traceback.format_exc()
             return f"Unexpected error taking screenshot: {e}\n{tb}"
 
-    def click(self, x: int, y: int, button: str = "left") -> str:
+    def _to_screen(self, x: int, y: int):
         """
-        Simulate a single mouse click at (x,y) in the container’s Xvfb display.
+        Map coordinates from the (possibly downscaled) screenshot space to the display.
         """
-        self._ensure_initialized()
+        return self._frames.to_screen(x, y, self.dimensions)
 
-        button_map = {"left": 1, "middle": 2, "right": 3}
-        b = button_map.get(button.lower())
-        if b is None:
-            return f"Error: Invalid mouse button '{button}'. Valid options: left, middle, right."
+    # Input actions: sent to the in-container daemon in one round trip,
+    # or run as chained xdotool commands when the daemon is unavailable.
 
+    def _get_daemon(self) -> Optional[ComputerDaemon]:
+        if self._daemon is not None and self._daemon.alive:
+            return self._daemon
+        if self._daemon_unavailable:
+            return None
         try:
-            cmd = f"bash -lc \"DISPLAY={self.display} xdotool mousemove {x} {y} click {b}\""
-            exit_code, (out, err) = self._container.exec_run(cmd, demux=True)
-            if exit_code != 0:
-                return f"ERROR clicking: {err.decode('utf-8').strip()}"
-            return f"Clicked {button} at ({x}, {y})."
+            self._daemon = ComputerDaemon(self._client, self._container, self.display).start()
         except Exception as e:
-            tb = traceback.format_exc()
-            return f"Unexpected error in click(): {e}\n{tb}"
+            logger.warning(f"Computer daemon unavailable, falling back to xdotool exec: {e}")
+            self._daemon = None
+            self._daemon_unavailable = True
+        return self._daemon
+
+    def _sample_thumbnail(self) -> bytes:
+        exit_code, (out, err) = self._container.exec_run(
+            THUMBNAIL_ARGV, environment={"DISPLAY": self.display}, demux=True
+        )
+        if exit_code != 0 or not out:
+            raise ComputerDaemonError((err or b"").decode("utf-8").strip() or "could not sample the display")
+        return out
 
-    def double_click(self, x: int, y: int) -> str:
+    def _run_actions_exec(self, actions: List[PyDict]) -> List:
+        results, pending = [], []
+
+        def flush():
+            for argv in _xdotool_commands(pending):
+                exit_code, (out, err) = self._container.exec_run(
+                    argv, environment={"DISPLAY": self.display}, demux=True
+                )
+                if exit_code != 0:
+                    raise ComputerDaemonError((err or b"").decode("utf-8").strip() or f"xdotool exited with {exit_code}")
+            results.extend([None] * len(pending))
+            pending.clear()
+
+        try:
+            for action in actions:
+                if action["op"] == "wait_stable":
+                    flush()
+                    params = {k: v for k, v in action.items() if k != "op"}
+                    results.append(wait_until_stable(self._sample_thumbnail, **params))
+                else:
+                    pending.append(action)
+            flush()
+        except ComputerDaemonError as e:
+            # A failed xdotool chain may have run part way; count only what surely finished
+            if e.completed is None:
+                e.completed = len(results)
+            raise
+        return results
+
+    def _run_actions(self, actions: List[PyDict]) -> List:
         """
-        Simulate a double-click at (x,y).
+        Run input actions in order. Raises ComputerDaemonError if an action fails.
         """
         self._ensure_initialized()
+        daemon = self._get_daemon()
+        if daemon is not None:
+            try:
+                return daemon.run(actions)
+            except TimeoutError:
+                # The batch may still be running; replaying it could repeat input
+                raise
+            except (OSError, EOFError, ValueError) as e:
+                # The daemon died before answering (e.g. the container was reset); start a new one
+                logger.warning(f"Computer daemon connection lost, restarting: {e}")
+                daemon = self._get_daemon()
+                if daemon is not None:
+                    return daemon.run(actions)
+        return self._run_actions_exec(actions)
+
+    # Each input action is split into a plan (daemon actions + success message),
+    # shared with AsyncDockerComputer, and a thin method that runs it.
+
+    def _perform(self, name: str, error_label: str, plan, *args, cleanup: Optional[List[PyDict]] = None) -> str:
+        """
+        Run a plan and turn failures into the error strings the tools return.
+        `cleanup` actions run best-effort if the plan fails part way.
+        """
         try:
-            cmd = f"bash -lc \"DISPLAY={self.display} xdotool mousemove {x} {y} click --repeat 2 1\""
-            exit_code, (out, err) = self._container.exec_run(cmd, demux=True)
-            if exit_code != 0:
-                return f"ERROR double-click: {err.decode('utf-8').strip()}"
-            return f"Double-clicked at ({x}, {y})."
+            self._ensure_initialized()
+            actions, message = plan(*args)
+            if actions:
+                self._run_actions(actions)
+            return message
+        except InvalidActionError as e:
+            return f"Error: {e}"
         except Exception as e:
+            if cleanup:
+                try:
+                    self._run_actions(cleanup)
+                except Exception:
+                    pass
+            if isinstance(e, ComputerDaemonError):
+                return f"ERROR {error_label}: {e}"
             tb = traceback.format_exc()
-            return f"Unexpected error in double_click(): {e}\n{tb}"
+            return f"Unexpected error in {name}(): {e}\n{tb}"
+
+    def _plan_click(self, x: int, y: int, button: str = "left") -> ActionPlan:
+        b = BUTTONS.get(button.lower())
+        if b is None:
+            raise InvalidActionError(f"Invalid mouse button '{button}'. Valid options: left, middle, right.")
+        sx, sy = self._to_screen(x, y)
+        return [{"op": "click", "x": sx, "y": sy, "button": b}], f"Clicked {button} at ({x}, {y})."
+
+    def _plan_double_click(self, x: int, y: int) -> ActionPlan:
+        sx, sy = self._to_screen(x, y)
+        return [{"op": "click", "x": sx, "y": sy, "button": 1, "repeat": 2}], f"Double-clicked at ({x}, {y})."
+
+    def _plan_scroll(self, x: int, y: int, scroll_x_units: int = 0, scroll_y_units: int = 0) -> ActionPlan:
+        done = []
+        if scroll_y_units != 0:
+            done.append(f"scrolled {'up' if scroll_y_units < 0 else 'down'} {abs(scroll_y_units)} units")
+        if scroll_x_units != 0:
+            done.append(f"scrolled {'left' if scroll_x_units < 0 else 'right'} {abs(scroll_x_units)} units")
+        message = f"At ({x}, {y}), " + " and ".join(done) + "." if done else "No scrolling action performed."
+        sx, sy = self._to_screen(x, y)
+        # Move and both scroll directions in a single round trip
+        return [{"op": "scroll", "x": sx, "y": sy, "dx": scroll_x_units, "dy": scroll_y_units}], message
+
+    def _plan_type_text(self, text_to_type: str) -> ActionPlan:
+        # The text is passed as an argument, never through a shell, so no quoting is needed
+        return [{"op": "type", "text": text_to_type}], f"Typed: '{text_to_type}'."
+
+    def _plan_move_mouse(self, x: int, y: int) -> ActionPlan:
+        sx, sy = self._to_screen(x, y)
+        return [{"op": "move", "x": sx, "y": sy}], f"Moved mouse to ({x}, {y})."
+
+    def _plan_key_press(self, keys_to_press: List[str]) -> ActionPlan:
+        if not keys_to_press:
+            raise InvalidActionError("No keys provided.")
+        mapped = map_keys(keys_to_press)
+        return [{"op": "key", "keys": mapped}], f"Pressed: {keys_to_press} (as {'+'.join(mapped)})."
+
+    def _plan_drag_mouse(self, path_points: List[PyDict[str, int]]) -> ActionPlan:
+        if not path_points or not all(isinstance(p, dict) and "x" in p and "y" in p for p in path_points):
+            raise InvalidActionError("drag_mouse expects a list of {'x':int,'y':int} dicts.")
+        points = [self._to_screen(pt["x"], pt["y"]) for pt in path_points]
+        actions = [{"op": "down", "x": points[0][0], "y": points[0][1], "button": 1}]
+        actions += [{"op": "move", "x": px, "y": py} for px, py in points[1:]]
+        actions.append({"op": "up", "button": 1})
+        return actions, f"Dragged mouse along {len(path_points)} points."
+
+    def click(self, x: int, y: int, button: str = "left") -> str:
+        """
+        Simulate a single mouse click at (x,y) in the container’s Xvfb display.
+        """
+        return self._perform("click", "clicking", self._plan_click, x, y, button)
+
+    def double_click(self, x: int, y: int) -> str:
+        """
+        Simulate a double-click at (x,y).
+        """
+        return self._perform("double_click", "double-click", self._plan_double_click, x, y)
 
     def scroll(
         self, x: int, y: int, scroll_x_units: int = 0, scroll_y_units: int = 0
@@ -258,182 +560,241 @@ class DockerComputerWithSDK:
         scroll_y_units < 0 → scroll up, >0 → scroll down 
         scroll_x_units < 0 → scroll left, >0 → scroll right
         """
-        self._ensure_initialized()
-        actions = []
-
-        # First move the mouse to (x,y)
-        try:
-            move_cmd = f"bash -lc \"DISPLAY={self.display} xdotool mousemove {x} {y}\""
-            exit_code, (out, err) = self._container.exec_run(move_cmd, demux=True)
-            if exit_code != 0:
-                return f"ERROR moving mouse for scroll: {err.decode('utf-8').strip()}"
-        except Exception as e:
-            tb = traceback.format_exc()
-            return f"Unexpected error in scroll (mousemove): {e}\n{tb}"
-
-        # Vertical scroll
-        if scroll_y_units != 0:
-            units = abs(scroll_y_units)
-            button = 4 if scroll_y_units < 0 else 5
-            try:
-                scroll_cmd = f"bash -lc \"DISPLAY={self.display} xdotool click --repeat {units} {button}\""
-                exit_code, (out, err) = self._container.exec_run(scroll_cmd, demux=True)
-                if exit_code != 0:
-                    return f"ERROR vertical scroll: {err.decode('utf-8').strip()}"
-                direction = "up" if scroll_y_units < 0 else "down"
-                actions.append(f"scrolled {direction} {units} units")
-            except Exception as e:
-                tb = traceback.format_exc()
-                return f"Unexpected error in scroll (vertical): {e}\n{tb}"
-
-        # Horizontal scroll
-        if scroll_x_units != 0:
-            units = abs(scroll_x_units)
-            button = 6 if scroll_x_units < 0 else 7
-            try:
-                scroll_cmd2 = f"bash -lc \"DISPLAY={self.display} xdotool click --repeat {units} {button}\""
-                exit_code, (out, err) = self._container.exec_run(scroll_cmd2, demux=True)
-                if exit_code != 0:
-                    return f"ERROR horizontal scroll: {err.decode('utf-8').strip()}"
-                direction = "left" if scroll_x_units < 0 else "right"
-                actions.append(f"scrolled {direction} {units} units")
-            except Exception as e:
-                tb = traceback.format_exc()
-                return f"Unexpected error in scroll (horizontal): {e}\n{tb}"
-
-        if not actions:
-            return "No scrolling action performed."
-        return f"At ({x}, {y}), " + " and ".join(actions) + "."
+        return self._perform("scroll", "scrolling", self._plan_scroll, x, y, scroll_x_units, scroll_y_units)
 
     def type_text(self, text_to_type: str) -> str:
         """
         Type the given text into the active window (using xdotool type).
-        We bypass the shell by embedding in bash -lc, but xdotool’s 'type' is safe as long as we quote properly.
         """
-        self._ensure_initialized()
-        try:
-            # We still wrap it in bash -lc so that multi-word strings are handled. xdotool type "some text"
-            safe_text = text_to_type.replace('"', r'\"')
-            cmd = f"bash -lc \"DISPLAY={self.display} xdotool type \\\"{safe_text}\\\"\""
-            exit_code, (out, err) = self._container.exec_run(cmd, demux=True)
-            if exit_code != 0:
-                return f"ERROR typing text: {err.decode('utf-8').strip()}"
-            return f"Typed: '{text_to_type}'."
-        except Exception as e:
-            tb = traceback.format_exc()
-            return f"Unexpected error in type_text(): {e}\n{tb}"
-
-    def wait_ms(self, milliseconds: int = 1000) -> str:
-        """
-        Sleep on the host side. The container’s processes continue running. 
-        """
-        ms = max(0, milliseconds)
-        time.sleep(ms / 1000.0)
-        return f"Waited for {ms} milliseconds."
+        return self._perform("type_text", "typing text", self._plan_type_text, text_to_type)
 
     def move_mouse(self, x: int, y: int) -> str:
         """
         Move the mouse pointer to (x,y).
         """
-        self._ensure_initialized()
-        try:
-            cmd = f"bash -lc \"DISPLAY={self.display} xdotool mousemove {x} {y}\""
-            exit_code, (out, err) = self._container.exec_run(cmd, demux=True)
-            if exit_code != 0:
-                return f"ERROR moving mouse: {err.decode('utf-8').strip()}"
-            return f"Moved mouse to ({x}, {y})."
-        except Exception as e:
-            tb = traceback.format_exc()
-            return f"Unexpected error in move_mouse(): {e}\n{tb}"
+        return self._perform("move_mouse", "moving mouse", self._plan_move_mouse, x, y)
 
     def key_press(self, keys_to_press: List[str]) -> str:
         """
         Press or hold keys. For multi-key combos, join with '+'. 
         E.g. ['CTRL','c'] becomes xdotool key Control_L+c
         """
-        self._ensure_initialized()
-        mapping = {
-            "ENTER": "Return", "LEFT": "Left", "RIGHT": "Right", "UP": "Up", "DOWN": "Down",
-            "ESC": "Escape", "SPACE": "space", "BACKSPACE": "BackSpace", "TAB": "Tab",
-            "CTRL": "Control_L", "ALT": "Alt_L", "SHIFT": "Shift_L",
-            "F1": "F1", "F2": "F2", "F3": "F3", "F4": "F4", "F5": "F5",
-            "F6": "F6", "F7": "F7", "F8": "F8", "F9": "F9", "F10": "F10",
-            "F11": "F11", "F12": "F12"
-        }
-        if not keys_to_press:
-            return "Error: No keys provided."
-
-        mapped = []
-        for k in keys_to_press:
-            key_sym = mapping.get(k.upper(), None)
-            if key_sym:
-                mapped.append(key_sym)
-            else:
-                # If it’s not a special key, pass it literally (xdotool will interpret it as a keysym)
-                mapped.append(k)
-
-        combo = "+".join(mapped)
-        try:
-            cmd = f"bash -lc \"DISPLAY={self.display} xdotool key {combo}\""
-            exit_code, (out, err) = self._container.exec_run(cmd, demux=True)
-            if exit_code != 0:
-                return f"ERROR pressing keys: {err.decode('utf-8').strip()}"
-            return f"Pressed: {keys_to_press} (as {combo})."
-        except Exception as e:
-            tb = traceback.format_exc()
-            return f"Unexpected error in key_press(): {e}\n{tb}"
+        return self._perform("key_press", "pressing keys", self._plan_key_press, keys_to_press)
 
     def drag_mouse(self, path_points: List[PyDict[str, int]]) -> str:
         """
         Drag the mouse along a sequence of points. 
-        Issue separate xdotool calls for each segment to avoid huge single-line commands.
+        Press, every intermediate move and release go out as one batch.
         """
-        self._ensure_initialized()
-        if not path_points or not all(isinstance(p, dict) and "x" in p and "y" in p for p in path_points):
-            return "Error: drag_mouse expects a list of {'x':int,'y':int} dicts."
+        # Don't leave the button held down after a failed drag
+        return self._perform(
+            "drag_mouse", "dragging mouse", self._plan_drag_mouse, path_points, cleanup=RELEASE_BUTTON
+        )
 
-        try:
-            # 1. Move to first point & hold down
-            start = path_points[0]
-            cmd1 = f"bash -lc \"DISPLAY={self.display} xdotool mousemove {start['x']} {start['y']} mousedown 1\""
-            exit_code, (out1, err1) = self._container.exec_run(cmd1, demux=True)
-            if exit_code != 0:
-                return f"ERROR starting drag: {err1.decode('utf-8').strip()}"
+    @staticmethod
+    def _settle_action(timeout_ms: int, interval_ms: int, stable_frames: int, tolerance: float) -> PyDict:
+        return {
+            "op": "wait_stable",
+            "timeout_ms": min(max(0, timeout_ms), MAX_SETTLE_MS),
+            "interval_ms": interval_ms,
+            "stable_frames": stable_frames,
+            "tolerance": tolerance,
+        }
 
-            # 2. Move through intermediate points
-            for pt in path_points[1:]:
-                cmdn = f"bash -lc \"DISPLAY={self.display} xdotool mousemove {pt['x']} {pt['y']}\""
-                exit_code, (out_i, err_i) = self._container.exec_run(cmdn, demux=True)
-                if exit_code != 0:
-                    return f"ERROR dragging at ({pt['x']},{pt['y']}): {err_i.decode('utf-8').strip()}"
+    @staticmethod
+    def _settle_message(result: PyDict) -> str:
+        if result["stable"]:
+            return f"Screen settled after {result['waited_ms']} milliseconds."
+        return f"Waited for {result['waited_ms']} milliseconds; the screen is still changing."
 
-            # 3. Release mouse
-            cmd_end = f"bash -lc \"DISPLAY={self.display} xdotool mouseup 1\""
-            exit_code, (out_end, err_end) = self._container.exec_run(cmd_end, demux=True)
-            if exit_code != 0:
-                return f"ERROR releasing drag: {err_end.decode('utf-8').strip()}"
+    def wait_until_stable(
+        self,
+        timeout_ms: int = 5000,
+        interval_ms: int = 100,
+        stable_frames: int = 2,
+        tolerance: float = 0.001,
+    ) -> PyDict:
+        """
+        Return as soon as the display stops changing, or after timeout_ms.
+        Compares cheap framebuffer samples every interval_ms; the screen counts as settled
+        once stable_frames consecutive samples differ in at most `tolerance` of their pixels.
+        Returns {"stable": bool, "waited_ms": int}.
+        """
+        return self._run_actions([self._settle_action(timeout_ms, interval_ms, stable_frames, tolerance)])[0]
+
+    def wait_ms(self, milliseconds: int = 1000, until_stable: bool = True) -> str:
+        """
+        Wait up to `milliseconds`. Unless until_stable is False, returns as soon as the
+        screen has settled instead of sleeping the whole time.
+        """
+        ms = max(0, milliseconds)
+        if until_stable and ms > 0:
+            try:
+                return self._settle_message(self.wait_until_stable(timeout_ms=ms))
+            except Exception as e:
+                logger.warning(f"Settle detection failed, sleeping instead: {e}")
+        time.sleep(ms / 1000.0)
+        return f"Waited for {ms} milliseconds."
+
+    # Batches: several agent actions, with optional settle waits, in one round trip
+
+    def _plan_action(self, action: ComputerAction) -> ActionPlan:
+        kind = action.action
+        if kind in ("click", "double_click", "scroll", "move") and (action.x is None or action.y is None):
+            raise InvalidActionError(f"{kind} needs x and y.")
+        if kind == "click":
+            return self._plan_click(action.x, action.y, action.button or "left")
+        if kind == "double_click":
+            return self._plan_double_click(action.x, action.y)
+        if kind == "scroll":
+            return self._plan_scroll(action.x, action.y, action.scroll_x_units or 0, action.scroll_y_units or 0)
+        if kind == "move":
+            return self._plan_move_mouse(action.x, action.y)
+        if kind == "type":
+            if action.text is None:
+                raise InvalidActionError("type needs text.")
+            return self._plan_type_text(action.text)
+        if kind == "key":
+            return self._plan_key_press(action.keys or [])
+        if kind == "drag":
+            return self._plan_drag_mouse(action.path_points or [])
+        ms = 1000 if action.milliseconds is None else max(0, action.milliseconds)
+        return [self._settle_action(ms, 100, 2, 0.001)], f"Waited up to {ms} milliseconds."
+
+    def _plan_batch(self, actions: List[PyDict], settle_ms: int = 2000) -> Tuple[List[PyDict], List[BatchStep]]:
+        """
+        Validate and translate a batch into daemon actions plus one BatchStep per agent action.
+        The total wait time is capped so the whole batch fits in one daemon round trip.
+        """
+        try:
+            parsed = [a if isinstance(a, ComputerAction) else ComputerAction.model_validate(a) for a in actions]
+        except ValidationError as e:
+            raise InvalidActionError(str(e))
+        if not parsed:
+            raise InvalidActionError("No actions provided.")
+        daemon_actions: List[PyDict] = []
+        steps: List[BatchStep] = []
+        for index, action in enumerate(parsed, 1):
+            try:
+                planned, message = self._plan_action(action)
+            except InvalidActionError as e:
+                raise InvalidActionError(f"action {index} ({action.action}): {e}")
+            if action.settle and action.action != "wait":
+                planned = planned + [self._settle_action(settle_ms, 100, 2, 0.001)]
+            start = len(daemon_actions)
+            daemon_actions += planned
+            steps.append((action.action, message, start, len(daemon_actions)))
+        waited = sum(a["timeout_ms"] for a in daemon_actions if a["op"] == "wait_stable")
+        if waited > MAX_SETTLE_MS:
+            raise InvalidActionError(
+                f"the batch waits up to {waited} ms in total; keep it under {MAX_SETTLE_MS} ms "
+                "or split it into several calls."
+            )
+        return daemon_actions, steps
 
-            return f"Dragged mouse along {len(path_points)} points."
+    @classmethod
+    def _batch_report(cls, steps: List[BatchStep], results: List, error: Optional[Exception] = None) -> List[str]:
+        """
+        One line per agent action that ran, then the failing action and what was skipped.
+        """
+        lines = []
+        for index, (kind, message, start, end) in enumerate(steps, 1):
+            if end > len(results):
+                lines.append(f"{index}. ERROR in {kind}: {error}")
+                skipped = len(steps) - index
+                if skipped:
+                    lines.append(f"Stopped; the remaining {skipped} action(s) were not run.")
+                break
+            settled = [r for r in results[start:end] if isinstance(r, dict) and "stable" in r]
+            lines.append(" ".join([f"{index}. {message}"] + [cls._settle_message(r) for r in settled]))
+        return lines
+
+    def run_action_batch(
+        self, actions: List[PyDict], settle_ms: int = 2000, screenshot: bool = True, full_frame: bool = False
+    ) -> str:
+        """
+        Run a list of actions in one container round trip and, unless screenshot is False,
+        finish with a single screenshot. Stops at the first failing action.
+        """
+        try:
+            self._ensure_initialized()
+            daemon_actions, steps = self._plan_batch(actions, settle_ms)
+        except InvalidActionError as e:
+            return f"Error: {e}"
         except Exception as e:
             tb = traceback.format_exc()
-            return f"Unexpected error in drag_mouse(): {e}\n{tb}"
+            return f"Unexpected error in run_action_batch(): {e}\n{tb}"
+        try:
+            lines = self._batch_report(steps, self._run_actions(daemon_actions))
+        except Exception as e:
+            completed = getattr(e, "completed", None) or 0
+            lines = self._batch_report(steps, [None] * completed, e)
+            # Don't leave a button held down by a failed drag
+            try:
+                self._run_actions(RELEASE_BUTTON)
+            except Exception:
+                pass
+        if screenshot:
+            lines.append(self.screenshot(full_frame))
+        return "\n".join(lines)
 
     def get_dimensions(self) -> PyDict[str, int]:
         """
-        Return the last‐known display geometry as a Python dict.
+        Return the display geometry as the model sees it (after screenshot downscaling).
         """
         self._ensure_initialized()
-        return {"width": self.dimensions[0], "height": self.dimensions[1]}
+        width, height, _ = self._frames.model_size(*self.dimensions)
+        return {"width": width, "height": height}
 
 
 # Instantiate a single global instance (to be shared by all tools)
 try:
-    docker_computer_instance = DockerComputerWithSDK(container_name="computer")
+    docker_computer_instance = DockerComputerWithSDK(
+        container_name="computer",
+        pool=get_computer_pool() if COMPUTER_POOL_SIZE > 0 else None,
+    )
 except Exception as e:
     # If we can’t even create the Python-SDK client or something goes wrong early
     print(f"Failed to initialize DockerComputerWithSDK: {e}")
     docker_computer_instance = None
 
+# Coroutine API over the same container, used by the tools' ainvoke path
+async_docker_computer_instance = AsyncDockerComputer(docker_computer_instance) if docker_computer_instance else None
+
+
+def _thread_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+    return str(thread_id) if thread_id is not None else None
+
+
+@contextmanager
+def computer_for(config: Optional[RunnableConfig] = None):
+    """
+    The calling LangGraph thread's own computer (see computer_sessions.py),
+    or the shared instance when the tool runs outside a thread.
+    """
+    thread_id = _thread_id(config)
+    if thread_id is None:
+        yield docker_computer_instance
+        return
+    from .computer_sessions import get_session_manager
+
+    with get_session_manager().lease(thread_id) as computer:
+        yield computer
+
+
+@asynccontextmanager
+async def acomputer_for(config: Optional[RunnableConfig] = None):
+    """Async counterpart of computer_for, yielding an AsyncDockerComputer."""
+    thread_id = _thread_id(config)
+    if thread_id is None:
+        yield async_docker_computer_instance
+        return
+    from .computer_sessions import get_session_manager
+
+    async with get_session_manager().alease(thread_id) as computer:
+        yield computer
+
 
 # Pydantic Schemas for Tool Arguments
 
@@ -455,11 +816,21 @@ class DockerScrollMouseArgs(BaseModel):
     scroll_x_units: Optional[int] = Field(default=0, description="Horizontal units: negative=left, positive=right.")
     scroll_y_units: Optional[int] = Field(default=0, description="Vertical units: negative=up, positive=down.")
 
+class DockerScreenshotArgs(BaseModel):
+    full_frame: Optional[bool] = Field(
+        default=False,
+        description="Return the whole screen even if only part of it changed since the last screenshot.",
+    )
+
 class DockerTypeTextArgs(BaseModel):
     text_to_type: str = Field(description="Text to type into the container’s active window.")
 
 class DockerWaitMsArgs(BaseModel):
-    milliseconds: Optional[int] = Field(default=1000, description="Milliseconds to wait on the host side.")
+    milliseconds: Optional[int] = Field(default=1000, description="Maximum milliseconds to wait.")
+    until_stable: Optional[bool] = Field(
+        default=True,
+        description="Return early once the screen stops changing (e.g. a page finished loading).",
+    )
 
 class DockerMoveMouseArgs(BaseModel):
     x: int = Field(description="X coordinate to move mouse to.")
@@ -476,129 +847,255 @@ class DockerDragMouseArgs(BaseModel):
         )
     )
 
+class DockerRunActionsArgs(BaseModel):
+    actions: List[ComputerAction] = Field(
+        description=(
+            "Actions to run in order, e.g. [{'action':'click','x':200,'y':120,'settle':true}, "
+            "{'action':'type','text':'hello'}, {'action':'key','keys':['ENTER'],'settle':true}]."
+        )
+    )
+    settle_ms: Optional[int] = Field(
+        default=2000, description="Maximum milliseconds each 'settle' waits for the screen to stop changing."
+    )
+    full_frame: Optional[bool] = Field(
+        default=False, description="Return the whole screen in the final screenshot even if only part changed."
+    )
+
 
 
 # Tool Definitions for agents
 
 if docker_computer_instance:
     @tool("docker_run_command", args_schema=DockerRunCommandArgs)
-    def docker_run_command_tool(command: str) -> str:
+    def docker_run_command_tool(command: str, config: RunnableConfig = None) -> str:
         """Execute a shell command inside the Docker container."""
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
         try:
-            return docker_computer_instance.run_command(command)
+            with computer_for(config) as computer:
+                return computer.run_command(command)
         except Exception as e:
             return f"Error executing command: {str(e)}\n{traceback.format_exc()}"
 
-    @tool("docker_take_screenshot")
-    def docker_take_screenshot_tool() -> str:
-        """Capture a screenshot of the container’s display, return as data URI (base64‐encoded PNG)."""
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
+    @tool("docker_take_screenshot", args_schema=DockerScreenshotArgs)
+    def docker_take_screenshot_tool(full_frame: bool = False, config: RunnableConfig = None) -> str:
+        """
+        Capture a screenshot of the container’s display as a data URI.
+        If nothing changed since the last screenshot a short notice is returned instead,
+        and if only part of the screen changed just that region is returned with its position.
+        """
         try:
-            return docker_computer_instance.screenshot()
+            with computer_for(config) as computer:
+                return computer.screenshot(full_frame)
         except Exception as e:
             return f"Error taking screenshot: {str(e)}\n{traceback.format_exc()}"
 
     @tool("docker_click_mouse", args_schema=DockerClickMouseArgs)
-    def docker_click_mouse_tool(
-        x: int, y: int, button: Optional[str] = "left"
-    ) -> str:
+    def docker_click_mouse_tool(x: int, y: int, button: Optional[str] = "left", config: RunnableConfig = None) -> str:
         """Simulate mouse click at (x,y)."""
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
         try:
-            return docker_computer_instance.click(x, y, button)
+            with computer_for(config) as computer:
+                return computer.click(x, y, button)
         except Exception as e:
             return f"Error clicking mouse: {str(e)}\n{traceback.format_exc()}"
 
     @tool("docker_double_click_mouse", args_schema=DockerDoubleClickMouseArgs)
-    def docker_double_click_mouse_tool(x: int, y: int) -> str:
+    def docker_double_click_mouse_tool(x: int, y: int, config: RunnableConfig = None) -> str:
         """Simulate a double‐click at (x,y)."""
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
         try:
-            return docker_computer_instance.double_click(x, y)
+            with computer_for(config) as computer:
+                return computer.double_click(x, y)
         except Exception as e:
             return f"Error double‐clicking mouse: {str(e)}\n{traceback.format_exc()}"
 
     @tool("docker_scroll_mouse", args_schema=DockerScrollMouseArgs)
-    def docker_scroll_mouse_tool(
-        x: int, y: int, scroll_x_units: int = 0, scroll_y_units: int = 0
-    ) -> str:
+    def docker_scroll_mouse_tool(x: int, y: int, scroll_x_units: int = 0, scroll_y_units: int = 0, config: RunnableConfig = None) -> str:
         """
         Scroll the mouse wheel at (x,y). 
         Negative scroll_y_units → scroll up. Positive → scroll down.
         Negative scroll_x_units → scroll left. Positive → scroll right.
         """
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
         try:
-            return docker_computer_instance.scroll(x, y, scroll_x_units, scroll_y_units)
+            with computer_for(config) as computer:
+                return computer.scroll(x, y, scroll_x_units, scroll_y_units)
         except Exception as e:
             return f"Error scrolling mouse: {str(e)}\n{traceback.format_exc()}"
 
     @tool("docker_type_text", args_schema=DockerTypeTextArgs)
-    def docker_type_text_tool(text_to_type: str) -> str:
+    def docker_type_text_tool(text_to_type: str, config: RunnableConfig = None) -> str:
         """Type the given text into the container’s active window."""
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
         try:
-            return docker_computer_instance.type_text(text_to_type)
+            with computer_for(config) as computer:
+                return computer.type_text(text_to_type)
         except Exception as e:
             return f"Error typing text: {str(e)}\n{traceback.format_exc()}"
 
     @tool("docker_wait_ms", args_schema=DockerWaitMsArgs)
-    def docker_wait_ms_tool(milliseconds: int = 1000) -> str:
-        """Pause the host process for the given number of milliseconds."""
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
+    def docker_wait_ms_tool(milliseconds: int = 1000, until_stable: bool = True, config: RunnableConfig = None) -> str:
+        """Wait up to the given number of milliseconds, returning early once the screen has settled."""
         try:
-            return docker_computer_instance.wait_ms(milliseconds)
+            with computer_for(config) as computer:
+                return computer.wait_ms(milliseconds, until_stable)
         except Exception as e:
             return f"Error waiting: {str(e)}\n{traceback.format_exc()}"
 
     @tool("docker_move_mouse", args_schema=DockerMoveMouseArgs)
-    def docker_move_mouse_tool(x: int, y: int) -> str:
+    def docker_move_mouse_tool(x: int, y: int, config: RunnableConfig = None) -> str:
         """Move the mouse cursor to (x,y)."""
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
         try:
-            return docker_computer_instance.move_mouse(x, y)
+            with computer_for(config) as computer:
+                return computer.move_mouse(x, y)
         except Exception as e:
             return f"Error moving mouse: {str(e)}\n{traceback.format_exc()}"
 
     @tool("docker_press_keys", args_schema=DockerKeyPressArgs)
-    def docker_press_keys_tool(keys_to_press: List[str]) -> str:
+    def docker_press_keys_tool(keys_to_press: List[str], config: RunnableConfig = None) -> str:
         """
         Simulate pressing one or more keys. 
         E.g. ['CTRL','c'] → Control_L+c
         """
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
         try:
-            return docker_computer_instance.key_press(keys_to_press)
+            with computer_for(config) as computer:
+                return computer.key_press(keys_to_press)
         except Exception as e:
             return f"Error pressing keys: {str(e)}\n{traceback.format_exc()}"
 
     @tool("docker_drag_mouse", args_schema=DockerDragMouseArgs)
-    def docker_drag_mouse_tool(path_points: List[PyDict[str, int]]) -> str:
+    def docker_drag_mouse_tool(path_points: List[PyDict[str, int]], config: RunnableConfig = None) -> str:
         """Simulate a mouse drag along the specified path."""
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
         try:
-            return docker_computer_instance.drag_mouse(path_points)
+            with computer_for(config) as computer:
+                return computer.drag_mouse(path_points)
         except Exception as e:
             return f"Error dragging mouse: {str(e)}\n{traceback.format_exc()}"
 
+    @tool("docker_run_actions", args_schema=DockerRunActionsArgs)
+    def docker_run_actions_tool(
+        actions: List[ComputerAction], settle_ms: int = 2000, full_frame: bool = False, config: RunnableConfig = None
+    ) -> str:
+        """
+        Run several actions (click, double_click, scroll, type, key, move, drag, wait) in one call
+        and return what each did followed by a single screenshot of the final screen.
+        Prefer this over separate tool calls when the next steps don't depend on seeing the screen.
+        Set 'settle' on an action to wait for the screen to stop changing before the next one.
+        """
+        try:
+            with computer_for(config) as computer:
+                return computer.run_action_batch(actions, settle_ms, full_frame=full_frame)
+        except Exception as e:
+            return f"Error running actions: {str(e)}\n{traceback.format_exc()}"
+
     @tool("docker_get_display_dimensions")
-    def docker_get_display_dimensions_tool() -> PyDict[str, int] | str:
+    def docker_get_display_dimensions_tool(config: RunnableConfig = None) -> PyDict[str, int] | str:
         """Return the container’s current display dimensions as a dict."""
-        if not docker_computer_instance:
-            return "Error: DockerComputerWithSDK not initialized."
         try:
-            return docker_computer_instance.get_dimensions()
+            with computer_for(config) as computer:
+                return computer.get_dimensions()
+        except Exception as e:
+            return f"Error getting dimensions: {str(e)}\n{traceback.format_exc()}"
+
+    # Async implementations: ainvoke awaits these instead of running the sync
+    # functions above in a thread pool.
+
+    def _async_impl(sync_tool):
+        def attach(coroutine):
+            sync_tool.coroutine = coroutine
+            return coroutine
+        return attach
+
+    @_async_impl(docker_run_command_tool)
+    async def adocker_run_command(command: str, config: RunnableConfig = None) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.run_command(command)
+        except Exception as e:
+            return f"Error executing command: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_take_screenshot_tool)
+    async def adocker_take_screenshot(full_frame: bool = False, config: RunnableConfig = None) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.screenshot(full_frame)
+        except Exception as e:
+            return f"Error taking screenshot: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_click_mouse_tool)
+    async def adocker_click_mouse(x: int, y: int, button: Optional[str] = "left", config: RunnableConfig = None) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.click(x, y, button)
+        except Exception as e:
+            return f"Error clicking mouse: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_double_click_mouse_tool)
+    async def adocker_double_click_mouse(x: int, y: int, config: RunnableConfig = None) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.double_click(x, y)
+        except Exception as e:
+            return f"Error double‐clicking mouse: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_scroll_mouse_tool)
+    async def adocker_scroll_mouse(x: int, y: int, scroll_x_units: int = 0, scroll_y_units: int = 0, config: RunnableConfig = None) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.scroll(x, y, scroll_x_units, scroll_y_units)
+        except Exception as e:
+            return f"Error scrolling mouse: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_type_text_tool)
+    async def adocker_type_text(text_to_type: str, config: RunnableConfig = None) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.type_text(text_to_type)
+        except Exception as e:
+            return f"Error typing text: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_wait_ms_tool)
+    async def adocker_wait_ms(milliseconds: int = 1000, until_stable: bool = True, config: RunnableConfig = None) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.wait_ms(milliseconds, until_stable)
+        except Exception as e:
+            return f"Error waiting: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_move_mouse_tool)
+    async def adocker_move_mouse(x: int, y: int, config: RunnableConfig = None) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.move_mouse(x, y)
+        except Exception as e:
+            return f"Error moving mouse: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_press_keys_tool)
+    async def adocker_press_keys(keys_to_press: List[str], config: RunnableConfig = None) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.key_press(keys_to_press)
+        except Exception as e:
+            return f"Error pressing keys: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_drag_mouse_tool)
+    async def adocker_drag_mouse(path_points: List[PyDict[str, int]], config: RunnableConfig = None) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.drag_mouse(path_points)
+        except Exception as e:
+            return f"Error dragging mouse: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_run_actions_tool)
+    async def adocker_run_actions(
+        actions: List[ComputerAction], settle_ms: int = 2000, full_frame: bool = False, config: RunnableConfig = None
+    ) -> str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.run_action_batch(actions, settle_ms, full_frame=full_frame)
+        except Exception as e:
+            return f"Error running actions: {str(e)}\n{traceback.format_exc()}"
+
+    @_async_impl(docker_get_display_dimensions_tool)
+    async def adocker_get_display_dimensions(config: RunnableConfig = None) -> PyDict[str, int] | str:
+        try:
+            async with acomputer_for(config) as computer:
+                return await computer.get_dimensions()
         except Exception as e:
             return f"Error getting dimensions: {str(e)}\n{traceback.format_exc()}"
 
@@ -613,6 +1110,7 @@ if docker_computer_instance:
         docker_move_mouse_tool,
         docker_press_keys_tool,
         docker_drag_mouse_tool,
+        docker_run_actions_tool,
         docker_get_display_dimensions_tool,
     ]
 else:
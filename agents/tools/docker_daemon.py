@@ -0,0 +1,153 @@
+"""Host side of the in-container action daemon (see computer_daemon.py).
+
+The daemon is started with one `docker exec` whose stdin/stdout stay attached,
+so each batch of actions is a JSON line over an open socket instead of a
+Docker API call plus a `bash -lc` fork per action.
+"""
+
+import io
+import json
+import logging
+import struct
+import tarfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DAEMON_SOURCE = Path(__file__).with_name("computer_daemon.py")
+DAEMON_DIR = "/tmp"
+DAEMON_PATH = f"{DAEMON_DIR}/computer_daemon.py"
+
+
+class ComputerDaemonError(RuntimeError):
+    """An action failed inside the container; the daemon itself is still usable.
+
+    `completed` is the number of actions in the batch that ran before the failure,
+    when known.
+    """
+
+    def __init__(self, message: str, completed: Optional[int] = None):
+        super().__init__(message)
+        self.completed = completed
+
+
+class ComputerDaemon:
+    """Long-lived action daemon running in a computer container.
+
+    Args:
+        client: Docker client the container belongs to
+        container: Running computer container with python3 and python3-xlib
+        display: X display the daemon connects to
+        timeout: Seconds to wait for a response before treating the daemon as dead
+    """
+
+    def __init__(self, client, container, display: str = ":99", timeout: float = 30.0):
+        self.client = client
+        self.container = container
+        self.display = display
+        self.timeout = timeout
+        self.geometry: Optional[Dict[str, int]] = None
+
+        self._socket = None
+        self._buffer = b""
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._socket is not None
+
+    def _upload(self) -> None:
+        data = DAEMON_SOURCE.read_bytes()
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w") as tar:
+            info = tarfile.TarInfo(name=Path(DAEMON_PATH).name)
+            info.size = len(data)
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+        self.container.put_archive(DAEMON_DIR, archive.getvalue())
+
+    def start(self) -> "ComputerDaemon":
+        """Copy the daemon into the container, start it and wait for its ready line."""
+        self._upload()
+        exec_id = self.client.api.exec_create(
+            self.container.id,
+            ["python3", "-u", DAEMON_PATH],
+            stdin=True,
+            stdout=True,
+            stderr=True,
+            tty=False,
+            environment={"DISPLAY": self.display},
+        )["Id"]
+        sock = self.client.api.exec_start(exec_id, socket=True)
+        # docker-py wraps the raw socket on some transports
+        self._socket = getattr(sock, "_sock", sock)
+        self._socket.settimeout(self.timeout)
+        try:
+            ready = self._read_message()
+        except Exception:
+            self.close()
+            raise
+        if not ready.get("ready"):
+            self.close()
+            raise RuntimeError(f"Computer daemon failed to start: {ready}")
+        self.geometry = {"width": ready["width"], "height": ready["height"]}
+        return self
+
+    # Docker multiplexes stdout/stderr on a non-tty exec: 8-byte header (stream, 0, 0, 0, size)
+
+    def _read_exact(self, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = self._socket.recv(size - len(data))
+            if not chunk:
+                raise EOFError("Computer daemon closed its output stream")
+            data += chunk
+        return data
+
+    def _read_message(self) -> Dict[str, Any]:
+        while b"\n" not in self._buffer:
+            stream, size = struct.unpack(">BxxxL", self._read_exact(8))
+            payload = self._read_exact(size)
+            if stream == 2:
+                logger.debug(f"computer daemon: {payload.decode(errors='replace').rstrip()}")
+            else:
+                self._buffer += payload
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def run(self, actions: List[Dict[str, Any]]) -> List[Any]:
+        """Run actions in order in one round trip and return each action's result.
+
+        Raises ComputerDaemonError if an action fails, and OSError/EOFError if the
+        daemon is gone (the connection is closed so the caller can restart it).
+        """
+        if self._socket is None:
+            raise EOFError("Computer daemon is not running")
+        with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            try:
+                self._socket.sendall((json.dumps({"id": request_id, "actions": actions}) + "\n").encode())
+                response = self._read_message()
+            except (OSError, EOFError, ValueError):
+                self.close()
+                raise
+        if response.get("id") != request_id:
+            self.close()
+            raise EOFError("Computer daemon response out of sync")
+        if not response.get("ok"):
+            raise ComputerDaemonError(response.get("error", "unknown error"), response.get("completed"))
+        return response["results"]
+
+    def close(self) -> None:
+        if self._socket is None:
+            return
+        try:
+            self._socket.close()
+        except OSError:
+            pass
+        self._socket = None
+        self._buffer = b""
@@ -0,0 +1,231 @@
+"""Warm pool of computer containers for DockerComputerWithSDK.
+
+Containers are started from a pre-baked image (see computer.Dockerfile), so a
+new one only has to wait for Xvfb. The pool keeps `size` of them idle, hands one
+out per session, resets it on release and replaces containers that fail the
+reset or have served `max_uses` sessions. Replenishing happens on a background
+thread, so checkout is a queue pop in the common case.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Dict, Optional, Union
+
+import docker
+
+logger = logging.getLogger(__name__)
+
+COMPUTER_IMAGE = os.getenv("COMPUTER_IMAGE", "accessible-solutions/computer:latest")
+COMPUTER_POOL_SIZE = int(os.getenv("COMPUTER_POOL_SIZE", "0"))
+# Per-container memory cap in MB (0 = no limit)
+COMPUTER_SESSION_MEMORY_MB = int(os.getenv("COMPUTER_SESSION_MEMORY_MB", "1024"))
+
+# Kill everything a session started (keeping PID 1, Xvfb, x11vnc and this
+# pipeline), clear scratch files and park the pointer.
+RESET_SCRIPT = (
+    "ps -eo pid=,comm= "
+    "| awk -v self=$$ '$1 != 1 && $1 != self && $2 !~ /^(Xvfb|x11vnc|tail|ps|awk|xargs|kill)$/ {print $1}' "
+    "| xargs -r kill -9; "
+    "rm -rf /tmp/* ~/Desktop/* ~/Downloads/* 2>/dev/null; "
+    "xdotool mousemove 0 0; true"
+)
+
+
+class DockerComputerPool:
+    """Keeps initialized computer containers ready for checkout.
+
+    Args:
+        size: Number of idle containers to keep warm
+        image: Pre-baked image with Xvfb, x11vnc and xdotool installed
+        display: X display the image's Xvfb listens on
+        user: User the containers run as
+        network_mode: Docker network mode; external networking is off by default
+        max_uses: Sessions served before a container is replaced instead of reset
+        ready_timeout: Seconds to wait for a new container's display to come up
+        mem_limit: Docker memory limit per container, e.g. "1g" or bytes
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        image: str = COMPUTER_IMAGE,
+        display: str = ":99",
+        user: str = "1000:1000",
+        network_mode: str = "none",
+        max_uses: int = 20,
+        ready_timeout: float = 30.0,
+        name_prefix: str = "computer-warm",
+        client: Optional[docker.DockerClient] = None,
+        mem_limit: Optional[Union[str, int]] = None,
+    ):
+        self.size = size
+        self.image = image
+        self.display = display
+        self.user = user
+        self.network_mode = network_mode
+        self.max_uses = max_uses
+        self.ready_timeout = ready_timeout
+        self.name_prefix = name_prefix
+        self.mem_limit = mem_limit
+        self.client = client or docker.from_env()
+
+        self._idle: "queue.Queue" = queue.Queue()
+        self._in_use: Dict[str, object] = {}
+        self._uses: Dict[str, int] = {}
+        self._starting = 0
+        self._lock = threading.Lock()
+        self._refill = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    # Container lifecycle
+
+    def _exec(self, container, script: str):
+        return container.exec_run(["bash", "-c", script], environment={"DISPLAY": self.display}, demux=True)
+
+    def _create(self):
+        container = self.client.containers.run(
+            self.image,
+            name=f"{self.name_prefix}-{uuid.uuid4().hex[:8]}",
+            detach=True,
+            user=self.user,
+            network_mode=self.network_mode,
+            environment={"DISPLAY": self.display},
+            mem_limit=self.mem_limit,
+            auto_remove=True,
+        )
+        try:
+            self._wait_ready(container)
+        except Exception:
+            self._discard(container)
+            raise
+        return container
+
+    def _wait_ready(self, container) -> None:
+        """Poll until the X display answers, instead of sleeping a fixed time."""
+        deadline = time.monotonic() + self.ready_timeout
+        while time.monotonic() < deadline:
+            exit_code, _ = self._exec(container, "xdotool getdisplaygeometry")
+            if exit_code == 0:
+                return
+            time.sleep(0.1)
+        raise RuntimeError(f"Container {container.name} display not ready after {self.ready_timeout}s")
+
+    def _reset(self, container) -> bool:
+        try:
+            exit_code, _ = self._exec(container, RESET_SCRIPT)
+            return exit_code == 0
+        except docker.errors.APIError:
+            return False
+
+    def _discard(self, container) -> None:
+        with self._lock:
+            self._uses.pop(container.id, None)
+        try:
+            container.remove(force=True)
+        except docker.errors.APIError:
+            pass
+
+    def _is_running(self, container) -> bool:
+        try:
+            container.reload()
+            return container.status == "running"
+        except docker.errors.APIError:
+            return False
+
+    # Background replenishing
+
+    def start(self) -> "DockerComputerPool":
+        """Start the replenishing thread and begin warming containers."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._replenish_loop, name="docker-computer-pool", daemon=True)
+                self._thread.start()
+        self._refill.set()
+        return self
+
+    def _replenish_loop(self) -> None:
+        while not self._closed:
+            self._refill.wait()
+            self._refill.clear()
+            while not self._closed:
+                with self._lock:
+                    if self._idle.qsize() + self._starting >= self.size:
+                        break
+                    self._starting += 1
+                try:
+                    container = self._create()
+                    self._idle.put(container)
+                except Exception as e:
+                    logger.warning(f"Could not warm a computer container: {e}")
+                    time.sleep(5)
+                finally:
+                    with self._lock:
+                        self._starting -= 1
+
+    # Checkout
+
+    def acquire(self):
+        """Check out a warm container; falls back to starting one when none is idle."""
+        if self._closed:
+            raise RuntimeError("DockerComputerPool is closed")
+        self.start()
+        container = None
+        while container is None:
+            try:
+                candidate = self._idle.get_nowait()
+            except queue.Empty:
+                logger.info("No warm computer container available, starting one")
+                candidate = self._create()
+            if self._is_running(candidate):
+                container = candidate
+            else:
+                self._discard(candidate)
+        with self._lock:
+            self._in_use[container.id] = container
+        self._refill.set()
+        return container
+
+    def release(self, container) -> None:
+        """Reset the container and return it to the pool, or replace it."""
+        with self._lock:
+            self._in_use.pop(container.id, None)
+            uses = self._uses[container.id] = self._uses.get(container.id, 0) + 1
+        if self._closed or uses >= self.max_uses or not self._reset(container):
+            self._discard(container)
+        else:
+            self._idle.put(container)
+        self._refill.set()
+
+    def close(self) -> None:
+        """Stop replenishing and remove idle containers; checked-out ones are removed on release."""
+        self._closed = True
+        self._refill.set()
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": self._idle.qsize(),
+                "in_use": len(self._in_use),
+                "starting": self._starting,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_computer_pool() -> DockerComputerPool:
+    """Process-wide pool sized by COMPUTER_POOL_SIZE. Call .start() at server startup to pre-warm."""
+    return DockerComputerPool(
+        size=max(COMPUTER_POOL_SIZE, 1),
+        mem_limit=f"{COMPUTER_SESSION_MEMORY_MB}m" if COMPUTER_SESSION_MEMORY_MB else None,
+    )
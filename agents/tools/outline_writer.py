@@ -7,6 +7,10 @@ from pydantic import BaseModel, Field
 
 from copilotkit.langchain import copilotkit_emit_state
 from langchain_core.runnables import RunnableConfig
+from langchain_community.adapters.openai import convert_openai_messages
+
+from ..prompt_cache import build_cached_prompt, record_cache_usage
+from ..prompts import OUTLINE_WRITER_SYSTEM_PROMPT
 
 
 # "description": "The main sections that compose this research",  # This is a description on what are "sections"
@@ -24,6 +28,12 @@ PROPOSAL_FORMAT = {
 
 PROPOSAL_KEYS = list(PROPOSAL_FORMAT.keys())
 
+OUTLINE_MODEL = "google:gemini-2.5-pro"
+# Formatted once so the system prompt is byte-identical across calls (cacheable prefix)
+OUTLINE_SYSTEM_PROMPT = OUTLINE_WRITER_SYSTEM_PROMPT.format(
+    proposal_format=json.dumps(PROPOSAL_FORMAT, indent=2)
+)
+
 class OutlineWriterInput(BaseModel):
     research_query: str = Field(description="Research query")
     state: Optional[Dict] = Field(description="State of the research")
@@ -52,32 +62,28 @@ async def outline_writer(research_query, state):
         # Remove trailing ", "
         approved_sections = approved_sections.rstrip(", ")
         non_approved_sections = non_approved_sections.rstrip(", ")
-        current_proposal_text = (
-            f"Current proposal:\n{json.dumps(current_proposal, indent=2)}\n\n"
-            "Consider the user's remarks when drafting the revised proposal and generating new sections. ")
+        current_proposal_text = f"Current proposal:\n{json.dumps(current_proposal, indent=2)}\n\n"
         if approved_sections:
-            current_proposal_text += (
-                f"Ensure to include the following user approved sections in the new proposal: {approved_sections}. ")
+            current_proposal_text += f"User approved sections: {approved_sections}\n"
         if non_approved_sections:
-            current_proposal_text += (
-                f"If the user did not mention in the remarks any edits requests regarding the following non approved sections: {non_approved_sections}, omit those sections from the new proposal."
-                )
+            current_proposal_text += f"Non approved sections: {non_approved_sections}\n"
+        current_proposal_text += "\n"
     else:
         current_proposal_text = ""
 
-    prompt = (
-        "You are an AI assistant that helps users plan research structures. "
-        "Your task is to propose a logical structure for a research paper that "
-        "the user can review and modify.\n\n"
-        f"Today's date is {datetime.now().strftime('%d/%m/%Y')}.\n"
-        f"Research Topic: {research_query}\n"
-        "Create a detailed proposal that includes report's sections. "
-        "Please return nothing but a JSON in the following format:\n"
-        f"{json.dumps(PROPOSAL_FORMAT, indent=2)}\n"
-        f"{current_proposal_text}"
-        "Here are some relevant sources to consider while planning the proposal:\n"
-        f"{sources_summary}\n\n"
-        "Your Proposal:"
+    # Dynamic content only, ordered from most to least stable: the sources block
+    # stays the same across revisions, the current proposal and remarks do not
+    prompt = build_cached_prompt(
+        OUTLINE_SYSTEM_PROMPT,
+        (
+            f"Today's date is {datetime.now().strftime('%d/%m/%Y')}.\n"
+            f"Research Topic: {research_query}\n\n"
+            "Here are some relevant sources to consider while planning the proposal:\n"
+            f"{sources_summary}\n\n"
+            f"{current_proposal_text}"
+            "Your Proposal:"
+        ),
+        OUTLINE_MODEL,
     )
 
     config = RunnableConfig()
@@ -97,11 +103,15 @@ async def outline_writer(research_query, state):
 
     try:
 
-        response = create_react_agent(
-            model="google:gemini-2.5-pro",
-            prompt=prompt,
+        lc_messages = convert_openai_messages(prompt)
+        result = create_react_agent(
+            model=OUTLINE_MODEL,
+            prompt=lc_messages[0],
             tools=[outline_writer]
-        ).invoke(prompt)
+        ).invoke({"messages": lc_messages[1:]})
+        ai_message = result["messages"][-1]
+        record_cache_usage(state, "outline_writer", ai_message)
+        response = ai_message.content
         for i, log in enumerate(state["logs"]):
             state["logs"][i]["done"] = True
         await copilotkit_emit_state(config, state)
@@ -1,11 +1,18 @@
 """Playwright Base Tool"""
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any, Optional, Tuple, Type
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional, Tuple, Type
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool
 from langchain_core.utils import guard_import
 from pydantic import model_validator
+from tools.playwright.browser_pool import DEFAULT_THREAD_ID, AsyncBrowserPool
+from tools.playwright.navigation import FULL_NAVIGATION, NavigationProfile
+from tools.playwright.page_cache import DEFAULT_PAGE_CACHE, PageStateCache
+from tools.playwright.utils import aget_current_page
 if TYPE_CHECKING:
     from playwright.async_api import Browser as AsyncBrowser
+    from playwright.async_api import Page as AsyncPage
     from playwright.sync_api import Browser as SyncBrowser
 else:
     try:
@@ -32,23 +39,47 @@ class BaseBrowserTool(BaseTool):
 
     sync_browser: Optional["SyncBrowser"] = None
     async_browser: Optional["AsyncBrowser"] = None
+    browser_pool: Optional[AsyncBrowserPool] = None
+    """Gives each LangGraph thread its own page; takes precedence over async_browser."""
+    navigation_profile: NavigationProfile = FULL_NAVIGATION
+    """What page loads fetch and wait for; see navigation.py."""
+    page_cache: PageStateCache = DEFAULT_PAGE_CACHE
+    """Extraction results per page until it navigates or changes; see page_cache.py."""
 
     @model_validator(mode="before")
     @classmethod
     def validate_browser_provided(cls, values: dict) -> Any:
         """Check that the arguments are valid."""
         lazy_import_playwright_browsers()
-        if values.get("async_browser") is None and values.get("sync_browser") is None:
-            raise ValueError("Either async_browser or sync_browser must be specified.")
+        if (
+            values.get("async_browser") is None
+            and values.get("sync_browser") is None
+            and values.get("browser_pool") is None
+        ):
+            raise ValueError("Either async_browser, sync_browser or browser_pool must be specified.")
         return values
 
+    @asynccontextmanager
+    async def _apage(self, config: Optional[RunnableConfig] = None) -> AsyncIterator["AsyncPage"]:
+        """The page async tool calls work on: the thread's leased page when pooled."""
+        if self.browser_pool is not None:
+            thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+            async with self.browser_pool.lease(str(thread_id) if thread_id is not None else DEFAULT_THREAD_ID) as page:
+                yield page
+            return
+        if self.async_browser is None:
+            raise ValueError(f"Asynchronous browser not provided to {self.name}")
+        yield await aget_current_page(self.async_browser)
+
 
     @classmethod
     def from_browser(
         cls,
         sync_browser: Optional[SyncBrowser] = None,
         async_browser: Optional[AsyncBrowser] = None,
+        browser_pool: Optional[AsyncBrowserPool] = None,
+        **kwargs: Any,
     ) -> BaseBrowserTool:
         """Instantiate the tool."""
         lazy_import_playwright_browsers()
-        return cls(sync_browser=sync_browser, async_browser=async_browser)  # type: ignore[call-arg]
+        return cls(sync_browser=sync_browser, async_browser=async_browser, browser_pool=browser_pool, **kwargs)  # type: ignore[call-arg]
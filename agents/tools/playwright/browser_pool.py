@@ -0,0 +1,277 @@
+"""Browser pool for the async Playwright tools.
+
+Browsers are launched once and shared. Each conversation (LangGraph thread_id)
+leases its own browser context and page, so parallel agents never navigate
+each other's tab. Contexts are recycled after a number of navigations to
+bound renderer memory (cookies and local storage are carried over), and the
+total number of open pages is capped: when the cap is reached the least
+recently used idle conversation is closed, or the caller waits for one.
+"""
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser as AsyncBrowser
+    from playwright.async_api import BrowserContext as AsyncBrowserContext
+    from playwright.async_api import Page as AsyncPage
+    from playwright.async_api import Playwright as AsyncPlaywright
+
+logger = logging.getLogger(__name__)
+
+# Lease key for tool calls made outside a LangGraph thread
+DEFAULT_THREAD_ID = "default"
+
+
+@dataclass
+class BrowserSession:
+    """One conversation's context and page; both are None until the first lease opens them."""
+    thread_id: str
+    browser: Optional["AsyncBrowser"] = None
+    context: Optional["AsyncBrowserContext"] = None
+    page: Optional["AsyncPage"] = None
+    navigations: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    # Tool calls currently holding (or waiting to open) the page
+    active: int = 0
+    # Held while the context is opened or recycled, outside the pool-wide lock
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class AsyncBrowserPool:
+    """Shared Playwright browsers handing out one isolated page per conversation.
+
+    Args:
+        browsers: Number of Chromium processes to spread contexts over
+        max_pages: Open pages (one per conversation) allowed across all browsers
+        max_navigations: Navigations after which a conversation's context is recycled
+        headless: Whether to run the browsers headless
+        args: Extra arguments for chromium.launch
+        context_options: Keyword arguments for browser.new_context (viewport, user agent, ...)
+        acquire_timeout: Seconds a new conversation waits for a free page slot
+    """
+
+    def __init__(
+        self,
+        browsers: int = 1,
+        max_pages: int = 8,
+        max_navigations: int = 50,
+        headless: bool = True,
+        args: Optional[List[str]] = None,
+        context_options: Optional[Dict[str, Any]] = None,
+        acquire_timeout: float = 60.0,
+    ):
+        self.browser_count = max(browsers, 1)
+        self.max_pages = max(max_pages, 1)
+        self.max_navigations = max_navigations
+        self.headless = headless
+        self.args = args
+        self.context_options = context_options or {}
+        self.acquire_timeout = acquire_timeout
+
+        self._playwright: Optional["AsyncPlaywright"] = None
+        self._browsers: List["AsyncBrowser"] = []
+        # Least recently used first
+        self._sessions: "OrderedDict[str, BrowserSession]" = OrderedDict()
+        # Guards the session table only; browser and context I/O happens outside it
+        self._condition = asyncio.Condition()
+        self._browser_lock = asyncio.Lock()
+        self._closed = False
+
+    # Browsers
+
+    async def start(self) -> "AsyncBrowserPool":
+        """Launch the browsers. Must be awaited on the loop the tools run on."""
+        async with self._browser_lock:
+            await self._start()
+        return self
+
+    async def _start(self) -> None:
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        while len(self._browsers) < self.browser_count:
+            self._browsers.append(await self._launch())
+
+    async def _launch(self) -> "AsyncBrowser":
+        return await self._playwright.chromium.launch(headless=self.headless, args=self.args)
+
+    async def _pick_browser(self) -> "AsyncBrowser":
+        """The connected browser with the fewest conversations; relaunches crashed ones."""
+        async with self._browser_lock:
+            await self._start()
+            for index, browser in enumerate(self._browsers):
+                if not browser.is_connected():
+                    logger.warning("Playwright browser disconnected, relaunching")
+                    self._browsers[index] = await self._launch()
+            load = {id(b): 0 for b in self._browsers}
+            for session in self._sessions.values():
+                if id(session.browser) in load:
+                    load[id(session.browser)] += 1
+            return min(self._browsers, key=lambda b: load[id(b)])
+
+    # Sessions
+
+    async def _open(self, session: BrowserSession, storage_state: Optional[Dict[str, Any]] = None) -> None:
+        browser = await self._pick_browser()
+        options = dict(self.context_options)
+        if storage_state is not None:
+            options["storage_state"] = storage_state
+        context = await browser.new_context(**options)
+        try:
+            page = await context.new_page()
+        except Exception:
+            await context.close()
+            raise
+
+        def on_navigated(frame: Any) -> None:
+            if frame == page.main_frame:
+                session.navigations += 1
+
+        page.on("framenavigated", on_navigated)
+        session.browser, session.context, session.page = browser, context, page
+        session.navigations = 0
+
+    async def _close(self, session: BrowserSession) -> None:
+        context, session.browser, session.context, session.page = session.context, None, None, None
+        if context is None:
+            return
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser context for {session.thread_id}: {e}")
+
+    async def _recycle(self, session: BrowserSession) -> None:
+        """Replace a long-lived context with a fresh one on the same URL and storage."""
+        url = session.page.url
+        try:
+            storage_state = await session.context.storage_state()
+        except Exception:
+            storage_state = None
+        await self._close(session)
+        await self._open(session, storage_state)
+        if url and url != "about:blank":
+            try:
+                await session.page.goto(url, wait_until="domcontentloaded")
+            except Exception as e:
+                logger.warning(f"Could not restore {url} after recycling a browser context: {e}")
+        session.navigations = 0
+
+    async def _reserve(self, thread_id: str) -> BrowserSession:
+        """Find or add the thread's session and mark it active; only touches the session table."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.acquire_timeout
+        evicted: List[BrowserSession] = []
+        try:
+            async with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("AsyncBrowserPool is closed")
+                    session = self._sessions.get(thread_id)
+                    if session is not None:
+                        self._sessions.move_to_end(thread_id)
+                        break
+                    if len(self._sessions) < self.max_pages:
+                        # Reserve the slot now, open the page after releasing the lock
+                        session = self._sessions[thread_id] = BrowserSession(thread_id)
+                        break
+                    victim = next((s for s in self._sessions.values() if s.active == 0), None)
+                    if victim is not None:
+                        logger.info(f"Closing browser page of {victim.thread_id} to make room for {thread_id}")
+                        del self._sessions[victim.thread_id]
+                        evicted.append(victim)
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise RuntimeError(f"All {self.max_pages} browser pages are in use; try again later")
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                session.active += 1
+                session.last_used = time.monotonic()
+                return session
+        finally:
+            for victim in evicted:
+                await self._close(victim)
+
+    async def _checkout(self, thread_id: str) -> BrowserSession:
+        session = await self._reserve(thread_id)
+        try:
+            async with session.lock:
+                if session.page is None:
+                    await self._open(session)
+                else:
+                    worn_out = self.max_navigations and session.navigations >= self.max_navigations
+                    # Only recycle when no other call is using the page
+                    if session.active == 1 and (worn_out or session.page.is_closed()):
+                        await self._recycle(session)
+        except BaseException:
+            async with self._condition:
+                session.active -= 1
+                if session.page is None and session.active == 0 and self._sessions.get(thread_id) is session:
+                    # Never opened (or lost while recycling); free the slot
+                    del self._sessions[thread_id]
+                self._condition.notify_all()
+            raise
+        return session
+
+    async def _checkin(self, session: BrowserSession) -> None:
+        async with self._condition:
+            session.active -= 1
+            session.last_used = time.monotonic()
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def lease(self, thread_id: str = DEFAULT_THREAD_ID) -> AsyncIterator["AsyncPage"]:
+        """Yield the conversation's page; it is not closed or recycled while leased."""
+        session = await self._checkout(thread_id)
+        try:
+            yield session.page
+        finally:
+            await self._checkin(session)
+
+    async def close_session(self, thread_id: str) -> bool:
+        """Close a conversation's context, e.g. when it ends. Returns False if it had none or is busy."""
+        async with self._condition:
+            session = self._sessions.get(thread_id)
+            if session is None or session.active:
+                return False
+            del self._sessions[thread_id]
+            self._condition.notify_all()
+        await self._close(session)
+        return True
+
+    async def close(self) -> None:
+        """Close all contexts and browsers and stop Playwright."""
+        async with self._condition:
+            self._closed = True
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._condition.notify_all()
+        for session in sessions:
+            await self._close(session)
+        for browser in self._browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers = []
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "browsers": len(self._browsers),
+            "max_pages": self.max_pages,
+            "pages": len(self._sessions),
+            "active": sum(1 for s in self._sessions.values() if s.active),
+            "navigations": {s.thread_id: s.navigations for s in self._sessions.values()},
+        }
@@ -5,10 +5,10 @@ from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
     CallbackManagerForToolRun,
 )
+from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
 from tools.playwright.base import BaseBrowserTool
 from tools.playwright.utils import (
-    aget_current_page,
     get_current_page,
 )
 
@@ -56,28 +56,30 @@ class ClickTool(BaseBrowserTool):
             )
         except PlaywrightTimeoutError:
             return f"Unable to click on element '{selector}'"
+        # Clicks can change the page without navigating
+        self.page_cache.invalidate(page)
         return f"Clicked element '{selector}'"
 
     async def _arun(
         self,
         selector: str,
+        config: RunnableConfig = None,
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> str:
         """Use the tool."""
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
-        # Navigate to the desired webpage before using this tool
-        selector_effective = self._selector_effective(selector=selector)
-        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        async with self._apage(config) as page:
+            # Navigate to the desired webpage before using this tool
+            selector_effective = self._selector_effective(selector=selector)
+            from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-        try:
-            await page.click(
-                selector_effective,
-                strict=self.playwright_strict,
-                timeout=self.playwright_timeout,
-            )
-        except PlaywrightTimeoutError:
-            return f"Unable to click on element '{selector}'"
-        return f"Clicked element '{selector}'"
+            try:
+                await page.click(
+                    selector_effective,
+                    strict=self.playwright_strict,
+                    timeout=self.playwright_timeout,
+                )
+            except PlaywrightTimeoutError:
+                return f"Unable to click on element '{selector}'"
+            self.page_cache.invalidate(page)
+            return f"Clicked element '{selector}'"
 
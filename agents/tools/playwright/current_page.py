@@ -5,10 +5,10 @@ from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
     CallbackManagerForToolRun,
 )
+from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel
 from tools.playwright.base import BaseBrowserTool
 from tools.playwright.utils import (
-    aget_current_page,
     get_current_page,
 )
 
@@ -35,11 +35,10 @@ class CurrentWebPageTool(BaseBrowserTool):
 
     async def _arun(
         self,
+        config: RunnableConfig = None,
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> str:
         """Use the tool."""
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
-        return str(page.url)
+        async with self._apage(config) as page:
+            return str(page.url)
 
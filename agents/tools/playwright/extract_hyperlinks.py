@@ -1,18 +1,16 @@
 from __future__ import annotations
-import json
-from typing import TYPE_CHECKING, Any, Optional, Type, Tuple, List
+from typing import Optional, Type, Tuple, List
 from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
     CallbackManagerForToolRun,
 )
-from pydantic import BaseModel, Field, model_validator
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel, Field
 from tools.playwright.base import BaseBrowserTool
+from tools.playwright.extraction import aextract_links, extract_links
 from tools.playwright.utils import (
-    aget_current_page,
     get_current_page,
 )
-if TYPE_CHECKING:
-    pass 
 
 
 class ExtractHyperlinksToolInput(BaseModel):
@@ -34,23 +32,13 @@ class ExtractHyperlinksTool(BaseBrowserTool):
     args_schema: Type[BaseModel] = ExtractHyperlinksToolInput
     response_format: str = "content_and_artifact"
 
-    @model_validator(mode="before")
-    @classmethod
-    def check_bs_import(cls, values: dict) -> Any:
-        """Check that the arguments are valid."""
-        try:
-            from bs4 import BeautifulSoup  # noqa: F401
-        except ImportError:
-            raise ImportError(
-                "The 'beautifulsoup4' package is required to use this tool."
-                " Please install it with 'pip install beautifulsoup4'."
-            )
-        return values
-
-
     @staticmethod
     def scrape_page(page_url: str, html_content: str, absolute_urls: bool) -> List[str]:
-        """Helper to scrape links. Returns a list of strings."""
+        """Helper to scrape links from HTML with BeautifulSoup. Returns a list of strings.
+
+        The tools extract links in the page instead (see extraction.py); this is
+        kept for callers that only have HTML.
+        """
         from urllib.parse import urljoin
         from bs4 import BeautifulSoup
 
@@ -79,10 +67,7 @@ class ExtractHyperlinksTool(BaseBrowserTool):
             raise ValueError(f"Synchronous browser not provided to {self.name}")
         
         page = get_current_page(self.sync_browser)
-        html_content = page.content()
-        page_url = page.url # Pass current page URL for urljoin
-        
-        all_links = self.scrape_page(page_url, html_content, absolute_urls)
+        all_links = extract_links(page, absolute_urls, self.page_cache)
         
         content_summary = f"Extracted {len(all_links)} unique hyperlinks."
         if max_links_for_content > 0 and all_links:
@@ -98,24 +83,19 @@ class ExtractHyperlinksTool(BaseBrowserTool):
         self,
         absolute_urls: bool = False,
         max_links_for_content: int = 5,
+        config: RunnableConfig = None,
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> Tuple[str, List[str]]: 
         """Use the tool asynchronously."""
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
+        async with self._apage(config) as page:
+            all_links = await aextract_links(page, absolute_urls, self.page_cache)
         
-        page = await aget_current_page(self.async_browser)
-        html_content = await page.content()
-        page_url = page.url
-        
-        all_links = self.scrape_page(page_url, html_content, absolute_urls) # scrape_page is sync
-        
-        content_summary = f"Extracted {len(all_links)} unique hyperlinks."
-        if max_links_for_content > 0 and all_links:
-            content_summary += " Top links: " + ", ".join(all_links[:max_links_for_content])
-            if len(all_links) > max_links_for_content:
-                content_summary += "..."
-        elif not all_links:
-            content_summary += " No links found."
+            content_summary = f"Extracted {len(all_links)} unique hyperlinks."
+            if max_links_for_content > 0 and all_links:
+                content_summary += " Top links: " + ", ".join(all_links[:max_links_for_content])
+                if len(all_links) > max_links_for_content:
+                    content_summary += "..."
+            elif not all_links:
+                content_summary += " No links found."
 
-        return content_summary, all_links # Return content string and list of links
\ No newline at end of file
+            return content_summary, all_links # Return content string and list of links
\ No newline at end of file
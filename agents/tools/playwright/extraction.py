@@ -0,0 +1,105 @@
+"""In-page text and link extraction for the Playwright tools.
+
+Instead of shipping the whole `page.content()` HTML over CDP and parsing it
+with BeautifulSoup, the browser computes the result (innerText, anchors with
+resolved hrefs) and returns only that. Text and links go through a
+PageStateCache (see page_cache.py), so repeated extractions of an unchanged
+page don't re-extract or re-send anything.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, List
+from tools.playwright.page_cache import DEFAULT_PAGE_CACHE, PageStateCache, versioned_script
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page as AsyncPage
+    from playwright.sync_api import Page as SyncPage
+
+_TEXT_JS = versioned_script("""
+() => (document.body ? document.body.innerText : document.documentElement.innerText || "")
+    .replace(/[ \\t\\u00a0]+/g, " ")
+    .replace(/\\s*\\n\\s*/g, "\\n")
+    .trim()
+""")
+
+# [raw href, resolved href] per anchor, in document order
+_LINKS_JS = versioned_script("""
+() => Array.from(document.querySelectorAll("a[href]"), a => [a.getAttribute("href"), a.href])
+""")
+
+
+def _unique_links(pairs: List[List[str]], absolute_urls: bool) -> List[str]:
+    index = 1 if absolute_urls else 0
+    return list(dict.fromkeys(pair[index] for pair in pairs if pair[index]))
+
+
+async def aextract_text(page: AsyncPage, cache: PageStateCache = DEFAULT_PAGE_CACHE) -> str:
+    """Visible text of the page (innerText), whitespace-normalized."""
+    return await cache.aget(page, "text", _TEXT_JS)
+
+
+def extract_text(page: SyncPage, cache: PageStateCache = DEFAULT_PAGE_CACHE) -> str:
+    """Visible text of the page (innerText), whitespace-normalized."""
+    return cache.get(page, "text", _TEXT_JS)
+
+
+async def aextract_links(
+    page: AsyncPage, absolute_urls: bool = False, cache: PageStateCache = DEFAULT_PAGE_CACHE
+) -> List[str]:
+    """Unique hrefs in document order; absolute ones are resolved by the browser (honours <base>)."""
+    return _unique_links(await cache.aget(page, "links", _LINKS_JS), absolute_urls)
+
+
+def extract_links(
+    page: SyncPage, absolute_urls: bool = False, cache: PageStateCache = DEFAULT_PAGE_CACHE
+) -> List[str]:
+    """Unique hrefs in document order; absolute ones are resolved by the browser (honours <base>)."""
+    return _unique_links(cache.get(page, "links", _LINKS_JS), absolute_urls)
+
+
+# Search results are read with the engine's selectors in the page as well.
+# These follow the engines' current markup and will need updating when it changes.
+SEARCH_RESULT_SELECTORS: Dict[str, Dict[str, str]] = {
+    "duckduckgo": {
+        "result": "article[data-testid='result']",
+        "title": "h2 a span",
+        "link": "div a[data-testid='result-title-a']",
+        "snippet": "div[data-testid='result-extras-body'] span",
+    },
+    "brave": {
+        "result": "div.snippet",
+        "title": "span.snippet-title",
+        "link": "a.result-header",
+        "snippet": "p.snippet-description",
+    },
+}
+
+_SEARCH_RESULTS_JS = """
+(results, [selectors, limit]) => {
+    const text = (root, selector) => {
+        const el = root.querySelector(selector);
+        return el ? el.textContent.trim() : "N/A";
+    };
+    const items = [];
+    for (const result of results.slice(0, limit)) {
+        const anchor = result.querySelector(selectors.link);
+        const title = text(result, selectors.title);
+        const link = anchor && anchor.getAttribute("href") ? anchor.href : "N/A";
+        if (title !== "N/A" && link !== "N/A") {
+            items.push({title, link, snippet: text(result, selectors.snippet)});
+        }
+    }
+    return items;
+}
+"""
+
+
+async def aextract_search_results(page: AsyncPage, engine: str, num_results: int) -> List[Dict[str, str]]:
+    """Top results from a search engine results page as {title, link, snippet} dicts."""
+    selectors = SEARCH_RESULT_SELECTORS[engine]
+    return await page.eval_on_selector_all(selectors["result"], _SEARCH_RESULTS_JS, [selectors, num_results])
+
+
+def extract_search_results(page: SyncPage, engine: str, num_results: int) -> List[Dict[str, str]]:
+    """Top results from a search engine results page as {title, link, snippet} dicts."""
+    selectors = SEARCH_RESULT_SELECTORS[engine]
+    return page.eval_on_selector_all(selectors["result"], _SEARCH_RESULTS_JS, [selectors, num_results])
@@ -6,10 +6,11 @@ from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
     CallbackManagerForToolRun,
 )
+from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
 from tools.playwright.base import BaseBrowserTool
+from tools.playwright.page_cache import PageStateCache, versioned_script
 from tools.playwright.utils import (
-    aget_current_page,
     get_current_page,
 )
 
@@ -32,59 +33,91 @@ class GetElementsToolInput(BaseModel):
         default=3,
         description="Maximum number of elements to summarize in the 'content' string for the LLM. Set to 0 to omit elements from content."
     )
+    max_elements: int = Field(
+        default=200,
+        description="Maximum number of elements to return; later matches are skipped."
+    )
+    max_chars_per_value: int = Field(
+        default=1000,
+        description="Longer attribute values are truncated to this many characters."
+    )
+
+
+# Runs in the page: collects every requested attribute of up to `limit` matches in
+# one round trip instead of one CDP call per element per attribute.
+_EXTRACT_ELEMENTS_JS = """
+(elements, [attributes, limit, maxChars]) => {
+    const items = [];
+    for (const el of elements) {
+        if (items.length >= limit) break;
+        const row = {};
+        for (const name of attributes) {
+            let value;
+            if (name === "innerText") value = el.innerText;
+            else if (name === "textContent") value = el.textContent;
+            else if (name === "outerHTML") value = el.outerHTML;
+            else value = el.getAttribute(name);
+            if (value != null && value.trim() !== "") {
+                row[name] = value.length > maxChars ? value.slice(0, maxChars) + "..." : value;
+            }
+        }
+        if (Object.keys(row).length) items.push(row);
+    }
+    return {total: elements.length, items};
+}
+"""
+
+
+# Same extraction through PageStateCache. querySelectorAll only understands CSS,
+# so selectors using Playwright's own syntax (text=, >>, ...) fall back to
+# eval_on_selector_all uncached.
+_CACHED_ELEMENTS_JS = versioned_script(
+    "([selector, ...rest]) => (%s)(Array.from(document.querySelectorAll(selector)), rest)"
+    % _EXTRACT_ELEMENTS_JS.strip()
+)
 
 
 async def _aget_elements(
-    page: AsyncPage, selector: str, attributes: Sequence[str]
-) -> List[Dict[str, str]]: 
-    """Get elements matching the given CSS selector."""
-    elements = await page.query_selector_all(selector)
-    results = []
-    for element in elements:
-        result: Dict[str, str] = {} 
-        for attribute in attributes:
-            val: Optional[str] = None
-            if attribute == "innerText":
-                val = await element.inner_text()
-            elif attribute == "textContent": 
-                val = await element.text_content()
-            elif attribute == "outerHTML": 
-                val = await element.outer_html()
-            else:
-                val = await element.get_attribute(attribute)
-            
-            if val is not None and val.strip() != "":
-                result[attribute] = val
-        if result:
-            results.append(result)
-    return results
+    page: AsyncPage,
+    selector: str,
+    attributes: Sequence[str],
+    limit: int = 200,
+    max_chars: int = 1000,
+    cache: Optional[PageStateCache] = None,
+) -> Tuple[List[Dict[str, str]], int]:
+    """Get up to `limit` elements matching the given CSS selector, and how many matched."""
+    arg = [list(attributes), limit, max_chars]
+    result = None
+    if cache is not None:
+        try:
+            result = await cache.aget(page, "elements", _CACHED_ELEMENTS_JS, [selector, *arg])
+        except Exception:
+            pass
+    if result is None:
+        result = await page.eval_on_selector_all(selector, _EXTRACT_ELEMENTS_JS, arg)
+    return result["items"], result["total"]
 
 
 def _get_elements(
-    page: SyncPage, selector: str, attributes: Sequence[str]
-) -> List[Dict[str, str]]: 
-    """Get elements matching the given CSS selector."""
-    elements = page.query_selector_all(selector)
-    results = []
-    for element in elements:
-        result: Dict[str, str] = {} 
-        for attribute in attributes:
-            val: Optional[str] = None
-            if attribute == "innerText":
-                val = element.inner_text()
-            elif attribute == "textContent":
-                val = element.text_content()
-            elif attribute == "outerHTML":
-                val = element.outer_html()
-            else:
-                val = element.get_attribute(attribute)
-            
-            if val is not None and val.strip() != "":
-                result[attribute] = val
-        if result:
-            results.append(result)
-    return results
-    
+    page: SyncPage,
+    selector: str,
+    attributes: Sequence[str],
+    limit: int = 200,
+    max_chars: int = 1000,
+    cache: Optional[PageStateCache] = None,
+) -> Tuple[List[Dict[str, str]], int]:
+    """Get up to `limit` elements matching the given CSS selector, and how many matched."""
+    arg = [list(attributes), limit, max_chars]
+    result = None
+    if cache is not None:
+        try:
+            result = cache.get(page, "elements", _CACHED_ELEMENTS_JS, [selector, *arg])
+        except Exception:
+            pass
+    if result is None:
+        result = page.eval_on_selector_all(selector, _EXTRACT_ELEMENTS_JS, arg)
+    return result["items"], result["total"]
+
 
 class GetElementsTool(BaseBrowserTool):
     """Tool for getting elements in the current web page matching a CSS selector. Returns a summary for the LLM and a list of element data as an artifact."""
@@ -100,6 +133,8 @@ class GetElementsTool(BaseBrowserTool):
         selector: str,
         attributes: Sequence[str] = ["innerText"],
         max_elements_for_content: int = 3,
+        max_elements: int = 200,
+        max_chars_per_value: int = 1000,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> Tuple[str, List[Dict[str, str]]]: 
         """Use the tool."""
@@ -107,9 +142,13 @@ class GetElementsTool(BaseBrowserTool):
             raise ValueError(f"Synchronous browser not provided to {self.name}")
         page = get_current_page(self.sync_browser)
         
-        all_elements = _get_elements(page, selector, attributes)
+        all_elements, total = _get_elements(
+            page, selector, attributes, max_elements, max_chars_per_value, self.page_cache
+        )
         
-        content_summary = f"Found {len(all_elements)} elements matching selector '{selector}'."
+        content_summary = f"Found {total} elements matching selector '{selector}'."
+        if total > max_elements:
+            content_summary += f" Returning at most {max_elements}."
         if max_elements_for_content > 0 and all_elements:
             summary_elements = all_elements[:max_elements_for_content]
             formatted_summary = "\n".join([json.dumps(el, ensure_ascii=False) for el in summary_elements])
@@ -126,16 +165,20 @@ class GetElementsTool(BaseBrowserTool):
         selector: str,
         attributes: Sequence[str] = ["innerText"],
         max_elements_for_content: int = 3,
+        max_elements: int = 200,
+        max_chars_per_value: int = 1000,
+        config: RunnableConfig = None,
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> Tuple[str, List[Dict[str, str]]]: 
         """Use the tool."""
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
-        
-        all_elements = await _aget_elements(page, selector, attributes) # await the async helper
-        
-        content_summary = f"Found {len(all_elements)} elements matching selector '{selector}'."
+        async with self._apage(config) as page:
+            all_elements, total = await _aget_elements(
+                page, selector, attributes, max_elements, max_chars_per_value, self.page_cache
+            )
+
+        content_summary = f"Found {total} elements matching selector '{selector}'."
+        if total > max_elements:
+            content_summary += f" Returning at most {max_elements}."
         if max_elements_for_content > 0 and all_elements:
             summary_elements = all_elements[:max_elements_for_content]
             formatted_summary = "\n".join([json.dumps(el, ensure_ascii=False) for el in summary_elements])
@@ -145,4 +188,4 @@ class GetElementsTool(BaseBrowserTool):
         elif not all_elements:
             content_summary += " No elements found."
 
-        return content_summary, all_elements
\ No newline at end of file
+        return content_summary, all_elements
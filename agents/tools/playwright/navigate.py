@@ -7,10 +7,11 @@ from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
     CallbackManagerForToolRun,
 )
+from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field, model_validator
 from tools.playwright.base import BaseBrowserTool
+from tools.playwright.navigation import agoto, goto
 from tools.playwright.utils import (
-    aget_current_page,
     get_current_page,
 )
 
@@ -66,7 +67,7 @@ class NavigateTool(BaseBrowserTool):
         artifact: Dict[str, Any] = {}
 
         try:
-            response = page.goto(url)
+            response = goto(page, url, self.navigation_profile)
             status = response.status if response else "unknown"
             new_url = page.url
             
@@ -92,35 +93,34 @@ class NavigateTool(BaseBrowserTool):
         self,
         url: str,
         take_screenshot: bool = False,
+        config: RunnableConfig = None,
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> Tuple[str, Dict[str, Any]]: # Return type changed
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
+        async with self._apage(config) as page:
         
-        content_summary: str
-        artifact: Dict[str, Any] = {}
+            content_summary: str
+            artifact: Dict[str, Any] = {}
 
-        try:
-            response = await page.goto(url)
-            status = response.status if response else "unknown"
-            new_url = page.url
+            try:
+                response = await agoto(page, url, self.navigation_profile)
+                status = response.status if response else "unknown"
+                new_url = page.url
             
-            artifact["url"] = new_url
-            artifact["status_code"] = status
+                artifact["url"] = new_url
+                artifact["status_code"] = status
             
-            content_summary = f"Navigated to {new_url}. Status: {status}."
+                content_summary = f"Navigated to {new_url}. Status: {status}."
 
-            if take_screenshot:
-                screenshot_bytes = await page.screenshot()
-                artifact["screenshot_base64"] = base64.b64encode(screenshot_bytes).decode('utf-8')
-                content_summary += " Screenshot captured."
+                if take_screenshot:
+                    screenshot_bytes = await page.screenshot()
+                    artifact["screenshot_base64"] = base64.b64encode(screenshot_bytes).decode('utf-8')
+                    content_summary += " Screenshot captured."
             
-            # Add current page title as part of the "improved current page"
-            page_title = await page.title()
-            artifact["page_title"] = page_title
-            content_summary += f" Page title: '{page_title}'."
-        except Exception as e:
-            content_summary = f"Failed to navigate to {url}. Error: {str(e)}"
-            artifact["error"] = str(e)
-        return content_summary, artifact
\ No newline at end of file
+                # Add current page title as part of the "improved current page"
+                page_title = await page.title()
+                artifact["page_title"] = page_title
+                content_summary += f" Page title: '{page_title}'."
+            except Exception as e:
+                content_summary = f"Failed to navigate to {url}. Error: {str(e)}"
+                artifact["error"] = str(e)
+            return content_summary, artifact
\ No newline at end of file
@@ -5,10 +5,10 @@ from langchain_core.callbacks import (
     AsyncCallbackManagerForToolRun,
     CallbackManagerForToolRun,
 )
+from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel
 from tools.playwright.base import BaseBrowserTool
 from tools.playwright.utils import (
-    aget_current_page,
     get_current_page,
 )
 
@@ -41,19 +41,18 @@ class NavigateBackTool(BaseBrowserTool):
 
     async def _arun(
         self,
+        config: RunnableConfig = None,
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> str:
         """Use the tool."""
-        if self.async_browser is None:
-            raise ValueError(f"Asynchronous browser not provided to {self.name}")
-        page = await aget_current_page(self.async_browser)
-        response = await page.go_back()
-
-        if response:
-            return (
-                f"Navigated back to the previous page with URL '{response.url}'."
-                f" Status code {response.status}"
-            )
-        else:
-            return "Unable to navigate back; no previous page in the history"
+        async with self._apage(config) as page:
+            response = await page.go_back()
+
+            if response:
+                return (
+                    f"Navigated back to the previous page with URL '{response.url}'."
+                    f" Status code {response.status}"
+                )
+            else:
+                return "Unable to navigate back; no previous page in the history"
 
@@ -0,0 +1,153 @@
+"""Navigation profiles for the Playwright tools.
+
+A profile decides what a navigation loads and how long it waits. The default
+profile keeps Playwright's behaviour (everything loads, wait for `load`). The
+lightweight profile aborts images, media and fonts through request
+interception and returns at `domcontentloaded` plus a short network-quiet
+window, which is enough for text and link extraction and far cheaper in time
+and renderer memory.
+"""
+from __future__ import annotations
+import weakref
+from typing import TYPE_CHECKING, Any, List, Literal, Optional
+from urllib.parse import urlparse
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page as AsyncPage
+    from playwright.async_api import Response as AsyncResponse
+    from playwright.sync_api import Page as SyncPage
+    from playwright.sync_api import Response as SyncResponse
+
+
+class NavigationProfile(BaseModel):
+    """What navigations load and when they count as done."""
+    name: str = "full"
+    blocked_resource_types: List[str] = Field(
+        default_factory=list,
+        description="Playwright resource types to abort, e.g. 'image', 'media', 'font', 'stylesheet'.",
+    )
+    block_third_party_scripts: bool = Field(
+        default=False, description="Abort scripts served from a different site than the page."
+    )
+    wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "load"
+    network_quiet_ms: int = Field(
+        default=0,
+        description="After wait_until, also wait up to this long for the network to go idle (0 = don't).",
+    )
+    timeout_ms: float = Field(default=30_000, description="Navigation timeout.")
+
+    @property
+    def intercepts(self) -> bool:
+        return bool(self.blocked_resource_types) or self.block_third_party_scripts
+
+
+FULL_NAVIGATION = NavigationProfile()
+
+LIGHTWEIGHT_NAVIGATION = NavigationProfile(
+    name="lightweight",
+    blocked_resource_types=["image", "media", "font"],
+    wait_until="domcontentloaded",
+    network_quiet_ms=1_500,
+    timeout_ms=20_000,
+)
+
+# Contexts that already have a blocking route, and the profile it serves
+_routed_contexts: "weakref.WeakKeyDictionary[Any, NavigationProfile]" = weakref.WeakKeyDictionary()
+
+
+def _site(url: str) -> str:
+    """Rough registrable domain: the last two host labels."""
+    host = urlparse(url).hostname or ""
+    return ".".join(host.split(".")[-2:])
+
+
+def should_block(profile: NavigationProfile, resource_type: str, url: str, page_url: str) -> bool:
+    """Whether a request is aborted under the profile."""
+    if resource_type in profile.blocked_resource_types:
+        return True
+    if profile.block_third_party_scripts and resource_type == "script":
+        page_site = _site(page_url)
+        return bool(page_site) and _site(url) != page_site
+    return False
+
+
+def _page_url(request: Any) -> str:
+    try:
+        return request.frame.page.url
+    except Exception:
+        return ""
+
+
+async def aapply_profile(page: AsyncPage, profile: NavigationProfile) -> None:
+    """Install the profile's request blocking on the page's context, once per context and profile."""
+    context = page.context
+    current = _routed_contexts.get(context)
+    if current == profile:
+        return
+    if current is not None:
+        await context.unroute("**/*")
+        del _routed_contexts[context]
+    if not profile.intercepts:
+        return
+
+    async def handle(route: Any) -> None:
+        request = route.request
+        if should_block(profile, request.resource_type, request.url, _page_url(request)):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle)
+    _routed_contexts[context] = profile
+
+
+def apply_profile(page: SyncPage, profile: NavigationProfile) -> None:
+    """Sync version of aapply_profile."""
+    context = page.context
+    current = _routed_contexts.get(context)
+    if current == profile:
+        return
+    if current is not None:
+        context.unroute("**/*")
+        del _routed_contexts[context]
+    if not profile.intercepts:
+        return
+
+    def handle(route: Any) -> None:
+        request = route.request
+        if should_block(profile, request.resource_type, request.url, _page_url(request)):
+            route.abort()
+        else:
+            route.continue_()
+
+    context.route("**/*", handle)
+    _routed_contexts[context] = profile
+
+
+async def agoto(page: AsyncPage, url: str, profile: NavigationProfile = FULL_NAVIGATION) -> Optional[AsyncResponse]:
+    """Navigate under a profile; a network that never goes quiet doesn't fail the navigation."""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    await aapply_profile(page, profile)
+    response = await page.goto(url, wait_until=profile.wait_until, timeout=profile.timeout_ms)
+    if profile.network_quiet_ms:
+        try:
+            await page.wait_for_load_state("networkidle", timeout=profile.network_quiet_ms)
+        except PlaywrightTimeoutError:
+            pass
+    return response
+
+
+def goto(page: SyncPage, url: str, profile: NavigationProfile = FULL_NAVIGATION) -> Optional[SyncResponse]:
+    """Sync version of agoto."""
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+    apply_profile(page, profile)
+    response = page.goto(url, wait_until=profile.wait_until, timeout=profile.timeout_ms)
+    if profile.network_quiet_ms:
+        try:
+            page.wait_for_load_state("networkidle", timeout=profile.network_quiet_ms)
+        except PlaywrightTimeoutError:
+            pass
+    return response
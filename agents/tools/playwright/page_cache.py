@@ -0,0 +1,132 @@
+"""Per-page cache for Playwright extraction results.
+
+Entries are keyed by page identity plus what was extracted (kind and
+arguments), and are valid for one state of the page:
+
+- Every main-frame navigation (`framenavigated`) bumps a counter kept on the
+  host and drops the page's entries.
+- With track_mutations on (the default), an injected MutationObserver also
+  versions the DOM. The extraction script sends back the cached key, so an
+  unchanged page answers with a hit in one tiny evaluate call, while a page
+  that changed in place (SPA updates, clicks) is re-extracted.
+- With track_mutations off, a hit costs no round trip at all; tools that
+  change the page without navigating call invalidate() instead.
+"""
+from __future__ import annotations
+import json
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+# Wraps an extraction expression taking one argument. Installs the DOM version
+# counter on first use and skips the extraction when `known` is still current.
+_VERSIONED_JS = """
+([known, arg]) => {
+    if (window.__agentDomVersion === undefined) {
+        window.__agentDomVersion = 0;
+        new MutationObserver(() => { window.__agentDomVersion++; }).observe(document, {
+            subtree: true, childList: true, characterData: true, attributes: true,
+        });
+    }
+    const key = `${location.href}|${performance.timeOrigin}|${window.__agentDomVersion}`;
+    if (key === known) return {key, hit: true};
+    return {key, hit: false, value: (%s)(arg)};
+}
+"""
+
+
+def versioned_script(expression: str) -> str:
+    """Turn a one-argument JS function into a script PageStateCache can call."""
+    return _VERSIONED_JS % expression
+
+
+@dataclass
+class _PageState:
+    navigation: int = 0
+    # (kind, args) -> (navigation, dom key, value)
+    entries: "OrderedDict[Tuple[str, str], Tuple[int, str, Any]]" = field(default_factory=OrderedDict)
+
+
+class PageStateCache:
+    """Extraction results per page, invalidated by navigation and (optionally) DOM mutations.
+
+    Args:
+        track_mutations: Check the in-page DOM version on every lookup
+        max_entries_per_page: Distinct extractions kept per page, least recently used dropped
+    """
+
+    def __init__(self, track_mutations: bool = True, max_entries_per_page: int = 32):
+        self.track_mutations = track_mutations
+        self.max_entries_per_page = max_entries_per_page
+        self.hits = 0
+        self.misses = 0
+        self._pages: "weakref.WeakKeyDictionary[Any, _PageState]" = weakref.WeakKeyDictionary()
+
+    def _state(self, page: Any) -> _PageState:
+        state = self._pages.get(page)
+        if state is None:
+            state = self._pages[page] = _PageState()
+
+            def on_navigated(frame: Any) -> None:
+                if frame == page.main_frame:
+                    state.navigation += 1
+                    state.entries.clear()
+
+            page.on("framenavigated", on_navigated)
+        return state
+
+    def invalidate(self, page: Any) -> None:
+        """Drop the page's entries, e.g. after an interaction that changed it in place."""
+        state = self._pages.get(page)
+        if state is not None:
+            state.entries.clear()
+
+    def _lookup(self, page: Any, kind: str, arg: Any) -> Tuple[_PageState, Tuple[str, str], str, Any, bool]:
+        """Returns (state, entry key, DOM key to send, cached value, usable without asking the page)."""
+        state = self._state(page)
+        entry_key = (kind, json.dumps(arg, sort_keys=True, default=str))
+        entry = state.entries.get(entry_key)
+        if entry is None or entry[0] != state.navigation:
+            return state, entry_key, "", None, False
+        state.entries.move_to_end(entry_key)
+        return state, entry_key, entry[1], entry[2], not self.track_mutations
+
+    def _store(self, state: _PageState, navigation: int, entry_key: Tuple[str, str], cached: Any, result: Dict[str, Any]) -> Any:
+        if result["hit"]:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        if state.navigation == navigation:
+            # Skip storing if the page navigated while we were extracting
+            state.entries[entry_key] = (navigation, result["key"], result["value"])
+            while len(state.entries) > self.max_entries_per_page:
+                state.entries.popitem(last=False)
+        return result["value"]
+
+    async def aget(self, page: Any, kind: str, script: str, arg: Any = None) -> Any:
+        """Run a versioned_script extraction on an async page, or answer from the cache."""
+        state, entry_key, known, cached, fresh = self._lookup(page, kind, arg)
+        if fresh:
+            self.hits += 1
+            return cached
+        navigation = state.navigation
+        result = await page.evaluate(script, [known, arg])
+        return self._store(state, navigation, entry_key, cached, result)
+
+    def get(self, page: Any, kind: str, script: str, arg: Any = None) -> Any:
+        """Run a versioned_script extraction on a sync page, or answer from the cache."""
+        state, entry_key, known, cached, fresh = self._lookup(page, kind, arg)
+        if fresh:
+            self.hits += 1
+            return cached
+        navigation = state.navigation
+        result = page.evaluate(script, [known, arg])
+        return self._store(state, navigation, entry_key, cached, result)
+
+    def stats(self) -> Dict[str, int]:
+        return {"pages": len(self._pages), "hits": self.hits, "misses": self.misses}
+
+
+# Shared by tools that aren't given their own cache
+DEFAULT_PAGE_CACHE = PageStateCache()
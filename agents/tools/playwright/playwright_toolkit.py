@@ -8,6 +8,9 @@ from tools.playwright.base import (
     BaseBrowserTool,
     lazy_import_playwright_browsers,
 )
+from tools.playwright.browser_pool import AsyncBrowserPool
+from tools.playwright.navigation import FULL_NAVIGATION, NavigationProfile
+from tools.playwright.page_cache import DEFAULT_PAGE_CACHE, PageStateCache
 from tools.playwright.click import ClickTool
 from tools.playwright.current_page import CurrentWebPageTool
 from tools.playwright.extract_hyperlinks import (
@@ -55,9 +58,20 @@ class PlayWrightToolkit(BaseToolkit):
         
     Parameters:
         sync_browser: Optional. The sync browser. Default is None.
-        async_browser: Optional. The async browser. Default is None."""
+        async_browser: Optional. The async browser. Default is None.
+        browser_pool: Optional. Pool giving each LangGraph thread its own
+            context and page. Default is None.
+        navigation_profile: Optional. What page loads fetch and wait for.
+            LIGHTWEIGHT_NAVIGATION skips images, media and fonts and returns
+            once the DOM is ready. Default is FULL_NAVIGATION.
+        page_cache: Optional. Cache the text, link and element tools share,
+            valid until a page navigates or its DOM changes.
+            Default is DEFAULT_PAGE_CACHE."""
     sync_browser: Optional["SyncBrowser"] = None
     async_browser: Optional["AsyncBrowser"] = None
+    browser_pool: Optional[AsyncBrowserPool] = None
+    navigation_profile: NavigationProfile = FULL_NAVIGATION
+    page_cache: PageStateCache = DEFAULT_PAGE_CACHE
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
@@ -69,8 +83,12 @@ class PlayWrightToolkit(BaseToolkit):
     def validate_imports_and_browser_provided(cls, values: dict) -> Any:
         """Check that the arguments are valid."""
         lazy_import_playwright_browsers()
-        if values.get("async_browser") is None and values.get("sync_browser") is None:
-            raise ValueError("Either async_browser or sync_browser must be specified.")
+        if (
+            values.get("async_browser") is None
+            and values.get("sync_browser") is None
+            and values.get("browser_pool") is None
+        ):
+            raise ValueError("Either async_browser, sync_browser or browser_pool must be specified.")
         return values
 
 
@@ -90,7 +108,11 @@ class PlayWrightToolkit(BaseToolkit):
 
         tools = [
             tool_cls.from_browser(
-                sync_browser=self.sync_browser, async_browser=self.async_browser
+                sync_browser=self.sync_browser,
+                async_browser=self.async_browser,
+                browser_pool=self.browser_pool,
+                navigation_profile=self.navigation_profile,
+                page_cache=self.page_cache,
             )
             for tool_cls in tool_classes
         ]
@@ -102,16 +124,40 @@ class PlayWrightToolkit(BaseToolkit):
         cls,
         sync_browser: Optional[SyncBrowser] = None,
         async_browser: Optional[AsyncBrowser] = None,
+        navigation_profile: NavigationProfile = FULL_NAVIGATION,
     ) -> PlayWrightToolkit:
         """Instantiate the toolkit.
 
         Args:
             sync_browser: Optional. The sync browser. Default is None.
             async_browser: Optional. The async browser. Default is None.
+            navigation_profile: Optional. Default is FULL_NAVIGATION.
 
         Returns:
             The toolkit.
         """
         # This is to raise a better error than the forward ref ones Pydantic would have
         lazy_import_playwright_browsers()
-        return cls(sync_browser=sync_browser, async_browser=async_browser)
+        return cls(
+            sync_browser=sync_browser,
+            async_browser=async_browser,
+            navigation_profile=navigation_profile,
+        )
+
+    @classmethod
+    def from_browser_pool(
+        cls,
+        browser_pool: AsyncBrowserPool,
+        navigation_profile: NavigationProfile = FULL_NAVIGATION,
+    ) -> PlayWrightToolkit:
+        """Instantiate the toolkit on a browser pool, isolating pages per thread.
+
+        Args:
+            browser_pool: The pool; start() it on the loop the agent runs on.
+            navigation_profile: Optional. Default is FULL_NAVIGATION.
+
+        Returns:
+            The toolkit.
+        """
+        lazy_import_playwright_browsers()
+        return cls(browser_pool=browser_pool, navigation_profile=navigation_profile)
@@ -2,8 +2,9 @@ import base64
 from typing import Tuple, Dict, Any, Optional, Type
 from pydantic import BaseModel
 from langchain_core.tools import BaseTool
+from langchain_core.runnables import RunnableConfig
 from tools.playwright.base import BaseBrowserTool
-from tools.playwright.utils import get_current_page, aget_current_page
+from tools.playwright.utils import get_current_page
 
 class CapturePageScreenshotToolInput(BaseModel):
     pass # No specific input needed, captures current page
@@ -24,12 +25,10 @@ class WebPageScreenshotTool(BaseBrowserTool):
         artifact = {"url": page.url, "screenshot_base64": img_base64}
         return content, artifact
 
-    async def _arun(self, run_manager=None) -> Tuple[str, Dict[str, Any]]:
-        if self.async_browser is None:
-            raise ValueError("Async browser not provided")
-        page = await aget_current_page(self.async_browser)
-        screenshot_bytes = await page.screenshot()
-        img_base64 = base64.b64encode(screenshot_bytes).decode('utf-8')
-        content = f"Screenshot of {page.url} captured."
-        artifact = {"url": page.url, "screenshot_base64": img_base64}
-        return content, artifact
\ No newline at end of file
+    async def _arun(self, config: RunnableConfig = None, run_manager=None) -> Tuple[str, Dict[str, Any]]:
+        async with self._apage(config) as page:
+            screenshot_bytes = await page.screenshot()
+            img_base64 = base64.b64encode(screenshot_bytes).decode('utf-8')
+            content = f"Screenshot of {page.url} captured."
+            artifact = {"url": page.url, "screenshot_base64": img_base64}
+            return content, artifact
\ No newline at end of file
@@ -54,6 +54,29 @@ def create_async_playwright_browser(
     """
     Create an async playwright browser.
 
+    Args:
+        headless: Whether to run the browser in headless mode. Defaults to True.
+        args: arguments to pass to browser.chromium.launch
+
+    Returns:
+        AsyncBrowser: The playwright browser.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run_async(acreate_async_playwright_browser(headless=headless, args=args))
+    raise RuntimeError(
+        "create_async_playwright_browser() can't block inside a running event loop; "
+        "await acreate_async_playwright_browser() or use AsyncBrowserPool instead."
+    )
+
+
+async def acreate_async_playwright_browser(
+    headless: bool = True, args: Optional[List[str]] = None
+) -> AsyncBrowser:
+    """
+    Create an async playwright browser on the running event loop.
+
     Args:
         headless: Whether to run the browser in headless mode. Defaults to True.
         args: arguments to pass to browser.chromium.launch
@@ -63,8 +86,8 @@ def create_async_playwright_browser(
     """
     from playwright.async_api import async_playwright
 
-    browser = run_async(async_playwright().start())
-    return run_async(browser.chromium.launch(headless=headless, args=args))
+    playwright = await async_playwright().start()
+    return await playwright.chromium.launch(headless=headless, args=args)
 
 
 def create_sync_playwright_browser(
@@ -0,0 +1,126 @@
+"""Lazy tool registry.
+
+Tools are registered by name, description and argument schema only. The module
+that implements a tool, and any client it builds, is imported on the tool's
+first invocation, so agents can be assembled without paying for (or needing
+credentials for) every provider SDK up front.
+"""
+
+from importlib import import_module
+from typing import Any, Dict, List, Optional, Type
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, Field, PrivateAttr
+
+# Targets are "module:attribute" paths relative to the agents package
+_PACKAGE = __name__.rsplit(".", 2)[0]
+
+
+class LazyTool(BaseTool):
+    """Tool proxy that imports its implementation on first invocation."""
+
+    target: str = Field(description="Implementation as 'module:attribute', e.g. '.resources.search:search_for_agencies'")
+
+    _tool: Optional[BaseTool] = PrivateAttr(default=None)
+
+    @property
+    def loaded(self) -> bool:
+        return self._tool is not None
+
+    def load(self) -> BaseTool:
+        """Import and return the underlying tool."""
+        if self._tool is None:
+            module_name, _, attribute = self.target.partition(":")
+            self._tool = getattr(import_module(module_name, _PACKAGE), attribute)
+        return self._tool
+
+    def _run(self, config: RunnableConfig, **kwargs: Any) -> Any:
+        return self.load().invoke(kwargs, config=config)
+
+    async def _arun(self, config: RunnableConfig, **kwargs: Any) -> Any:
+        return await self.load().ainvoke(kwargs, config=config)
+
+
+_REGISTRY: Dict[str, LazyTool] = {}
+
+
+def register_tool(
+    name: str,
+    target: str,
+    description: str,
+    args_schema: Type[BaseModel],
+    return_direct: bool = False,
+) -> LazyTool:
+    """Register a tool under `name`; re-registering a name replaces it."""
+    lazy_tool = LazyTool(
+        name=name,
+        target=target,
+        description=description,
+        args_schema=args_schema,
+        return_direct=return_direct,
+    )
+    _REGISTRY[name] = lazy_tool
+    return lazy_tool
+
+
+def get_tool(name: str) -> LazyTool:
+    """Return the registered tool; raises KeyError for unknown names."""
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"Unknown tool '{name}'. Registered tools: {', '.join(sorted(_REGISTRY))}") from None
+
+
+def get_tools(names: List[str]) -> List[LazyTool]:
+    return [get_tool(name) for name in names]
+
+
+def list_tools() -> List[Dict[str, Any]]:
+    """Describe every registered tool by name, description and JSON schema, without loading any."""
+    return [
+        {
+            "name": lazy_tool.name,
+            "description": lazy_tool.description,
+            "parameters": lazy_tool.args_schema.model_json_schema(),
+            "loaded": lazy_tool.loaded,
+        }
+        for lazy_tool in _REGISTRY.values()
+    ]
+
+
+# Built-in tools whose modules create clients or need credentials.
+# Schemas mirror the implementations' signatures.
+
+class SearchForAgenciesInput(BaseModel):
+    queries: List[str] = Field(description="Search queries, e.g. 'food banks in Eugene OR'")
+
+
+class DisplayAgenciesInput(BaseModel):
+    category_name: str = Field(description="Category shown above the results, e.g. 'Food Banks'")
+    agencies: list = Field(description="Agencies returned by search_for_agencies")
+
+
+class TTSInput(BaseModel):
+    text: str = Field(..., description="Plain text to synthesise via ElevenLabs")
+
+
+register_tool(
+    "search_for_agencies",
+    ".resources.search:search_for_agencies",
+    "Search for local agencies (e.g., 'food banks in Eugene OR'). Returns a list of agencies with details.",
+    SearchForAgenciesInput,
+)
+register_tool(
+    "display_agencies",
+    ".resources.chat:display_agencies",
+    "Displays a carousel of agencies to the user in the chat window.",
+    DisplayAgenciesInput,
+)
+register_tool(
+    "tts_stream_tool",
+    ".tools.tts:tts_stream_tool",
+    "Convert text to speech using ElevenLabs and return Base64-encoded MP3.",
+    TTSInput,
+    return_direct=True,
+)
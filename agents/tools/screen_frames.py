@@ -0,0 +1,171 @@
+"""Screenshot pipeline for the computer-use tools.
+
+Frames are captured in the container as raw PPM (no PNG compression, no base64
+round trip) and scaled there when a smaller model resolution is configured.
+On the host they are encoded as JPEG/WebP/PNG. When delta mode is on,
+consecutive frames are compared: an unchanged screen returns a "no change"
+marker, and a small change returns only the changed region. Both cut bytes
+and vision tokens per agent step.
+"""
+
+import base64
+import io
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Literal, Optional, Tuple
+
+from PIL import Image, ImageChops
+from pydantic import BaseModel, Field
+
+MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+NO_CHANGE = "No visible change since the last screenshot."
+
+# Small grayscale thumbnail used to detect when the screen has stopped changing
+THUMBNAIL_ARGV = ["import", "-window", "root", "-resize", "160x90!", "-depth", "8", "gray:-"]
+
+
+class ScreenshotOptions(BaseModel):
+    """How screenshots are scaled, encoded and diffed."""
+
+    max_width: Optional[int] = Field(default=None, description="Downscale frames to at most this width (model resolution).")
+    max_height: Optional[int] = Field(default=None, description="Downscale frames to at most this height.")
+    format: Literal["png", "jpeg", "webp"] = "jpeg"
+    quality: int = Field(default=80, description="JPEG/WebP quality, 1-100.")
+    delta: bool = Field(default=True, description="Return only what changed since the previous frame.")
+    noise_threshold: int = Field(default=8, description="Per-pixel difference ignored as noise (0-255).")
+    max_delta_ratio: float = Field(default=0.5, description="Send a full frame when the changed box covers more than this share.")
+    padding: int = Field(default=8, description="Pixels of context added around a changed region.")
+
+
+@dataclass
+class Frame:
+    """An encoded screenshot, a changed-region crop, or a no-change marker."""
+
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    # (x, y, width, height) in model coordinates when only a region is sent
+    region: Optional[Tuple[int, int, int, int]] = None
+    changed: bool = True
+
+    def data_uri(self) -> str:
+        return f"data:{self.mime_type};base64,{base64.b64encode(self.data).decode()}"
+
+    def to_text(self) -> str:
+        """Tool-friendly rendering: full frames are a bare data URI, like before."""
+        if not self.changed:
+            return NO_CHANGE
+        if self.region is not None:
+            x, y, w, h = self.region
+            return f"Changed region (x={x}, y={y}, width={w}, height={h}) since the last screenshot:\n{self.data_uri()}"
+        return self.data_uri()
+
+
+class FrameEncoder:
+    """Per-session encoder; remembers the previous frame for delta detection."""
+
+    def __init__(self, options: Optional[ScreenshotOptions] = None):
+        self.options = options or ScreenshotOptions()
+        self._previous: Optional[Image.Image] = None
+
+    def model_size(self, screen_width: int, screen_height: int) -> Tuple[int, int, float]:
+        """Return (width, height, scale) of frames as the model sees them."""
+        scale = 1.0
+        if self.options.max_width:
+            scale = min(scale, self.options.max_width / screen_width)
+        if self.options.max_height:
+            scale = min(scale, self.options.max_height / screen_height)
+        return round(screen_width * scale), round(screen_height * scale), scale
+
+    def to_screen(self, x: int, y: int, screen_size: Tuple[int, int]) -> Tuple[int, int]:
+        """Map model coordinates back to screen coordinates."""
+        scale = self.model_size(*screen_size)[2]
+        return round(x / scale), round(y / scale)
+
+    def capture_argv(self, screen_size: Tuple[int, int]) -> List[str]:
+        """ImageMagick command that writes the root window as raw PPM, scaled in the container."""
+        width, height, scale = self.model_size(*screen_size)
+        argv = ["import", "-window", "root"]
+        if scale < 1:
+            argv += ["-resize", f"{width}x{height}!"]
+        return argv + ["ppm:-"]
+
+    def reset(self) -> None:
+        """Forget the previous frame so the next one is sent in full."""
+        self._previous = None
+
+    def _encode(self, image: Image.Image) -> bytes:
+        buffer = io.BytesIO()
+        if self.options.format == "png":
+            image.save(buffer, format="PNG", compress_level=3)
+        else:
+            image.save(buffer, format=self.options.format.upper(), quality=self.options.quality)
+        return buffer.getvalue()
+
+    def _changed_box(self, previous: Image.Image, current: Image.Image) -> Optional[Tuple[int, int, int, int]]:
+        threshold = self.options.noise_threshold
+        diff = ImageChops.difference(previous, current).convert("L")
+        mask = diff.point([0] * (threshold + 1) + [255] * (255 - threshold))
+        box = mask.getbbox()
+        if box is None:
+            return None
+        pad = self.options.padding
+        return (
+            max(box[0] - pad, 0),
+            max(box[1] - pad, 0),
+            min(box[2] + pad, current.width),
+            min(box[3] + pad, current.height),
+        )
+
+    def encode(self, raw: bytes, screen_size: Tuple[int, int], delta: Optional[bool] = None) -> Frame:
+        """Turn captured image bytes into a Frame, diffing against the previous one."""
+        image = Image.open(io.BytesIO(raw)).convert("RGB")
+        width, height, _ = self.model_size(*screen_size)
+        if image.size != (width, height):
+            image = image.resize((width, height), Image.BILINEAR)
+        previous, self._previous = self._previous, image
+
+        mime_type = MIME_TYPES[self.options.format]
+        use_delta = self.options.delta if delta is None else delta
+        if use_delta and previous is not None and previous.size == image.size:
+            box = self._changed_box(previous, image)
+            if box is None:
+                return Frame(b"", mime_type, 0, 0, changed=False)
+            x0, y0, x1, y1 = box
+            if (x1 - x0) * (y1 - y0) <= self.options.max_delta_ratio * width * height:
+                crop = image.crop(box)
+                return Frame(self._encode(crop), mime_type, crop.width, crop.height, region=(x0, y0, x1 - x0, y1 - y0))
+        return Frame(self._encode(image), mime_type, width, height)
+
+
+def changed_fraction(previous: bytes, current: bytes, threshold: int = 8) -> float:
+    """Share of samples that differ by more than threshold."""
+    if len(previous) != len(current):
+        return 1.0
+    changed = sum(1 for a, b in zip(previous, current) if abs(a - b) > threshold)
+    return changed / max(len(current), 1)
+
+
+def wait_until_stable(
+    sample: Callable[[], bytes],
+    timeout_ms: int = 5000,
+    interval_ms: int = 100,
+    stable_frames: int = 2,
+    tolerance: float = 0.001,
+) -> Dict[str, object]:
+    """Poll `sample` until stable_frames consecutive samples match within tolerance.
+
+    Host-side counterpart of the daemon's wait_stable, for when the daemon is
+    unavailable. Returns {"stable": bool, "waited_ms": int}.
+    """
+    started = time.monotonic()
+    deadline = started + timeout_ms / 1000
+    previous = sample()
+    streak = 0
+    while streak < stable_frames and time.monotonic() < deadline:
+        time.sleep(interval_ms / 1000)
+        current = sample()
+        streak = streak + 1 if changed_fraction(previous, current) <= tolerance else 0
+        previous = current
+    return {"stable": streak >= stable_frames, "waited_ms": round((time.monotonic() - started) * 1000)}
@@ -0,0 +1,182 @@
+import copy
+import re
+from typing import Dict, List, Literal, Optional, Tuple
+
+from langchain_core.tools import tool
+from pydantic import BaseModel, Field
+
+from ..prompt_cache import build_cached_prompt
+from ..prompts import SECTION_PATCH_SYSTEM_PROMPT
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+class SectionPatchError(ValueError):
+    """Raised when a patch operation cannot be applied to the section."""
+
+
+class SectionPatchOp(BaseModel):
+    op: Literal["replace", "insert_before", "insert_after", "delete", "replace_text"] = Field(
+        description=(
+            "replace: replace the whole block under the anchor heading (heading included). "
+            "insert_before / insert_after: add content before or after the anchor heading's block. "
+            "delete: remove the anchor heading's block. "
+            "replace_text: replace the exact text given in anchor with content."
+        )
+    )
+    anchor: str = Field(
+        default="",
+        description=(
+            "The heading the operation targets, e.g. '## Results' or 'Results'. "
+            "For replace_text, the exact existing text to replace. "
+            "Leave empty to insert at the start (insert_before) or end (insert_after) of the field."
+        )
+    )
+    content: str = Field(default="", description="The new markdown to insert or replace with.")
+    field: Literal["content", "footer"] = Field(
+        default="content", description="Which part of the section the operation applies to."
+    )
+
+
+@tool
+def PatchSection(operations: List[SectionPatchOp], title: Optional[str] = None): # pylint: disable=invalid-name,unused-argument
+    """Apply targeted edits to an existing section. Only include the parts that change; everything else is kept as is. Set title only when the user asked to rename the section."""
+
+
+def _heading_blocks(text: str) -> List[Tuple[int, str, int, int]]:
+    """Return (level, heading text, block start, block end) for every markdown heading in text."""
+    headings = []
+    offset = 0
+    in_code = False
+    for line in text.splitlines(keepends=True):
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        match = None if in_code else HEADING_RE.match(line.rstrip("\n"))
+        if match:
+            headings.append((len(match.group(1)), match.group(2).strip(), offset))
+        offset += len(line)
+
+    blocks = []
+    for i, (level, heading, start) in enumerate(headings):
+        end = len(text)
+        for next_level, _, next_start in headings[i + 1:]:
+            if next_level <= level:
+                end = next_start
+                break
+        blocks.append((level, heading, start, end))
+    return blocks
+
+
+def _find_block(text: str, anchor: str) -> Tuple[int, int]:
+    wanted = anchor.strip()
+    wanted_match = HEADING_RE.match(wanted)
+    wanted_level = len(wanted_match.group(1)) if wanted_match else None
+    wanted_text = (wanted_match.group(2) if wanted_match else wanted).strip().lower()
+
+    for level, heading, start, end in _heading_blocks(text):
+        if heading.lower() == wanted_text and wanted_level in (None, level):
+            return start, end
+    raise SectionPatchError(f"Heading '{anchor}' not found in section")
+
+
+def _with_newline(content: str) -> str:
+    return content if not content or content.endswith("\n") else content + "\n"
+
+
+def _shift_spans(spans: List[Dict], field: str, start: int, end: int, delta: int) -> None:
+    """Move earlier spans of field past an edit replacing text[start:end] and changing its length by delta."""
+    for span in spans:
+        if span["field"] != field:
+            continue
+        if end <= span["start"]:
+            span["start"] += delta
+            span["end"] += delta
+        elif start < span["end"]:
+            # The edit overlaps the span; the span grows to cover both
+            span["start"] = min(span["start"], start)
+            span["end"] = max(span["end"], end) + delta
+
+
+def apply_section_patches(section: Dict, operations: List[Dict]) -> Tuple[Dict, List[Dict]]:
+    """Apply patch operations to a copy of the section.
+
+    Returns the patched section and the list of changed spans (field, op, anchor,
+    start/end offsets and the text between them, all relative to the patched
+    section), so callers can emit only what changed.
+    """
+    patched = copy.deepcopy(section)
+    changed_spans = []
+
+    for operation in operations:
+        if isinstance(operation, BaseModel):
+            operation = operation.model_dump()
+        op = operation.get("op")
+        anchor = operation.get("anchor", "") or ""
+        new_text = operation.get("content", "") or ""
+        field = operation.get("field", "content") or "content"
+        if field not in ("content", "footer"):
+            raise SectionPatchError(f"Unknown field '{field}'")
+        text = patched.get(field, "") or ""
+
+        # Every operation replaces text[start:end] with insert
+        if op == "replace_text":
+            if not anchor or anchor not in text:
+                raise SectionPatchError(f"Text '{anchor}' not found in section {field}")
+            start = text.index(anchor)
+            end = start + len(anchor)
+            insert = new_text
+        elif not anchor and op in ("insert_before", "insert_after"):
+            if op == "insert_before":
+                start = end = 0
+                insert = _with_newline(new_text)
+            else:
+                start = end = len(text)
+                insert = new_text if _with_newline(text) == text else "\n" + new_text
+        else:
+            start, end = _find_block(text, anchor)
+            if op == "replace":
+                insert = _with_newline(new_text)
+            elif op == "insert_before":
+                end = start
+                insert = _with_newline(new_text)
+            elif op == "insert_after":
+                start = end
+                insert = _with_newline(new_text)
+            elif op == "delete":
+                insert = ""
+            else:
+                raise SectionPatchError(f"Unknown patch operation '{op}'")
+
+        patched[field] = text[:start] + insert + text[end:]
+        _shift_spans(changed_spans, field, start, end, len(insert) - (end - start))
+        changed_spans.append({
+            "field": field,
+            "op": op,
+            "anchor": anchor,
+            "start": start,
+            "end": start + len(insert),
+        })
+
+    for span in changed_spans:
+        span["text"] = patched[span["field"]][span["start"]:span["end"]]
+    return patched, changed_spans
+
+
+def build_patch_prompt(current_section_state: Dict, user_request: str, model_name: Optional[str] = None) -> List[Dict]:
+    """Builds the prompt asking for targeted PatchSection operations instead of a full rewrite."""
+    outline = "\n".join(
+        f"{'  ' * (level - 1)}- {'#' * level} {heading}"
+        for level, heading, _, _ in _heading_blocks(current_section_state["content"])
+    ) or "(no headings)"
+    return build_cached_prompt(
+        SECTION_PATCH_SYSTEM_PROMPT,
+        (
+            f"Section outline:\n{outline}\n\n"
+            "The given section:\n"
+            f"Title : {current_section_state['title']}\n"
+            f"Content : {current_section_state['content']}\n"
+            f"Footer : {current_section_state['footer']}\n\n"
+            f"The user request : {user_request}"
+        ),
+        model_name,
+    )
@@ -1,5 +1,7 @@
+import asyncio
 from datetime import datetime
-from typing import Optional, Dict, cast
+from functools import lru_cache
+from typing import Optional, Dict, List, cast
 from langchain_core.messages import AIMessage, ToolMessage
 from langchain_community.adapters.openai import convert_openai_messages
 from langchain_core.tools import tool
@@ -9,6 +11,14 @@ from pydantic import BaseModel, Field
 import random
 import string
 from copilotkit.langchain import copilotkit_customize_config, copilotkit_emit_state
+from ..prompt_cache import build_cached_prompt, record_cache_usage
+from ..prompts import SECTION_EDIT_SYSTEM_PROMPT, SECTION_WRITER_SYSTEM_PROMPT
+from .section_patch import PatchSection, SectionPatchError, apply_section_patches, build_patch_prompt
+from .source_index import SourceIndex, select_relevant_sources
+
+SECTION_MODEL = "gpt-4o-mini"
+# Upper bound on how many sections report_writer generates at the same time
+MAX_CONCURRENT_SECTIONS = 4
 
 @tool
 def WriteSection(title: str, content: str, section_number: int, footer: str = ""): # pylint: disable=invalid-name,unused-argument
@@ -17,44 +27,83 @@ def WriteSection(title: str, content: str, section_number: int, footer: str = ""
 def generate_random_id(length=6):
     return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
 
-class SectionWriterInput(BaseModel):
-    research_query: str = Field(description="The research query or topic for the section.")
-    section_title: str = Field(description="The title of the specific section to write.")
-    idx: int = Field(description="An index representing the order of this section (starting at 0")
-    state: Optional[Dict] = Field(description="State of the research")
+@lru_cache(maxsize=1)
+def get_chat_model():
+    return ChatOpenAI(model=SECTION_MODEL, max_retries=1)
 
+@lru_cache(maxsize=1)
+def get_section_model():
+    """Returns the shared section model with WriteSection bound, built once per process."""
+    return get_chat_model().bind_tools([WriteSection])
 
-@tool("section_writer", args_schema=SectionWriterInput, return_direct=True)
-async def section_writer(research_query, section_title, idx, state):
-    """Writes a specific section of a research report based on the query, section title, and provided sources."""
+@lru_cache(maxsize=1)
+def get_patch_model():
+    """Returns the shared section model forced to answer with PatchSection operations."""
+    return get_chat_model().bind_tools([PatchSection], tool_choice="PatchSection")
 
-    config = RunnableConfig()
-    # Log search queries
-    state["logs"] = state.get("logs", [])
-    state["logs"].append({
-        "message": f"📝 Writing the {section_title} section...",
-        "done": False
-    })
-    await copilotkit_emit_state(config, state)
+def latest_user_request(state) -> str:
+    return [message_content for message_type, message_content in state['messages'].items() if message_type == 'HumanMessage'][-1]
 
-    section_id = generate_random_id()
-    section = {
+def new_section(section_title: str, idx: int) -> Dict:
+    return {
         "title": section_title,
         "content": "",
         "footer": "",
         "idx": idx,
-        "id": section_id,
+        "id": generate_random_id(),
     }
 
+def format_sources(sources) -> str:
+    sources_summary = ""
+    for source in sources:
+        sources_summary += f"- title: {source['title']}"
+        sources_summary += f" url:  {source['url']}"
+        sources_summary += f" content:  {source['content']}\n"
+    return sources_summary
+
+def build_section_prompt(research_query, section_title, idx, sources) -> List[Dict]:
+    """Builds the prompt for writing a new section from scratch.
+
+    `sources` should already be narrowed down to the chunks relevant to this section.
+    The static instructions come first so every section of a report shares the cached prefix.
+    """
+    return build_cached_prompt(
+        SECTION_WRITER_SYSTEM_PROMPT,
+        (
+            f"Today's date is {datetime.now().strftime('%d/%m/%Y')}.\n\n"
+            f"Research Query: {research_query}\n\n"
+            f"Section Title: {section_title}\n\n"
+            f"Section Number: {idx}\n\n"
+            f"Sources:\n{format_sources(sources)}"
+        ),
+        SECTION_MODEL,
+    )
+
+def build_edit_prompt(current_section_state, state) -> List[Dict]:
+    """Builds the prompt for rewriting an existing section according to the user's latest request."""
+    return build_cached_prompt(
+        SECTION_EDIT_SYSTEM_PROMPT,
+        (
+            "The given section:\n"
+            f"Title : {current_section_state['title']}\n"
+            f"Content : {current_section_state['content']}\n"
+            f"Footer : {current_section_state['footer']}\n\n"
+            f"The user request : {latest_user_request(state)}"
+        ),
+        SECTION_MODEL,
+    )
+
+async def generate_section(prompt, section, state, config):
+    """Streams one section through WriteSection into its own section_stream keys and fills in the result."""
     from copilotkit.langchain import IntermediateStateConfig
 
     content_state = IntermediateStateConfig(
-        state_key=f"section_stream.content.{idx}.{section_id}.{section_title}",
+        state_key=f"section_stream.content.{section['idx']}.{section['id']}.{section['title']}",
         tool="WriteSection",
         tool_argument="content"
     )
     footer_state = IntermediateStateConfig(
-        state_key=f"section_stream.footer.{idx}.{section_id}.{section_title}",
+        state_key=f"section_stream.footer.{section['idx']}.{section['id']}.{section['title']}",
         tool="WriteSection",
         tool_argument="footer"
     )
@@ -64,124 +113,122 @@ async def section_writer(research_query, section_title, idx, state):
         emit_intermediate_state=[content_state, footer_state]
     )
 
-    outline = state.get("outline", {})
-    sources = state.get("sources").values()
-    section_exists = True if section['idx'] in [sec['idx'] for sec in state['sections']] else False
+    # Convert prompts for OpenAI API
+    lc_messages = convert_openai_messages(prompt)
 
-    if not section_exists:
-        # Define the system and user prompts
-        prompt = [{
-            "role": "system",
-            "content": (
-                "You are an AI assistant that writes specific sections of research reports in markdown format. "
-                "You must use the write_section tool to write the section content. "
-                "Use all appropriate markdown features for academic writing, including but not limited to:\n\n"
-                "- do NOT include the title of the section in markdown\n"
-                "- Headers (# through ######)\n"
-                "- Text formatting (*italic*, **bold**, ***bold italic***, ~~strikethrough~~)\n"
-                "- Lists (ordered and unordered, with proper nesting)\n"
-                "- Block quotes and nested blockquotes\n"
-                "- Code blocks for technical content\n"
-                "- Tables for structured data\n"
-                "- Links [text](url)\n"
-                "- Images ![alt text](url)\n"
-                "- Footnote/footer/references [^1] with proper markdown formatting\n"
-                "- Mathematical equations using LaTeX syntax ($inline$ and $$block$$)\n\n"
-                "Format the content professionally with appropriate spacing and structure for academic papers:\n"
-                "- Add blank lines before and after headers\n"
-                "- Add blank lines before and after lists\n"
-                "- Add blank lines before and after blockquotes\n"
-                "- Add blank lines before and after code blocks\n"
-                "- Add blank lines before and after tables\n"
-                "- Add blank lines before and after math blocks\n\n"
-                "IMPORTANT RULES FOR REFERENCES:\n\n"
-                "1. Footnotes are only required when the section content references external sources or needs citations\n"
-                "2. If footnotes exist, they must be section-specific and start from [^1] in each section\n" 
-                "3. The same source may have different reference numbers in different sections\n"
-                "4. All references must be placed in the footer field, not in the content\n"
-                "5. Do not add separation lines between content and references\n"
-                "6. Format references as a list, with each reference on a new line starting with [^n]:\n\n"
-                "   [^1]: First reference\n"
-                "   [^2]: Second reference\n"
-                "   etc."
-            )
-        }, {
-            "role": "user",
-            "content": (
-                f"Today's date is {datetime.now().strftime('%d/%m/%Y')}.\n\n"
-                f"Research Query: {research_query}\n\n" 
-                f"Section Title: {section_title}\n\n"
-                f"Section Number: {idx}\n\n"
-                f"Sources:\n{sources}\n\n"
-                "Write a section using the write_section tool. The section should be detailed and well-structured in markdown. "
-                "Use appropriate markdown formatting to create a professional academic document. "
-                "Only use footnotes when citing sources or referencing external material. "
-                "If footnotes are used, they must start from [^1] in this section. "
-                "References must be defined in the footer field, not in the content. Each reference should link to a source URL."
-            )
-        }]
-    else:
-        # get the current content of the section we want to update
-        current_section_state = state['sections'][section['idx']]
-        prompt = [{
-            "role": "system",
-            "content": (
-                "You are an AI assistant that makes changes to a given section of a research report in markdown format."
-                "Use the given section and only make changes that were requested by the user."
-                "Do not change the title of a section unless explicitly requested by the user."
-                "The given section:"
-                f"Title : {current_section_state['title']}\n"
-                f"Content : {current_section_state['content']}\n"
-                f"Footer : {current_section_state['footer']}\n\n"
-                "Now use the user's request to alter the given section."
-                f"The user request : {[message_content for message_type, message_content in state['messages'].items() if message_type == 'HumanMessage'][-1]}"
-            )
-        }, {
-            "role": "user",
-            "content": (
-                "You are an AI assistant that has completed the task of creating a specific section of a research report, now your primary goal is to make changes to the section to fit the users request."
-                "Edit the given section of the report using the write_section tool. Make sure to only make changes to the section that the user requested."
-                "Before making changes to the given section of the report identify the location (heading/subheading/bullet point/etc.) where the user's request needs to be placed in the report, and then only make changes to this location and keep everything else the same. "
-                "Use appropriate markdown formatting to create a professional academic report section."
-                "Do not alter the format of the given section unless explicitly instructed by the user."
-            )
-        }]
+    # Invoke OpenAI's model with tool
+    response = await get_section_model().ainvoke(lc_messages, config)
 
-    try:
-        # Convert prompts for OpenAI API
-        lc_messages = convert_openai_messages(prompt)
+    ai_message = cast(AIMessage, response)
+    record_cache_usage(state, "section_writer", ai_message)
+    if ai_message.tool_calls:
+        if ai_message.tool_calls[0]["name"] == "WriteSection":
+            section["title"] = ai_message.tool_calls[0]["args"].get("title", "")
+            section["content"] = ai_message.tool_calls[0]["args"].get("content", "")
+            section["footer"] = ai_message.tool_calls[0]["args"].get("footer", "")
 
-        # Invoke OpenAI's model with tool
-        model = ChatOpenAI(model="gpt-4o-mini", max_retries=1)
-        response = await model.bind_tools([WriteSection]).ainvoke(lc_messages, config)
+    # The section is complete, so its stream keys are no longer needed
+    for stream_info in (content_state, footer_state):
+        if stream_info["state_key"] in state:
+            state[stream_info["state_key"]] = None
 
-        state["logs"][-1]["done"] = True
-        await copilotkit_emit_state(config, state)
+    return section
+
+async def patch_section(current_section_state, state, config):
+    """Asks the model for PatchSection operations and applies them locally.
+
+    Returns the patched section and the changed spans. Raises SectionPatchError
+    when the model returns no operations or they do not apply cleanly.
+    """
+    from copilotkit.langchain import IntermediateStateConfig
+
+    patch_state = IntermediateStateConfig(
+        state_key=f"section_stream.patch.{current_section_state['idx']}.{current_section_state['id']}.{current_section_state['title']}",
+        tool="PatchSection",
+        tool_argument="operations"
+    )
+    config = copilotkit_customize_config(
+        config,
+        emit_intermediate_state=[patch_state]
+    )
+
+    prompt = build_patch_prompt(current_section_state, latest_user_request(state), SECTION_MODEL)
+    response = await get_patch_model().ainvoke(convert_openai_messages(prompt), config)
+
+    ai_message = cast(AIMessage, response)
+    record_cache_usage(state, "section_writer", ai_message)
+    if not ai_message.tool_calls or ai_message.tool_calls[0]["name"] != "PatchSection":
+        raise SectionPatchError("Model did not return any patch operations")
+
+    args = ai_message.tool_calls[0]["args"]
+    operations = args.get("operations") or []
+    if not operations:
+        raise SectionPatchError("Model did not return any patch operations")
+
+    section, changed_spans = apply_section_patches(current_section_state, operations)
+    if args.get("title"):
+        section["title"] = args["title"]
+
+    if patch_state["state_key"] in state:
+        state[patch_state["state_key"]] = None
+
+    return section, changed_spans
+
+class SectionWriterInput(BaseModel):
+    research_query: str = Field(description="The research query or topic for the section.")
+    section_title: str = Field(description="The title of the specific section to write.")
+    idx: int = Field(description="An index representing the order of this section (starting at 0")
+    state: Optional[Dict] = Field(description="State of the research")
 
-        ai_message = cast(AIMessage, response)
-        if ai_message.tool_calls:
-            if ai_message.tool_calls[0]["name"] == "WriteSection":
-                section["title"] = ai_message.tool_calls[0]["args"].get("title", "")
-                section["content"] = ai_message.tool_calls[0]["args"].get("content", "")
-                section["footer"] = ai_message.tool_calls[0]["args"].get("footer", "")
+
+@tool("section_writer", args_schema=SectionWriterInput, return_direct=True)
+async def section_writer(research_query, section_title, idx, state):
+    """Writes a specific section of a research report based on the query, section title, and provided sources."""
+
+    config = RunnableConfig()
+    # Log search queries
+    state["logs"] = state.get("logs", [])
+    state["logs"].append({
+        "message": f"📝 Writing the {section_title} section...",
+        "done": False
+    })
+    await copilotkit_emit_state(config, state)
+
+    section = new_section(section_title, idx)
+
+    section_exists = True if section['idx'] in [sec['idx'] for sec in state['sections']] else False
+
+    try:
+        changed_spans = None
+        if not section_exists:
+            sources = await select_relevant_sources(
+                state.get("sources", {}), f"{research_query}\n{section_title}"
+            )
+            prompt = build_section_prompt(research_query, section_title, idx, sources)
+            section = await generate_section(prompt, section, state, config)
+        else:
+            # get the current content of the section we want to update
+            current_section_state = state['sections'][section['idx']]
+            try:
+                section, changed_spans = await patch_section(current_section_state, state, config)
+            except SectionPatchError:
+                # Patches did not apply cleanly, fall back to rewriting the whole section
+                prompt = build_edit_prompt(current_section_state, state)
+                section = await generate_section(prompt, section, state, config)
+
+        state["logs"][-1]["done"] = True
 
         if section_exists:
             state["sections"][section['idx']] = section
         else:
             state["sections"].append(section)
 
-        # Process each stream state
-        stream_states = {
-            "content": content_state,
-            "footer": footer_state
-        }
-
-        for stream_type, stream_info in stream_states.items():
-            if stream_info["state_key"] in state:
-                state[stream_info["state_key"]] = None
+        # Emitted state replaces the frontend's, so always send all of it
         await copilotkit_emit_state(config, state)
 
         tool_msg = f"Wrote the {section_title} Section, idx: {idx}"
+        if changed_spans is not None:
+            tool_msg += f" (patched {len(changed_spans)} span{'s' if len(changed_spans) != 1 else ''})"
 
         return state, tool_msg
     except Exception as e:
@@ -190,4 +237,82 @@ async def section_writer(research_query, section_title, idx, state):
         state["logs"] = []
         await copilotkit_emit_state(config, state)
 
-        return state, f"Error generating section: {e}"
\ No newline at end of file
+        return state, f"Error generating section: {e}"
+
+class ReportWriterInput(BaseModel):
+    research_query: str = Field(description="The research query or topic of the report.")
+    state: Optional[Dict] = Field(description="State of the research, including the approved outline proposal")
+    max_concurrency: int = Field(
+        default=MAX_CONCURRENT_SECTIONS,
+        description="Maximum number of sections generated at the same time."
+    )
+
+
+@tool("report_writer", args_schema=ReportWriterInput, return_direct=True)
+async def report_writer(research_query, state, max_concurrency=MAX_CONCURRENT_SECTIONS):
+    """Writes every approved section of the outline concurrently and assembles the report in section order."""
+
+    config = RunnableConfig()
+    proposal = state.get("proposal") or {}
+    section_titles = [
+        v["title"] for v in proposal.get("sections", {}).values()
+        if isinstance(v, dict) and v.get("approved")
+    ]
+    if not section_titles:
+        return state, "Error generating report: the outline has no approved sections."
+
+    state["logs"] = state.get("logs", [])
+    state["logs"].append({
+        "message": f"📝 Writing {len(section_titles)} sections...",
+        "done": False
+    })
+    await copilotkit_emit_state(config, state)
+
+    all_sources = state.get("sources", {})
+    state["sections"] = []
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    # Embed every source once up front; each section then only queries the index
+    index = SourceIndex()
+    try:
+        await index.aadd_sources(all_sources)
+    except Exception:
+        index = None
+
+    async def write_one(idx, section_title):
+        section = new_section(section_title, idx)
+        if index is None:
+            sources = list(all_sources.values())
+        else:
+            sources = await select_relevant_sources(
+                all_sources, f"{research_query}\n{section_title}", index=index
+            )
+        prompt = build_section_prompt(research_query, section_title, idx, sources)
+        async with semaphore:
+            section = await generate_section(prompt, section, state, config)
+
+        # Keep sections ordered by idx no matter which one finishes first
+        state["sections"].append(section)
+        state["sections"].sort(key=lambda sec: sec["idx"])
+        await copilotkit_emit_state(config, state)
+        return section
+
+    results = await asyncio.gather(
+        *(write_one(idx, section_title) for idx, section_title in enumerate(section_titles)),
+        return_exceptions=True,
+    )
+    failed = [
+        f"{section_title}: {result}"
+        for section_title, result in zip(section_titles, results)
+        if isinstance(result, Exception)
+    ]
+
+    # Clear logs
+    state["logs"] = []
+    await copilotkit_emit_state(config, state)
+
+    tool_msg = f"Wrote {len(state['sections'])} of {len(section_titles)} sections"
+    if failed:
+        tool_msg += "\nError generating sections:\n" + "\n".join(failed)
+
+    return state, tool_msg
@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import math
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from langchain_openai import OpenAIEmbeddings
+
+# Sources are split into overlapping character windows before embedding
+CHUNK_SIZE = 1200
+CHUNK_OVERLAP = 200
+# Number of chunks handed to each section prompt
+SOURCES_PER_SECTION = 8
+EMBEDDING_MODEL = "text-embedding-3-small"
+# Upper bound on cached chunk embeddings kept in memory (LRU)
+MAX_CACHED_EMBEDDINGS = 20000
+
+logger = logging.getLogger(__name__)
+
+# Chunk text hash -> normalized embedding, shared across sections, edits and reports
+_embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model():
+    return OpenAIEmbeddings(model=EMBEDDING_MODEL)
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def _cache_get(key: str) -> Optional[List[float]]:
+    vector = _embedding_cache.get(key)
+    if vector is not None:
+        _embedding_cache.move_to_end(key)
+    return vector
+
+
+def _cache_put(key: str, vector: List[float]) -> None:
+    _embedding_cache[key] = vector
+    _embedding_cache.move_to_end(key)
+    while len(_embedding_cache) > MAX_CACHED_EMBEDDINGS:
+        _embedding_cache.popitem(last=False)
+
+
+def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """Split text into overlapping windows, preferring to break on whitespace."""
+    text = (text or "").strip()
+    if len(text) <= chunk_size:
+        return [text] if text else []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            # Back up to the last whitespace so words are not cut in half
+            split_at = text.rfind(" ", start + chunk_size // 2, end)
+            if split_at > start:
+                end = split_at
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [chunk for chunk in chunks if chunk]
+
+
+async def aembed_texts(texts: List[str]) -> List[List[float]]:
+    """Embed texts, only calling the provider for texts not already in the cache."""
+    keys = [_hash_text(text) for text in texts]
+    missing = {}
+    for key, text in zip(keys, texts):
+        if _cache_get(key) is None and key not in missing:
+            missing[key] = text
+
+    if missing:
+        vectors = await get_embedding_model().aembed_documents(list(missing.values()))
+        for key, vector in zip(missing.keys(), vectors):
+            _cache_put(key, _normalize(vector))
+
+    return [_cache_get(key) for key in keys]
+
+
+class SourceIndex:
+    """In-memory vector index over research source chunks."""
+
+    def __init__(self):
+        self._chunks: List[Dict] = []
+        self._vectors: List[List[float]] = []
+        self._indexed_urls = set()
+
+    async def aadd_sources(self, sources: Dict[str, Dict]) -> None:
+        """Chunk and embed any sources not yet in the index."""
+        new_chunks = []
+        new_urls = []
+        for url, source in sources.items():
+            if url in self._indexed_urls:
+                continue
+            new_urls.append(url)
+            for chunk in chunk_text(source.get("content", "")):
+                new_chunks.append({
+                    "title": source.get("title", ""),
+                    "url": source.get("url", url),
+                    "content": chunk,
+                })
+
+        if new_chunks:
+            vectors = await aembed_texts([chunk["content"] for chunk in new_chunks])
+            self._chunks.extend(new_chunks)
+            self._vectors.extend(vectors)
+        # Only once stored, so sources whose embedding failed are retried next time
+        self._indexed_urls.update(new_urls)
+
+    async def asearch(self, query: str, k: int = SOURCES_PER_SECTION) -> List[Dict]:
+        """Return the k chunks most similar to the query, best first."""
+        if not self._chunks:
+            return []
+
+        query_vector = (await aembed_texts([query]))[0]
+        scored: List[Tuple[float, int]] = [
+            (sum(q * v for q, v in zip(query_vector, vector)), i)
+            for i, vector in enumerate(self._vectors)
+        ]
+        scored.sort(reverse=True)
+        return [self._chunks[i] for _, i in scored[:k]]
+
+
+async def select_relevant_sources(
+    sources: Dict[str, Dict],
+    query: str,
+    k: int = SOURCES_PER_SECTION,
+    index: Optional[SourceIndex] = None,
+) -> List[Dict]:
+    """Pick the source chunks most relevant to a section.
+
+    Falls back to every source verbatim when embedding fails, so a section can
+    still be written without retrieval.
+    """
+    if not sources:
+        return []
+    try:
+        index = index or SourceIndex()
+        await index.aadd_sources(sources)
+        return await index.asearch(query, k)
+    except Exception as e:
+        logger.warning(f"Source selection failed with error: {str(e)}, using all sources")
+        return list(sources.values())
@@ -1,6 +1,9 @@
+import base64
 import subprocess
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from .screen_frames import THUMBNAIL_ARGV, Frame, FrameEncoder, ScreenshotOptions, wait_until_stable
 
 
 class DockerComputer:
@@ -10,14 +13,19 @@ class DockerComputer:
         image: str = "ghcr.io/openai/openai-cua-sample-app:latest",
         display: str = ":99",
         port_mapping: str = "5900:5900",
-        start_timeout: int = 10
+        start_timeout: int = 10,
+        # Defaults keep the full-frame PNG contract; set max_width/format/delta to shrink frames
+        screenshot_options: Optional[ScreenshotOptions] = None,
     ):
         self.container_name = container_name
         self.image = image
         self.display = display
         self.port_mapping = port_mapping
         self.start_timeout = start_timeout
-        self.dimensions = (1280, 720)  # Default fallback
+        self.screen_dimensions = (1280, 720)  # Default fallback
+        self._frames = FrameEncoder(screenshot_options or ScreenshotOptions(format="png", delta=False))
+        # Display size as the model sees it (after screenshot downscaling)
+        self.dimensions = self._frames.model_size(*self.screen_dimensions)[:2]
 
     def __enter__(self):
         if not self._is_container_running():
@@ -46,6 +54,21 @@ class DockerComputer:
                 f"Command failed: {cmd}\nError: {e.stderr}"
             ) from e
 
+    def _exec_bytes(self, argv: List[str]) -> bytes:
+        """Run a command without a shell and return its raw stdout"""
+        try:
+            result = subprocess.run(
+                ["docker", "exec", "-e", f"DISPLAY={self.display}", self.container_name, *argv],
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            return result.stdout
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(
+                f"Command failed: {' '.join(argv)}\nError: {e.stderr.decode(errors='replace')}"
+            ) from e
+
     def _is_container_running(self) -> bool:
         """Check if container is running"""
         result = subprocess.run(
@@ -66,14 +89,14 @@ class DockerComputer:
         ])
 
     def _wait_for_container_ready(self):
-        """Wait for container services to be ready"""
+        """Wait until the container's X display accepts xdotool commands"""
         end_time = time.time() + self.start_timeout
         while time.time() < end_time:
             try:
-                self._exec("true")  # Simple test command
+                self._exec_bytes(["xdotool", "getdisplaygeometry"])
                 return
             except RuntimeError:
-                time.sleep(0.5)
+                time.sleep(0.1)
         raise TimeoutError("Container failed to start within timeout period")
 
     def _set_display_dimensions(self):
@@ -83,7 +106,8 @@ class DockerComputer:
                 f"DISPLAY={self.display} xdotool getdisplaygeometry"
             ).strip()
             if geometry:
-                self.dimensions = tuple(map(int, geometry.split()))
+                self.screen_dimensions = tuple(map(int, geometry.split()))
+                self.dimensions = self._frames.model_size(*self.screen_dimensions)[:2]
         except RuntimeError:
             pass  # Use default dimensions
 
@@ -101,24 +125,33 @@ class DockerComputer:
         full_cmd = f"DISPLAY={self.display} xdotool {command}"
         self._exec(full_cmd)
 
+    def _to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        """Map model coordinates to display coordinates"""
+        return self._frames.to_screen(x, y, self.screen_dimensions)
+
+    def screenshot_frame(self, delta: Optional[bool] = None) -> Frame:
+        """Capture raw frame bytes and encode them per the screenshot options"""
+        raw = self._exec_bytes(self._frames.capture_argv(self.screen_dimensions))
+        return self._frames.encode(raw, self.screen_dimensions, delta=delta)
+
     def screenshot(self) -> str:
-        """Capture screenshot as base64-encoded PNG"""
-        return self._exec(
-            f"DISPLAY={self.display} "
-            "import -window root png:- | base64 -w 0"
-        )
+        """Capture a full screenshot, base64-encoded (PNG unless configured otherwise)"""
+        return base64.b64encode(self.screenshot_frame(delta=False).data).decode()
 
     def click(self, x: int, y: int, button: str = "left") -> None:
         """Click at specified coordinates"""
         button_map = {"left": 1, "middle": 2, "right": 3}
+        x, y = self._to_screen(x, y)
         self._xdo(f"mousemove {x} {y} click {button_map.get(button, 1)}")
 
     def double_click(self, x: int, y: int) -> None:
         """Double-click at specified coordinates"""
+        x, y = self._to_screen(x, y)
         self._xdo(f"mousemove {x} {y} click --repeat 2 1")
 
     def scroll(self, x: int, y: int, scroll_x: int, scroll_y: int) -> None:
         """Perform scrolling action"""
+        x, y = self._to_screen(x, y)
         self._xdo(f"mousemove {x} {y}")
         clicks = abs(scroll_y)
         button = 4 if scroll_y < 0 else 5
@@ -132,6 +165,7 @@ class DockerComputer:
 
     def move(self, x: int, y: int) -> None:
         """Move mouse to coordinates"""
+        x, y = self._to_screen(x, y)
         self._xdo(f"mousemove {x} {y}")
 
     def keypress(self, keys: List[str]) -> None:
@@ -155,16 +189,24 @@ class DockerComputer:
         if not path:
             return
             
+        points = [self._to_screen(point["x"], point["y"]) for point in path]
         commands = []
-        start = path[0]
-        commands.append(f"mousemove {start['x']} {start['y']} mousedown 1")
+        start = points[0]
+        commands.append(f"mousemove {start[0]} {start[1]} mousedown 1")
         
-        for point in path[1:]:
-            commands.append(f"mousemove {point['x']} {point['y']}")
+        for point in points[1:]:
+            commands.append(f"mousemove {point[0]} {point[1]}")
             
         commands.append("mouseup 1")
         self._xdo(" ".join(commands))
 
+    def wait_until_stable(self, timeout_ms: int = 5000, interval_ms: int = 100) -> Dict[str, object]:
+        """Return as soon as the display stops changing, or after timeout_ms"""
+        return wait_until_stable(lambda: self._exec_bytes(THUMBNAIL_ARGV), timeout_ms, interval_ms)
+
     def wait(self, ms: int = 1000) -> None:
-        """Wait for specified milliseconds"""
-        time.sleep(ms / 1000)
\ No newline at end of file
+        """Wait up to the specified milliseconds, returning early once the screen settles"""
+        try:
+            self.wait_until_stable(timeout_ms=ms)
+        except RuntimeError:
+            time.sleep(ms / 1000)
\ No newline at end of file
@@ -23,11 +23,13 @@ from langchain_core.tools import tool
 # ----------------------------------------------------------------------------
 # Environment & logging
 # ----------------------------------------------------------------------------
-ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
-VOICE_ID = os.getenv("VOICE_ID")
-
-if not all([ELEVENLABS_API_KEY, VOICE_ID]):
-    raise EnvironmentError("Missing ELEVENLABS_API_KEY or VOICE_ID in env vars")
+def _get_credentials() -> tuple[str, str]:
+    """Read ElevenLabs credentials at call time so the module imports without them."""
+    api_key = os.getenv("ELEVENLABS_API_KEY")
+    voice_id = os.getenv("VOICE_ID")
+    if not all([api_key, voice_id]):
+        raise EnvironmentError("Missing ELEVENLABS_API_KEY or VOICE_ID in env vars")
+    return api_key, voice_id
 
 logger = logging.getLogger("tts_stream_tool")
 logger.addHandler(logging.NullHandler())
@@ -40,11 +42,12 @@ async def _text_to_audio_stream(
     output_callback: Callable[[bytes], Coroutine[Any, Any, None]],
 ) -> None:
     """Stream ElevenLabs TTS; forward audio bytes to *output_callback*."""
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{VOICE_ID}/stream"
+    api_key, voice_id = _get_credentials()
+    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream"
     headers = {
         "Accept": "audio/mpeg",
         "Content-Type": "application/json",
-        "xi-api-key": ELEVENLABS_API_KEY,
+        "xi-api-key": api_key,
     }
 
     async with httpx.AsyncClient(timeout=60) as client:
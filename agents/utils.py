@@ -13,6 +13,7 @@ from langchain_core.messages import (
     AIMessage,
     HumanMessage,
     MessageLikeRepresentation,
+    ToolMessage,
     filter_messages,
 )
 from langchain_core.runnables import RunnableConfig
@@ -31,6 +32,8 @@ from tavily import AsyncTavilyClient
 from .configuration import Configuration, SearchAPI
 from .prompts import summarize_webpage_prompt
 from .state import ResearchComplete, Summary
+from .llm_cache import get_response_cache
+from .tokens import count_message_tokens, resolve_model_token_limit
 
 
 # Tavily Search Tool Utils
@@ -85,7 +88,9 @@ async def tavily_search(
         model=configurable.summarization_model,
         max_tokens=configurable.summarization_model_max_tokens,
         api_key=model_api_key,
-        tags=["langsmith:nostream"]
+        tags=["langsmith:nostream"],
+        # The same pages come up across users and queries; reuse their summaries
+        cache=get_response_cache(),
     ).with_structured_output(Summary).with_retry(
         stop_after_attempt=configurable.max_structured_output_retries
     )
@@ -773,27 +778,6 @@ def _check_gemini_token_limit(exception: Exception, error_str: str) -> bool:
     
     return False
 
-# NOTE: This may be out of date or not applicable to your models. Please update this as needed.
-MODEL_TOKEN_LIMITS = {
-    "openai:gpt-4.1-mini": 1047576,
-    "openai:gpt-4.1-nano": 1047576,
-    "openai:gpt-4.1": 1047576,
-    "openai:gpt-4o-mini": 128000,
-    "openai:gpt-4o": 128000,
-    "openai:o4-mini": 200000,
-    "openai:o3-mini": 200000,
-    "anthropic:claude-opus-4": 200000,
-    "anthropic:claude-sonnet-4": 200000,
-    "anthropic:claude-3-7-sonnet": 200000,
-    "anthropic:claude-3-5-sonnet": 200000,
-    "anthropic:claude-3-5-haiku": 200000,
-    "google:gemini-2.5-pro": 1048576,
-    "google:gemini-2.5-flash": 1048576,
-    "google:gemini-2.5-flash-lite": 1048576,
-    "gemini-2.0-flash-preview-image-generation": 1048576,
-    "ollama:qwen": 32768,
-}
-
 def get_model_token_limit(model_string):
     """Look up the token limit for a specific model.
     
@@ -803,13 +787,8 @@ def get_model_token_limit(model_string):
     Returns:
         Token limit as integer if found, None if model not in lookup table
     """
-    # Search through known model token limits
-    for model_key, token_limit in MODEL_TOKEN_LIMITS.items():
-        if model_key in model_string:
-            return token_limit
-    
-    # Model not found in lookup table
-    return None
+    # Longest-prefix match over MODEL_TOKEN_LIMITS, cached per bare model name
+    return resolve_model_token_limit(model_string)
 
 def remove_up_to_last_ai_message(messages: list[MessageLikeRepresentation]) -> list[MessageLikeRepresentation]:
     """Truncate message history by removing up to the last AI message.
@@ -831,6 +810,100 @@ def remove_up_to_last_ai_message(messages: list[MessageLikeRepresentation]) -> l
     # No AI messages found, return original list
     return messages
 
+def compact_messages(
+    messages: list[MessageLikeRepresentation],
+    model_name: str,
+    max_tokens: Optional[int] = None,
+    headroom: float = 0.8,
+    keep_last_tool_messages: int = 3,
+    preview_chars: int = 500,
+) -> list[MessageLikeRepresentation]:
+    """Shrink message history before a model call so it fits the context window.
+    
+    Unlike remove_up_to_last_ai_message, this runs before the request is sent, so
+    no work is thrown away by a failed call. Old tool results are compacted first
+    (oldest first) into short previews, since the agent has already read them; if
+    that is not enough, the oldest AI turns and their tool results are dropped.
+    The leading instructions and the latest turn are always kept.
+    
+    Args:
+        messages: List of message objects to compact
+        model_name: Model identifier used to look up the token limit
+        max_tokens: Explicit token limit, overrides the model lookup
+        headroom: Fraction of the limit the history may use, leaving room for the response
+        keep_last_tool_messages: Number of most recent tool messages left untouched
+        preview_chars: Characters of each compacted tool message to keep
+        
+    Returns:
+        The original list if it already fits or the limit is unknown, otherwise a compacted copy
+    """
+    token_limit = max_tokens or get_model_token_limit(model_name)
+    if not token_limit:
+        return messages
+    budget = int(token_limit * headroom)
+
+    # Step 1: Count tokens per message once so each eviction is O(1) to account for
+    counts = [count_message_tokens(message, model_name) for message in messages]
+    total = sum(counts)
+    if total <= budget:
+        return messages
+    compacted = list(messages)
+
+    # Step 2: Replace old tool outputs with short previews, oldest first
+    tool_indices = [i for i, message in enumerate(compacted) if isinstance(message, ToolMessage)]
+    if keep_last_tool_messages > 0:
+        tool_indices = tool_indices[:-keep_last_tool_messages]
+    for i in tool_indices:
+        content = str(compacted[i].content)
+        if len(content) <= preview_chars:
+            continue
+        compacted[i] = compacted[i].model_copy(update={
+            "content": f"[Earlier tool output compacted to fit context]\n{content[:preview_chars]}"
+        })
+        new_count = count_message_tokens(compacted[i], model_name)
+        total -= counts[i] - new_count
+        counts[i] = new_count
+        if total <= budget:
+            return compacted
+
+    # Step 3: Drop the oldest AI turns (AI message plus its tool results)
+    start = 0
+    while start < len(compacted) and not isinstance(compacted[start], AIMessage):
+        start += 1
+    while total > budget and start < len(compacted):
+        end = start + 1
+        while end < len(compacted) and isinstance(compacted[end], ToolMessage):
+            end += 1
+        if end >= len(compacted):
+            # Never drop the latest turn
+            break
+        total -= sum(counts[start:end])
+        del compacted[start:end]
+        del counts[start:end]
+        while start < len(compacted) and not isinstance(compacted[start], AIMessage):
+            start += 1
+
+    return compacted
+
+def create_compaction_hook(model_name: str, **compaction_kwargs):
+    """Create a pre_model_hook for create_react_agent that compacts history before each call.
+    
+    The compacted history is only sent to the model (llm_input_messages); the
+    full history stays in the graph state.
+    
+    Args:
+        model_name: Model identifier used to look up the token limit
+        **compaction_kwargs: Extra arguments passed to compact_messages
+        
+    Returns:
+        Hook function taking the agent state
+    """
+    def compaction_hook(state):
+        return {
+            "llm_input_messages": compact_messages(state["messages"], model_name, **compaction_kwargs)
+        }
+    return compaction_hook
+
 ##########################
 # Misc Utils
 ##########################